@@ -1,11 +1,22 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from backend.responses import FastJSONResponse
 from backend.routers import codec, key_reconstruct, scripts, sboxes, terminal
+from core.script.blocking import shutdown_blocking_pool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    shutdown_blocking_pool()
+    codec.shutdown_crypto_executor()
 
 
 def create_app() -> FastAPI:
-    app = FastAPI(title="ByteAlchemy Backend")
+    app = FastAPI(title="ByteAlchemy Backend", default_response_class=FastJSONResponse, lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
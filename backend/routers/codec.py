@@ -1,3 +1,11 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from typing import Optional
+
 from fastapi import APIRouter, HTTPException
 
 from backend.schemas import (
@@ -18,7 +26,7 @@ from backend.schemas import (
 from backend.services.text_tools import convert_format, swap_endian
 from backend.state import sbox_manager
 from core.analysis.ida_pseudocode import analyze_ida_pseudocode
-from core.decoder.aes_pure import AesPureEncoders
+from core.decoder.aes_pure import AesPure, AesPureEncoders
 from core.decoder.base import BaseEncoders
 from core.decoder.des import DESEncoders
 from core.decoder.html import HtmlEncoders
@@ -29,6 +37,8 @@ from core.decoder.sm4 import SM4Encoders
 from core.decoder.unicode import UnicodeEncoders
 from core.decoder.url import UrlEncoders
 from core.formatter import CssFormatter, HtmlFormatter, JsonFormatter, SqlFormatter, XmlFormatter
+from core.regex import RegexGenerator, RegexUtils
+from core.script.blocking import run_blocking
 
 try:
     from core.formatter import PythonFormatter
@@ -39,10 +49,60 @@ except ImportError:
 router = APIRouter()
 
 
+_crypto_executor: Optional[ProcessPoolExecutor] = None
+
+# 只有走纯Python实现且数据量超过该阈值的请求才交给进程池，
+# 其余的序列化/IPC 开销比运算本身还大，直接在线程池里跑
+PROCESS_POOL_THRESHOLD = 64 * 1024
+
+# 管道输入达到该长度 (至少能切出两个 1 MiB 块) 时改用 run_parallel
+PIPELINE_PARALLEL_THRESHOLD = 2 * 1024 * 1024
+
+
 def _raise_bad_request(exc: Exception):
     raise HTTPException(status_code=400, detail=str(exc))
 
 
+def _get_crypto_executor() -> ProcessPoolExecutor:
+    global _crypto_executor
+    if _crypto_executor is None:
+        # uvicorn 进程里已有线程 (阻塞线程池、日志 QueueListener)，fork 可能死锁，改用 forkserver/spawn
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        _crypto_executor = ProcessPoolExecutor(
+            max_workers=os.cpu_count() or 1,
+            mp_context=multiprocessing.get_context(method),
+        )
+    return _crypto_executor
+
+
+def _discard_crypto_executor(executor: ProcessPoolExecutor):
+    global _crypto_executor
+    if _crypto_executor is executor:
+        _crypto_executor = None
+    executor.shutdown(wait=False, cancel_futures=True)
+
+
+def shutdown_crypto_executor():
+    global _crypto_executor
+    if _crypto_executor is not None:
+        _crypto_executor.shutdown(wait=False, cancel_futures=True)
+        _crypto_executor = None
+
+
+async def _run_crypto(pure_python: bool, func, data, *args, **kwargs):
+    """大块数据的纯Python分组密码放到进程池里跑，避免占住GIL；其余调用走共用线程池"""
+    if not pure_python or len(data) < PROCESS_POOL_THRESHOLD:
+        return await run_blocking(func, data, *args, **kwargs)
+    executor = _get_crypto_executor()
+    loop = asyncio.get_running_loop()
+    try:
+        return await loop.run_in_executor(executor, partial(func, data, *args, **kwargs))
+    except BrokenProcessPool:
+        # 工作进程异常退出后进程池不可再用，丢弃后下次请求重建
+        _discard_crypto_executor(executor)
+        raise
+
+
 @router.post("/api/base64/encode")
 def base64_encode(req: EncodeRequest):
     try:
@@ -170,8 +230,6 @@ def format_code(req: FormatRequest):
 @router.post("/api/regex/escape")
 def regex_escape(req: EncodeRequest):
     try:
-        from core.regex import RegexUtils
-
         return {"result": RegexUtils.escape_text(req.data)}
     except Exception as exc:
         _raise_bad_request(exc)
@@ -180,8 +238,6 @@ def regex_escape(req: EncodeRequest):
 @router.post("/api/regex/generate")
 def regex_generate(req: RegexGenerateRequest):
     try:
-        from core.regex import RegexGenerator
-
         return {
             "result": RegexGenerator.generate_pattern(
                 include_digits=req.include_digits,
@@ -196,16 +252,19 @@ def regex_generate(req: RegexGenerateRequest):
 
 
 @router.post("/api/aes/encrypt")
-def aes_encrypt(req: AesRequest):
+async def aes_encrypt(req: AesRequest):
     try:
+        sbox = sbox_manager.get_sbox(req.sbox_name)
         return {
-            "result": AesPureEncoders.encrypt(
+            "result": await _run_crypto(
+                req.swap_key_schedule or req.swap_data_round or sbox != AesPure.STANDARD_SBOX,
+                AesPureEncoders.encrypt,
                 req.data,
                 req.key,
                 req.mode,
                 req.iv,
                 req.padding,
-                sbox=sbox_manager.get_sbox(req.sbox_name),
+                sbox=sbox,
                 swap_key_schedule=req.swap_key_schedule,
                 swap_data_round=req.swap_data_round,
                 key_type=req.key_type,
@@ -218,16 +277,19 @@ def aes_encrypt(req: AesRequest):
 
 
 @router.post("/api/aes/decrypt")
-def aes_decrypt(req: AesRequest):
+async def aes_decrypt(req: AesRequest):
     try:
+        sbox = sbox_manager.get_sbox(req.sbox_name)
         return {
-            "result": AesPureEncoders.decrypt(
+            "result": await _run_crypto(
+                req.swap_key_schedule or req.swap_data_round or sbox != AesPure.STANDARD_SBOX,
+                AesPureEncoders.decrypt,
                 req.data,
                 req.key,
                 req.mode,
                 req.iv,
                 req.padding,
-                sbox=sbox_manager.get_sbox(req.sbox_name),
+                sbox=sbox,
                 swap_key_schedule=req.swap_key_schedule,
                 swap_data_round=req.swap_data_round,
                 key_type=req.key_type,
@@ -240,16 +302,19 @@ def aes_decrypt(req: AesRequest):
 
 
 @router.post("/api/sm4/encrypt")
-def sm4_encrypt(req: Sm4Request):
+async def sm4_encrypt(req: Sm4Request):
     try:
+        sbox = sbox_manager.get_sbox(req.sbox_name)
         return {
-            "result": SM4Encoders.sm4_encrypt(
+            "result": await _run_crypto(
+                req.swap_key_schedule or req.swap_data_round or sbox != SM4Encoders.STANDARD_SBOX,
+                SM4Encoders.sm4_encrypt,
                 req.data,
                 req.key,
                 req.mode,
                 req.iv,
                 req.padding,
-                sbox=sbox_manager.get_sbox(req.sbox_name),
+                sbox=sbox,
                 key_type=req.key_type,
                 iv_type=req.iv_type,
                 swap_key_schedule=req.swap_key_schedule,
@@ -263,16 +328,19 @@ def sm4_encrypt(req: Sm4Request):
 
 
 @router.post("/api/sm4/decrypt")
-def sm4_decrypt(req: Sm4Request):
+async def sm4_decrypt(req: Sm4Request):
     try:
+        sbox = sbox_manager.get_sbox(req.sbox_name)
         return {
-            "result": SM4Encoders.sm4_decrypt(
+            "result": await _run_crypto(
+                req.swap_key_schedule or req.swap_data_round or sbox != SM4Encoders.STANDARD_SBOX,
+                SM4Encoders.sm4_decrypt,
                 req.data,
                 req.key,
                 req.mode,
                 req.iv,
                 req.padding,
-                sbox=sbox_manager.get_sbox(req.sbox_name),
+                sbox=sbox,
                 key_type=req.key_type,
                 iv_type=req.iv_type,
                 swap_key_schedule=req.swap_key_schedule,
@@ -286,57 +354,57 @@ def sm4_decrypt(req: Sm4Request):
 
 
 @router.post("/api/des/encrypt")
-def des_encrypt(req: DesRequest):
+async def des_encrypt(req: DesRequest):
     try:
-        return {"result": DESEncoders.des_encrypt(req.data, req.key, req.mode, req.iv, req.padding, sboxes=req.sboxes, key_type=req.key_type, iv_type=req.iv_type, data_type=req.data_type)}
+        return {"result": await _run_crypto(bool(req.sboxes), DESEncoders.des_encrypt, req.data, req.key, req.mode, req.iv, req.padding, sboxes=req.sboxes, key_type=req.key_type, iv_type=req.iv_type, data_type=req.data_type)}
     except Exception as exc:
         _raise_bad_request(exc)
 
 
 @router.post("/api/des/decrypt")
-def des_decrypt(req: DesRequest):
+async def des_decrypt(req: DesRequest):
     try:
-        return {"result": DESEncoders.des_decrypt(req.data, req.key, req.mode, req.iv, req.padding, sboxes=req.sboxes, key_type=req.key_type, iv_type=req.iv_type, data_type=req.data_type)}
+        return {"result": await _run_crypto(bool(req.sboxes), DESEncoders.des_decrypt, req.data, req.key, req.mode, req.iv, req.padding, sboxes=req.sboxes, key_type=req.key_type, iv_type=req.iv_type, data_type=req.data_type)}
     except Exception as exc:
         _raise_bad_request(exc)
 
 
 @router.post("/api/3des/encrypt")
-def triple_des_encrypt(req: TripleDesRequest):
+async def triple_des_encrypt(req: TripleDesRequest):
     try:
-        return {"result": DESEncoders.triple_des_encrypt(req.data, req.key, req.mode, req.iv, req.padding, sboxes=req.sboxes, key_type=req.key_type, iv_type=req.iv_type, data_type=req.data_type)}
+        return {"result": await _run_crypto(bool(req.sboxes), DESEncoders.triple_des_encrypt, req.data, req.key, req.mode, req.iv, req.padding, sboxes=req.sboxes, key_type=req.key_type, iv_type=req.iv_type, data_type=req.data_type)}
     except Exception as exc:
         _raise_bad_request(exc)
 
 
 @router.post("/api/3des/decrypt")
-def triple_des_decrypt(req: TripleDesRequest):
+async def triple_des_decrypt(req: TripleDesRequest):
     try:
-        return {"result": DESEncoders.triple_des_decrypt(req.data, req.key, req.mode, req.iv, req.padding, sboxes=req.sboxes, key_type=req.key_type, iv_type=req.iv_type, data_type=req.data_type)}
+        return {"result": await _run_crypto(bool(req.sboxes), DESEncoders.triple_des_decrypt, req.data, req.key, req.mode, req.iv, req.padding, sboxes=req.sboxes, key_type=req.key_type, iv_type=req.iv_type, data_type=req.data_type)}
     except Exception as exc:
         _raise_bad_request(exc)
 
 
 @router.post("/api/md5/hash")
-def md5_hash(req: Md5Request):
+async def md5_hash(req: Md5Request):
     try:
-        return {"result": MD5Encoders.md5_hash(req.data, output_format=req.output_format, init_values=req.init_values, k_table=req.k_table, shifts=req.shifts, data_type=req.data_type, salt=req.salt, salt_position=req.salt_position)}
+        return {"result": await _run_crypto(bool(req.init_values or req.k_table or req.shifts), MD5Encoders.md5_hash, req.data, output_format=req.output_format, init_values=req.init_values, k_table=req.k_table, shifts=req.shifts, data_type=req.data_type, salt=req.salt, salt_position=req.salt_position)}
     except Exception as exc:
         _raise_bad_request(exc)
 
 
 @router.post("/api/rc4/encrypt")
-def rc4_encrypt(req: Rc4Request):
+async def rc4_encrypt(req: Rc4Request):
     try:
-        return {"result": RC4Encoders.rc4_encrypt(req.data, req.key, swap_bytes=req.swap_bytes, sbox=req.sbox, key_type=req.key_type, data_type=req.data_type)}
+        return {"result": await _run_crypto(req.swap_bytes or bool(req.sbox), RC4Encoders.rc4_encrypt, req.data, req.key, swap_bytes=req.swap_bytes, sbox=req.sbox, key_type=req.key_type, data_type=req.data_type)}
     except Exception as exc:
         _raise_bad_request(exc)
 
 
 @router.post("/api/rc4/decrypt")
-def rc4_decrypt(req: Rc4Request):
+async def rc4_decrypt(req: Rc4Request):
     try:
-        return {"result": RC4Encoders.rc4_decrypt(req.data, req.key, swap_bytes=req.swap_bytes, sbox=req.sbox, key_type=req.key_type, data_type=req.data_type)}
+        return {"result": await _run_crypto(req.swap_bytes or bool(req.sbox), RC4Encoders.rc4_decrypt, req.data, req.key, swap_bytes=req.swap_bytes, sbox=req.sbox, key_type=req.key_type, data_type=req.data_type)}
     except Exception as exc:
         _raise_bad_request(exc)
 
@@ -345,13 +413,18 @@ def rc4_decrypt(req: Rc4Request):
 def pipeline_run(req: PipelineRequest):
     try:
         pipeline = Pipeline(input_format=req.input_format, output_format=req.output_format)
+        registry_get = OPERATION_REGISTRY.get
         for op_info in req.operations:
-            if op_info.name not in OPERATION_REGISTRY:
+            func = registry_get(op_info.name)
+            if func is None:
                 raise HTTPException(status_code=400, detail=f"Operation {op_info.name} not registered")
             params = op_info.params.copy()
             if "sbox_name" in params:
                 params["sbox"] = sbox_manager.get_sbox(params["sbox_name"])
-            pipeline.add_operation(Operation(op_info.name, OPERATION_REGISTRY[op_info.name], params))
+            pipeline.add_operation(Operation(op_info.name, func, params))
+        if len(req.data) >= PIPELINE_PARALLEL_THRESHOLD:
+            # 大输入按对齐块并行执行；链中有不可分块的步骤时 run_parallel 自行退回串行
+            return {"result": pipeline.run_parallel(req.data)}
         return {"result": pipeline.run(req.data)}
     except HTTPException:
         raise
@@ -366,7 +439,7 @@ def convert_text_format(req: ConvertRequest):
 
 @router.post("/api/utils/endian_swap")
 def endian_swap(req: ConvertRequest):
-    return {"result": swap_endian(req.data, req.from_fmt, req.separator)}
+    return {"result": swap_endian(req.data, req.from_fmt, req.separator, req.word_size)}
 
 
 @router.post("/api/ida/analyze")
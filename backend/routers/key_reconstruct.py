@@ -1,32 +1,80 @@
+import hashlib
+import json
+import threading
+from collections import OrderedDict
 from importlib import import_module
+from typing import Optional, Tuple
 
 from fastapi import APIRouter, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import Response
 
+from backend.responses import FastJSONResponse
+from backend.routing import FastJSONRoute
 from backend.schemas import CustomBlockRequest, KeyBlockChain, KeyExecuteRequest, KeyParseRequest
 from backend.state import sbox_manager
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
 
 try:
     key_blocks_module = import_module("core.key_reconstruct.blocks")
     key_generator_module = import_module("core.key_reconstruct.generator")
     key_custom_module = import_module("core.key_reconstruct.custom_blocks")
+    key_parser_module = import_module("core.key_reconstruct.parser")
 except ImportError as exc:
     key_blocks_module = None
     key_generator_module = None
     key_custom_module = None
+    key_parser_module = None
     print(f"Failed to import key reconstruction modules: {exc}")
 
+# 积木定义只随自定义积木文件和S盒列表变化，缓存序列化后的 JSON
+_blocks_cache_key: Optional[Tuple] = None
+_blocks_cache: Optional[bytes] = None
+_blocks_def_key: Optional[Tuple] = None
+_blocks_def: Optional[dict] = None
+
+# 生成代码只取决于 (函数名, 参数, 积木链)，按其哈希做 LRU 缓存
+GENERATE_CACHE_SIZE = 256
+_generate_cache: "OrderedDict[bytes, str]" = OrderedDict()
+_generate_cache_lock = threading.Lock()
+
+
+def _blocks_version() -> Tuple:
+    try:
+        stat = key_custom_module.CUSTOM_BLOCKS_FILE.stat()
+        custom_version = (stat.st_mtime_ns, stat.st_size)
+    except (AttributeError, OSError):
+        custom_version = None
+    return custom_version, tuple(sbox_manager.get_all_names())
+
+
+def _get_blocks_def() -> dict:
+    global _blocks_def_key, _blocks_def
+    version = _blocks_version()
+    if _blocks_def is None or _blocks_def_key != version:
+        _blocks_def = key_blocks_module.get_all_blocks()["blocks"]
+        _blocks_def_key = version
+    return _blocks_def
+
 
 @router.get("/api/key-blocks")
 def get_key_blocks():
     if key_blocks_module is None:
         raise HTTPException(status_code=500, detail="Key reconstruction module not loaded")
-    blocks_data = key_blocks_module.get_all_blocks()
-    blocks_data["sbox_list"] = sbox_manager.get_all_names()
-    return JSONResponse(blocks_data)
+    global _blocks_cache_key, _blocks_cache
+    version = _blocks_version()
+    if _blocks_cache is None or _blocks_cache_key != version:
+        blocks_data = key_blocks_module.get_all_blocks()
+        blocks_data["sbox_list"] = list(version[1])
+        _blocks_cache = FastJSONResponse(blocks_data).body
+        _blocks_cache_key = version
+    return Response(content=_blocks_cache, media_type="application/json")
 
 
 @router.post("/api/key-blocks/custom")
@@ -34,9 +82,9 @@ def save_custom_block(req: CustomBlockRequest):
     if key_custom_module is None:
         raise HTTPException(status_code=500, detail="Custom blocks module not loaded")
     try:
-        return JSONResponse({"success": key_custom_module.save_custom_block(req.block_id, req.block_def)})
+        return FastJSONResponse({"success": key_custom_module.save_custom_block(req.block_id, req.block_def)})
     except Exception as exc:
-        return JSONResponse({"success": False, "error": str(exc)}, status_code=500)
+        return FastJSONResponse({"success": False, "error": str(exc)}, status_code=500)
 
 
 @router.delete("/api/key-blocks/custom/{block_id}")
@@ -44,9 +92,34 @@ def delete_custom_block(block_id: str):
     if key_custom_module is None:
         raise HTTPException(status_code=500, detail="Custom blocks module not loaded")
     try:
-        return JSONResponse({"success": key_custom_module.delete_custom_block(block_id)})
+        return FastJSONResponse({"success": key_custom_module.delete_custom_block(block_id)})
     except Exception as exc:
-        return JSONResponse({"success": False, "error": str(exc)}, status_code=500)
+        return FastJSONResponse({"success": False, "error": str(exc)}, status_code=500)
+
+
+def _generate_cache_key(req: KeyBlockChain) -> bytes:
+    payload = [req.func_name, req.args, req.blocks]
+    if orjson is not None:
+        raw = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    else:
+        raw = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def _generate_cached(req: KeyBlockChain) -> str:
+    cache_key = _generate_cache_key(req)
+    with _generate_cache_lock:
+        code = _generate_cache.get(cache_key)
+        if code is not None:
+            _generate_cache.move_to_end(cache_key)
+            return code
+
+    code = key_generator_module.generate_function(func_name=req.func_name, block_chain=req.blocks, args=req.args)
+    with _generate_cache_lock:
+        _generate_cache[cache_key] = code
+        if len(_generate_cache) > GENERATE_CACHE_SIZE:
+            _generate_cache.popitem(last=False)
+    return code
 
 
 @router.post("/api/key-generate")
@@ -54,23 +127,22 @@ def generate_key_code(req: KeyBlockChain):
     if key_generator_module is None:
         raise HTTPException(status_code=500, detail="Key reconstruction module not loaded")
     try:
-        return {"code": key_generator_module.generate_function(func_name=req.func_name, block_chain=req.blocks, args=req.args)}
+        return {"code": _generate_cached(req)}
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
 
 @router.post("/api/key-parse")
 def parse_key_code(req: KeyParseRequest):
+    if key_parser_module is None:
+        raise HTTPException(status_code=500, detail="Key reconstruction module not loaded")
     try:
         if not req.code:
-            return JSONResponse({"success": False, "error": "Code is empty"})
-        from core.key_reconstruct.blocks import get_all_blocks
-        from core.key_reconstruct.parser import parse_code_to_blocks
-
-        chain = parse_code_to_blocks(req.code, get_all_blocks()["blocks"])
-        return JSONResponse({"success": True, "chain": chain})
+            return FastJSONResponse({"success": False, "error": "Code is empty"})
+        chain = key_parser_module.parse_code_to_blocks(req.code, _get_blocks_def())
+        return FastJSONResponse({"success": True, "chain": chain})
     except Exception as exc:
-        return JSONResponse({"success": False, "error": str(exc)})
+        return FastJSONResponse({"success": False, "error": str(exc)})
 
 
 @router.post("/api/key-execute")
@@ -1,10 +1,18 @@
 import json
+from functools import lru_cache
 
 from fastapi import APIRouter, HTTPException
 
 from backend.schemas import SBoxSaveRequest
 from backend.state import sbox_manager
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+_json_loads = orjson.loads if orjson is not None else json.loads
+
 
 router = APIRouter()
 
@@ -14,13 +22,30 @@ def get_sbox_names():
     return {"names": sbox_manager.get_all_names()}
 
 
+def _format_sbox(sbox) -> str:
+    if isinstance(sbox, (bytes, bytearray)):
+        return sbox.hex(" ")
+    try:
+        return bytes(sbox).hex(" ")
+    except ValueError:
+        # 旧数据里可能有超出 0-255 的值，按原来的逐项格式化显示
+        return " ".join(f"{byte:02x}" for byte in sbox)
+
+
+@lru_cache(maxsize=8)
+def _standard_sbox_hex(name: str) -> str:
+    # 标准S盒不可修改，格式化结果可以常驻
+    return _format_sbox(sbox_manager.get_sbox(name))
+
+
 @router.get("/api/sbox/get/{name}")
 def get_sbox(name: str):
-    sbox = sbox_manager.get_sbox(name)
+    is_standard = name in sbox_manager.STANDARD_NAMES
+    content = _standard_sbox_hex(name) if is_standard else _format_sbox(sbox_manager.get_sbox(name))
     return {
         "name": name,
-        "content": " ".join(f"{byte:02x}" for byte in sbox),
-        "is_standard": name in {"Standard SM4", "Standard AES", "Standard RC4", "Standard DES"},
+        "content": content,
+        "is_standard": is_standard,
     }
 
 
@@ -29,13 +54,15 @@ def save_sbox(req: SBoxSaveRequest):
     try:
         content = req.content.strip()
         if content.startswith("[") and content.endswith("]"):
-            sbox = json.loads(content)
+            sbox = _json_loads(content)
         else:
             clean_hex = content.replace(" ", "").replace("\n", "").replace("\r", "")
-            sbox = [int(clean_hex[index:index + 2], 16) for index in range(0, len(clean_hex), 2)]
+            sbox = list(bytes.fromhex(clean_hex))
 
         if len(sbox) != 256:
             raise ValueError("S-Box must be 256 bytes")
+        if not all(isinstance(value, int) and 0 <= value <= 255 for value in sbox):
+            raise ValueError("S-Box values must be integers in 0-255")
         if not sbox_manager.add_sbox(req.name, sbox):
             raise HTTPException(status_code=403, detail="Cannot overwrite standard S-Box")
         return {"status": "success"}
@@ -1,16 +1,89 @@
-from fastapi import APIRouter, HTTPException
-from starlette.responses import StreamingResponse
+import asyncio
+import hashlib
+from typing import AsyncIterator, Optional, Tuple
 
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+from sse_starlette.sse import EventSourceResponse, ServerSentEvent
+
+from backend.responses import FastJSONResponse
+from backend.routing import FastJSONRoute
 from backend.schemas import ScriptCreateRequest, ScriptUpdateRequest
 from backend.state import script_manager
 
 
-router = APIRouter()
+router = APIRouter(route_class=FastJSONRoute)
+
+STREAM_BATCH_CHARS = 16384
+STREAM_BATCH_WINDOW = 0.01
+# 结束事件内容固定，模块加载时编码一次
+_SSE_DONE = ServerSentEvent(event="done", data="done").encode()
+
+# 脚本列表按 script_manager.version() 缓存 (版本, ETag, 响应体)
+_scripts_cache: Optional[Tuple[Tuple, str, bytes]] = None
+
 
+def _scripts_listing() -> Tuple[str, bytes]:
+    global _scripts_cache
+    version = script_manager.version()
+    if _scripts_cache is None or _scripts_cache[0] != version:
+        body = FastJSONResponse({"scripts": script_manager.list_scripts()}).body
+        etag = f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+        _scripts_cache = (version, etag, body)
+    return _scripts_cache[1], _scripts_cache[2]
 
-@router.get("/api/scripts")
-def list_scripts():
-    return {"scripts": script_manager.list_scripts()}
+
+async def _batch_lines(lines: AsyncIterator[str]) -> AsyncIterator[str]:
+    """把短时间内连续到达的输出行合并成一个 SSE 事件，减少逐行 send"""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def pump():
+        try:
+            async for line in lines:
+                queue.put_nowait(line)
+        finally:
+            queue.put_nowait(None)
+
+    pump_task = asyncio.create_task(pump())
+    try:
+        finished = False
+        while not finished:
+            line = await queue.get()
+            if line is None:
+                break
+            batch = [line]
+            size = len(line)
+            deadline = loop.time() + STREAM_BATCH_WINDOW
+            while size < STREAM_BATCH_CHARS:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    line = await asyncio.wait_for(queue.get(), timeout)
+                except asyncio.TimeoutError:
+                    break
+                if line is None:
+                    finished = True
+                    break
+                batch.append(line)
+                size += len(line)
+            yield "".join(batch)
+    finally:
+        pump_task.cancel()
+        await asyncio.gather(pump_task, return_exceptions=True)
+
+
+@router.get("/api/scripts", response_class=FastJSONResponse)
+def list_scripts(request: Request):
+    etag, body = _scripts_listing()
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(","))):
+        return Response(status_code=304, headers={"ETag": etag})
+    return Response(content=body, media_type="application/json", headers={"ETag": etag})
+
+
+# 以下接口返回的都是 JSON 安全的 dict，直接构造响应以跳过 jsonable_encoder
 
 
 @router.post("/api/scripts")
@@ -21,12 +94,12 @@ def create_script(req: ScriptCreateRequest):
         raise HTTPException(status_code=400, detail=str(exc))
 
 
-@router.get("/api/scripts/{script_id}")
+@router.get("/api/scripts/{script_id}", response_class=FastJSONResponse)
 def get_script(script_id: str):
     script = script_manager.get_script(script_id)
     if script is None:
         raise HTTPException(status_code=404, detail="Script not found")
-    return {"script": script}
+    return FastJSONResponse({"script": script})
 
 
 @router.put("/api/scripts/{script_id}")
@@ -49,19 +122,19 @@ def delete_script(script_id: str):
     raise HTTPException(status_code=404, detail="Script not found")
 
 
-@router.post("/api/scripts/{script_id}/run")
+@router.post("/api/scripts/{script_id}/run", response_class=FastJSONResponse)
 def run_script(script_id: str):
     try:
-        return script_manager.run_script_sync(script_id)
+        return FastJSONResponse(script_manager.run_script_sync(script_id))
     except Exception as exc:
         raise HTTPException(status_code=400, detail=str(exc))
 
 
 @router.get("/api/scripts/{script_id}/run-stream")
-def run_script_stream(script_id: str):
-    def generate():
-        for line in script_manager.run_script(script_id):
-            yield f"data: {line}\n\n"
-        yield "event: done\ndata: done\n\n"
+async def run_script_stream(script_id: str):
+    async def generate():
+        async for chunk in _batch_lines(script_manager.run_script_async(script_id)):
+            yield ServerSentEvent(data=chunk)
+        yield _SSE_DONE
 
-    return StreamingResponse(generate(), media_type="text/event-stream", headers={"Cache-Control": "no-cache", "Connection": "keep-alive"})
+    return EventSourceResponse(generate(), ping=15)
@@ -1,49 +1,173 @@
 import asyncio
+import atexit
+import logging
 import os
+import queue
+import struct
+import threading
+from functools import lru_cache
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 
 from fastapi import APIRouter, WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocketState
 
 from core.script.terminal_server import TerminalSession
 
 
 router = APIRouter()
 
+LOG_FILE = os.path.join(os.path.expanduser("~"), "byte_alchemy_terminal_ws.log")
 
-@router.websocket("/ws/terminal")
-async def websocket_endpoint(websocket: WebSocket):
-    await websocket.accept()
-    log_file = os.path.join(os.path.expanduser("~"), "byte_alchemy_terminal_ws.log")
 
-    def log(message: str):
+def _build_ws_logger() -> logging.Logger:
+    # 日志经队列交给后台线程写文件，事件循环线程上不做文件 IO
+    logger = logging.getLogger("byte_alchemy.ws")
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+    handlers = [logging.StreamHandler()]
+    try:
+        handlers.append(RotatingFileHandler(LOG_FILE, maxBytes=10_000_000, backupCount=3, encoding="utf-8"))
+    except OSError:
+        pass
+
+    records = queue.SimpleQueue()
+    logger.addHandler(QueueHandler(records))
+    listener = QueueListener(records, *handlers)
+    listener.start()
+    atexit.register(listener.stop)
+    return logger
+
+
+_ws_logger = _build_ws_logger()
+
+# 二进制帧协议：首字节操作码，INIT/RESIZE 后跟两个大端 uint16（rows, cols），DATA 后跟原始输入字节
+OP_DATA = 0x01
+OP_RESIZE = 0x02
+OP_INIT = 0x03
+_SIZE_STRUCT = struct.Struct(">HH")
+
+_TERM_ERR = b"\033[1;31m[Error] Failed to start terminal session\033[0m\r\n"
+
+
+@lru_cache(maxsize=4)
+def _ready_banner(backend_mode: str) -> bytes:
+    return f"\033[1;32m[Terminal Ready | {backend_mode}]\033[0m\r\n".encode()
+
+
+async def _receive_message(websocket: WebSocket):
+    # 二进制帧返回 bytes，旧版文本协议返回 str
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000))
+    data = message.get("bytes")
+    return data if data is not None else message.get("text", "")
+
+
+def _pty_reader(session: TerminalSession, loop: asyncio.AbstractEventLoop, outputs: asyncio.Queue):
+    # 会话期间常驻的读线程，读到的数据投递回事件循环，结束时投递 None 作为哨兵
+    try:
+        while session.running:
+            data = session.read(0.1)
+            if data:
+                loop.call_soon_threadsafe(outputs.put_nowait, data)
+    except Exception as exc:
+        _ws_logger.info(f"Reader thread error: {exc}")
+    finally:
         try:
-            with open(log_file, "a", encoding="utf-8") as file:
-                file.write(f"{message}\n")
-        except Exception:
+            loop.call_soon_threadsafe(outputs.put_nowait, None)
+        except RuntimeError:
             pass
-        print(message)
 
+
+@router.websocket("/ws/terminal")
+async def websocket_endpoint(websocket: WebSocket):
+    await websocket.accept()
+    log = _ws_logger.info
     session = TerminalSession()
     log("New WebSocket connection accepted")
 
     async def send_loop():
+        outputs: asyncio.Queue = asyncio.Queue()
+        threading.Thread(target=_pty_reader, args=(session, asyncio.get_running_loop(), outputs), daemon=True).start()
+        try:
+            while True:
+                output = await outputs.get()
+                if output is None:
+                    break
+                await websocket.send_text(output)
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            log(f"Send loop error: {exc}")
+
+    async def pty_send_loop(fd: int):
+        # PTY 主端直接挂到事件循环上，可读时回调里 os.read，免去线程池轮询和 sleep
+        # 原始字节以二进制帧发送，UTF-8 解码交给前端 xterm
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+
+        def on_readable():
+            try:
+                data = os.read(fd, 65536)
+            except OSError:
+                data = b""
+            if not data:
+                loop.remove_reader(fd)
+            chunks.put_nowait(data)
+
+        loop.add_reader(fd, on_readable)
         try:
-            while session.running:
-                output = await asyncio.get_event_loop().run_in_executor(None, session.read, 0.05)
-                if output:
-                    await websocket.send_text(output)
-                else:
-                    await asyncio.sleep(0.02)
+            while True:
+                data = await chunks.get()
+                if not data:
+                    session.running = False
+                    break
+                await websocket.send_bytes(data)
+        except asyncio.CancelledError:
+            raise
         except Exception as exc:
             log(f"Send loop error: {exc}")
+        finally:
+            loop.remove_reader(fd)
 
-    send_task = None
+    async def recv_loop():
+        while True:
+            message = await _receive_message(websocket)
+            if not session.running:
+                break
+            if isinstance(message, bytes):
+                if not message:
+                    continue
+                opcode = message[0]
+                if opcode == OP_DATA:
+                    session.write(message[1:])
+                elif opcode == OP_RESIZE and len(message) >= 5:
+                    session.resize(*_SIZE_STRUCT.unpack_from(message, 1))
+                continue
+            # 旧版文本协议，保留一个版本周期
+            if message.startswith("RESIZE:"):
+                parts = message.split(":")
+                rows = int(parts[1]) if len(parts) > 1 else 24
+                cols = int(parts[2]) if len(parts) > 2 else 80
+                session.resize(rows, cols)
+            elif message.startswith("CMD:"):
+                session.write(message[4:] + "\r\n")
+            else:
+                session.write(message)
+
+    tasks = set()
     try:
         project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
         initial_cwd = os.path.dirname(os.environ["APPIMAGE"]) if os.environ.get("APPIMAGE") else (project_root if os.path.isdir(project_root) else os.getcwd())
 
         try:
-            init_message = await websocket.receive_text()
-            if init_message.startswith("INIT:"):
+            init_message = await _receive_message(websocket)
+            if isinstance(init_message, bytes) and init_message[:1] == bytes((OP_INIT,)) and len(init_message) >= 5:
+                rows, cols = _SIZE_STRUCT.unpack_from(init_message, 1)
+                session.start(rows, cols, cwd=initial_cwd)
+                log(f"Session started with size {rows}x{cols}, cwd={initial_cwd}")
+            elif isinstance(init_message, str) and init_message.startswith("INIT:"):
                 parts = init_message.split(":")
                 rows = int(parts[1]) if len(parts) > 1 else 24
                 cols = int(parts[2]) if len(parts) > 2 else 80
@@ -58,33 +182,38 @@ async def websocket_endpoint(websocket: WebSocket):
             return
 
         if not session.running:
-            await websocket.send_text("\033[1;31m[Error] Failed to start terminal session\033[0m\r\n")
+            await websocket.send_bytes(_TERM_ERR)
             await websocket.close()
             return
 
-        backend_mode = getattr(session, "backend_mode", "unknown")
-        await websocket.send_text(f"\033[1;32m[Terminal Ready | {backend_mode}]\033[0m\r\n")
-        send_task = asyncio.create_task(send_loop())
+        await websocket.send_bytes(_ready_banner(getattr(session, "backend_mode", "unknown")))
+        master_fd = getattr(session, "master_fd", None)
+        if master_fd is not None:
+            send_task = asyncio.create_task(pty_send_loop(master_fd))
+        else:
+            send_task = asyncio.create_task(send_loop())
 
-        while True:
-            message = await websocket.receive_text()
-            if not session.running:
-                break
-            if message.startswith("RESIZE:"):
-                parts = message.split(":")
-                rows = int(parts[1]) if len(parts) > 1 else 24
-                cols = int(parts[2]) if len(parts) > 2 else 80
-                session.resize(rows, cols)
-            elif message.startswith("CMD:"):
-                session.write(message[4:] + "\r\n")
-            else:
-                session.write(message)
+        # 收发两端任一结束即取消另一端，异常（如断开）立即向上传播
+        tasks = {send_task, asyncio.create_task(recv_loop())}
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
     except WebSocketDisconnect:
         log("WebSocket disconnected")
     except Exception as exc:
         log(f"WebSocket error: {exc}")
     finally:
-        if send_task:
-            send_task.cancel()
-        session.stop()
-        log("Session stopped")
+        for task in tasks:
+            task.cancel()
+        try:
+            # 等读回调注销后再关闭 fd
+            await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            session.stop()
+            log("Session stopped")
+        # shell 自行退出时由服务端关闭连接
+        if websocket.client_state == WebSocketState.CONNECTED:
+            try:
+                await websocket.close()
+            except Exception:
+                pass
@@ -0,0 +1,33 @@
+import json
+from typing import Any, Callable
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# orjson.JSONDecodeError 继承自 json.JSONDecodeError，FastAPI 的 422 处理保持不变
+_json_loads = orjson.loads if orjson is not None else json.loads
+
+
+class FastJSONRequest(Request):
+    """请求体直接用 orjson 从原始字节解析"""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            self._json = _json_loads(await self.body())
+        return self._json
+
+
+class FastJSONRoute(APIRoute):
+    def get_route_handler(self) -> Callable:
+        original_handler = super().get_route_handler()
+
+        async def handler(request: Request) -> Response:
+            return await original_handler(FastJSONRequest(request.scope, request.receive))
+
+        return handler
@@ -1,6 +1,10 @@
 from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
+
+
+# 只读请求体：冻结实例，忽略多余字段
+REQUEST_CONFIG = ConfigDict(frozen=True, extra="ignore")
 
 
 class EncodeRequest(BaseModel):
@@ -44,6 +48,7 @@ class ConvertRequest(BaseModel):
     from_fmt: str
     to_fmt: str
     separator: Optional[str] = None
+    word_size: Optional[int] = None
 
 
 class IdaAnalyzeRequest(BaseModel):
@@ -129,24 +134,32 @@ class SBoxSaveRequest(BaseModel):
 
 
 class ScriptCreateRequest(BaseModel):
+    model_config = REQUEST_CONFIG
+
     name: str
     content: str
     description: str = ""
 
 
 class ScriptUpdateRequest(BaseModel):
+    model_config = REQUEST_CONFIG
+
     name: Optional[str] = None
     content: Optional[str] = None
     description: Optional[str] = None
 
 
 class KeyBlockChain(BaseModel):
+    model_config = REQUEST_CONFIG
+
     blocks: List[Dict[str, Any]]
     func_name: str = "transform_key"
     args: str = "data"
 
 
 class KeyExecuteRequest(BaseModel):
+    model_config = REQUEST_CONFIG
+
     code: str
     input_hex: str = ""
 
@@ -1,27 +1,73 @@
+import re
+from array import array
+from functools import lru_cache
+
+
+_HEX_WHITESPACE_TABLE = {ord(" "): None, ord("\n"): None, ord("\r"): None}
+_HEX_PREFIX_RE = re.compile(r"0[xX]|\\[xX]")
+_WORD_TYPECODES = {2: "H", 4: "I", 8: "Q"}
+
+
+_FORMAT_ALIASES = {
+    "utf8": "utf-8",
+    "text": "utf-8",
+    "hex": "hex",
+    "ascii": "ascii",
+}
+
+
+@lru_cache(maxsize=32)
 def _normalize_format(value: str) -> str:
     normalized = (value or "utf-8").strip().lower().replace("_", "-")
-    aliases = {
-        "utf8": "utf-8",
-        "text": "utf-8",
-        "hex": "hex",
-        "ascii": "ascii",
-    }
-    return aliases.get(normalized, normalized)
+    return _FORMAT_ALIASES.get(normalized, normalized)
 
 
-def _clean_hex(text: str, separator: str | None = None) -> str:
+def _parse_hex(text: str, separator: str | None = None) -> bytes:
     clean_hex = (text or "").strip()
-    if separator:
+    if separator and not separator.isspace():
         clean_hex = clean_hex.replace(separator, "")
+    if "x" in clean_hex or "X" in clean_hex:
+        clean_hex = _HEX_PREFIX_RE.sub("", clean_hex)
+
+    try:
+        # bytes.fromhex 自带字节间空白容忍，常见输入无需再整串清洗
+        return bytes.fromhex(clean_hex)
+    except ValueError:
+        # 空白落在一个字节的两位之间时才回退到逐字符剔除
+        return bytes.fromhex(clean_hex.translate(_HEX_WHITESPACE_TABLE))
 
-    if separator != " ":
-        clean_hex = clean_hex.replace(" ", "")
-    if separator != "\n":
-        clean_hex = clean_hex.replace("\n", "")
-    if separator != "\r":
-        clean_hex = clean_hex.replace("\r", "")
 
-    return clean_hex.replace("0x", "").replace("0X", "").replace("\\x", "").replace("\\X", "")
+_READERS = {
+    "utf-8": lambda text, separator: text.encode("utf-8"),
+    "hex": _parse_hex,
+    "ascii": lambda text, separator: text.encode("ascii"),
+}
+
+_WRITERS = {
+    "utf-8": lambda data: data.decode("utf-8", errors="replace"),
+    "hex": lambda data: data.hex().upper(),
+    "ascii": lambda data: data.decode("ascii", errors="replace"),
+}
+
+
+def _make_converter(reader, writer):
+    return lambda text, separator: writer(reader(text, separator))
+
+
+# (源格式, 目标格式) -> 转换闭包，模块加载时一次性展开
+_CONVERTERS = {
+    (source, target): _make_converter(reader, writer)
+    for source, reader in _READERS.items()
+    for target, writer in _WRITERS.items()
+}
+
+
+def _fallback_converter(source: str, target: str):
+    # 未知格式按 UTF-8 处理
+    return _CONVERTERS[(
+        source if source in _READERS else "utf-8",
+        target if target in _WRITERS else "utf-8",
+    )]
 
 
 def convert_format(text: str, from_fmt: str, to_fmt: str, separator: str | None = None) -> str:
@@ -31,37 +77,35 @@ def convert_format(text: str, from_fmt: str, to_fmt: str, separator: str | None
     if source == target:
         return text
 
+    converter = _CONVERTERS.get((source, target)) or _fallback_converter(source, target)
+
     try:
-        if source == "utf-8":
-            data = text.encode("utf-8")
-        elif source == "hex":
-            data = bytes.fromhex(_clean_hex(text, separator))
-        elif source == "ascii":
-            data = text.encode("ascii")
-        else:
-            data = text.encode("utf-8")
-
-        if target == "utf-8":
-            return data.decode("utf-8", errors="replace")
-        if target == "hex":
-            return data.hex().upper()
-        if target == "ascii":
-            return data.decode("ascii", errors="replace")
-        return data.decode("utf-8", errors="replace")
+        return converter(text, separator)
     except ValueError:
         return "[错误] 无效的 HEX 数据"
     except Exception as exc:
         return f"[转换错误] {exc}"
 
 
-def swap_endian(text: str, fmt: str, separator: str | None = None) -> str:
+def swap_endian(text: str, fmt: str, separator: str | None = None, word_size: int | None = None) -> str:
     if not text:
         return ""
 
     normalized = _normalize_format(fmt)
     try:
         if normalized == "hex":
-            return bytes.fromhex(_clean_hex(text, separator))[::-1].hex().upper()
+            data = _parse_hex(text, separator)
+            if not word_size or word_size == 1:
+                return data[::-1].hex().upper()
+            typecode = _WORD_TYPECODES.get(word_size)
+            if typecode is None:
+                return "[错误] 字长仅支持 2/4/8 字节"
+            if len(data) % word_size:
+                return f"[错误] 数据长度不是 {word_size} 字节的整数倍"
+            # array.byteswap 在 C 层按字翻转，避免逐字切片拼接
+            words = array(typecode, data)
+            words.byteswap()
+            return words.tobytes().hex().upper()
         return text[::-1]
     except ValueError:
         return "[错误] 无效的 HEX 数据"
@@ -10,6 +10,167 @@ import struct
 import base64
 import os
 import hashlib
+import json
+import threading
+import binascii
+import unicodedata
+from functools import lru_cache
+from operator import itemgetter
+
+try:
+    from Crypto.Cipher import AES as NativeAES
+except ImportError:
+    NativeAES = None
+
+# 没有 AES-NI 时 pycryptodome 退回查表实现，ECB 也改走 OpenSSL (vpaes/bitsliced，常数时间)
+try:
+    from Crypto.Util._cpu_features import have_aes_ni
+    NATIVE_AESNI = bool(have_aes_ni())
+except ImportError:
+    NATIVE_AESNI = False
+
+# OpenSSL 的 CBC 解密/CTR/CFB/OFB 有多块交错及 VAES 宽向量实现，大块数据明显快于 pycryptodome
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:
+    Cipher = None
+try:
+    from cryptography.hazmat.decrepit.ciphers.modes import CFB as OpenSSLCFB, OFB as OpenSSLOFB
+except ImportError:
+    OpenSSLCFB = OpenSSLOFB = None
+
+
+def _xor_bytes(data, keystream):
+    """整段异或: 转成大整数一次完成，代替逐字节 zip"""
+    n = len(data)
+    if not n:
+        return b''
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(keystream[:n], 'big')).to_bytes(n, 'big')
+
+
+def _gmul(a, b):
+    """GF(2^8) 乘法"""
+    result = 0
+    while b:
+        if b & 1:
+            result ^= a
+        a = ((a << 1) ^ 0x1B) & 0xFF if a & 0x80 else a << 1
+        b >>= 1
+    return result
+
+
+# GF(2^8) 常数乘法表，加载时生成一次
+MUL2, MUL3, MUL9, MUL11, MUL13, MUL14 = (bytes(_gmul(a, k) for a in range(256)) for k in (2, 3, 9, 11, 13, 14))
+
+
+def _ror8(word):
+    return ((word >> 8) | (word << 24)) & 0xFFFFFFFF
+
+
+@lru_cache(maxsize=32)
+def _build_tables(sbox):
+    """
+    按 S 盒生成 T 表: Te 融合 SubBytes+MixColumns，Td 融合 InvSubBytes+InvMixColumns
+    列按大端存成 32 位整数 (行0 在最高字节)，Te1..Te3 / Td1..Td3 依次循环右移 8 位
+    """
+    rsbox = [0] * 256
+    for i in range(256):
+        rsbox[sbox[i]] = i
+
+    te0 = []
+    td0 = []
+    for i in range(256):
+        s = sbox[i]
+        te0.append((MUL2[s] << 24) | (s << 16) | (s << 8) | MUL3[s])
+        r = rsbox[i]
+        td0.append((MUL14[r] << 24) | (MUL9[r] << 16) | (MUL13[r] << 8) | MUL11[r])
+
+    te = [te0]
+    td = [td0]
+    for _ in range(3):
+        te.append([_ror8(w) for w in te[-1]])
+        td.append([_ror8(w) for w in td[-1]])
+    return tuple(te), tuple(td), rsbox
+
+
+def _inv_mix_word(word):
+    """对一列 (32 位大端) 做 InvMixColumns，用于解密轮密钥"""
+    b0, b1, b2, b3 = word >> 24, (word >> 16) & 0xFF, (word >> 8) & 0xFF, word & 0xFF
+    return (
+        ((MUL14[b0] ^ MUL11[b1] ^ MUL13[b2] ^ MUL9[b3]) << 24)
+        | ((MUL9[b0] ^ MUL14[b1] ^ MUL11[b2] ^ MUL13[b3]) << 16)
+        | ((MUL13[b0] ^ MUL9[b1] ^ MUL14[b2] ^ MUL11[b3]) << 8)
+        | (MUL11[b0] ^ MUL13[b1] ^ MUL9[b2] ^ MUL14[b3])
+    )
+
+
+# 16 字节分组 <-> 四个 32 位大端列字
+_COLUMNS = struct.Struct('>4I')
+
+# 最后一轮没有 MixColumns: 状态打包成 16 字节后 SubBytes 用 bytes.translate 一次完成，
+# ShiftRows (以及 Magic Swap 的列内翻转) 都是固定的字节下标置换
+_SHIFT_ROWS = itemgetter(*[4 * ((w + j) % 4) + j for w in range(4) for j in range(4)])
+_INV_SHIFT_ROWS = itemgetter(*[4 * ((w - j) % 4) + j for w in range(4) for j in range(4)])
+_SHIFT_ROWS_SWAPPED = itemgetter(*[4 * ((w + j) % 4) + 3 - j for w in range(4) for j in range(4)])
+_INV_SHIFT_ROWS_SWAPPED = itemgetter(*[4 * ((w + 1 + j) % 4) + 3 - j for w in range(4) for j in range(4)])
+
+
+@lru_cache(maxsize=64)
+def _native_ecb(key_bytes: bytes):
+    """ECB 对象无内部状态，按密钥缓存以省去重复的密钥扩展"""
+    return NativeAES.new(key_bytes, NativeAES.MODE_ECB)
+
+
+# 每个 AesPure 实例最多缓存 4 个 IV、每个 16 KiB 的 CTR/OFB 密钥流
+KEYSTREAM_CACHE_BYTES = 16 * 1024
+KEYSTREAM_CACHE_IVS = 4
+
+
+@lru_cache(maxsize=256)
+def _derive_key(key: str) -> bytes:
+    """文本密钥 -> SHA-256 摘要，同一密钥重复调用直接取缓存"""
+    return hashlib.sha256(key.encode('utf-8')).digest()
+
+
+@lru_cache(maxsize=256)
+def _derive_iv(iv: str) -> bytes:
+    """文本 IV -> MD5 摘要"""
+    return hashlib.md5(iv.encode('utf-8')).digest()
+
+
+@lru_cache(maxsize=64)
+def _parse_sbox_text(sbox_str):
+    """S盒文本 (JSON 或 Hex) 按原字符串缓存解析结果，调用方只读不改"""
+    try:
+        sbox = json.loads(sbox_str)
+        if isinstance(sbox, list) and len(sbox) == 256:
+            return sbox
+    except:
+        pass
+    try:
+        sbox_str = sbox_str.replace(' ', '').replace('\n', '')
+        sbox = list(binascii.unhexlify(sbox_str))
+        if len(sbox) == 256:
+            return sbox
+    except:
+        pass
+    return None
+
+
+@lru_cache(maxsize=64)
+def _cached_aes(key_bytes: bytes, sbox, swap_key_schedule, swap_data_round):
+    """AesPure 构造后只读，按密钥/S盒/交换开关缓存实例，重复调用跳过密钥扩展"""
+    return AesPure(key_bytes, list(sbox) if sbox else None, swap_key_schedule, swap_data_round)
+
+
+def _b64encode_prefixed(prefix: bytes, data: bytes) -> str:
+    """
+    等价于 base64(prefix + data)，但不拼出整段密文的副本
+    16 字节 IV 再借 data 的前 2 字节凑满 18 (3 的倍数)，两段分别编码后直接相连
+    """
+    split = -len(prefix) % 3
+    head = base64.b64encode(prefix + data[:split])
+    return (head + base64.b64encode(memoryview(data)[split:])).decode('utf-8')
 
 
 def _format_binary_output(data: bytes, output_format: str = None) -> str:
@@ -23,7 +184,6 @@ def _format_binary_output(data: bytes, output_format: str = None) -> str:
 
     try:
         text_res = data.decode('utf-8')
-        import unicodedata
         has_ctrl = any(
             unicodedata.category(c).startswith('C') and c not in '\n\r\t'
             for c in text_res
@@ -73,182 +233,165 @@ class AesPure:
         else:
             self.sbox = self.STANDARD_SBOX
             
-        # 生成逆S盒
-        self.rsbox = [0] * 256
-        for i in range(256):
-            self.rsbox[self.sbox[i]] = i
+        # T 表与逆S盒按S盒内容缓存，同一S盒的多次调用不再重复生成
+        (self.te, self.td, self.rsbox) = _build_tables(tuple(self.sbox))
+        self.sbox_bytes = bytes(self.sbox)
+        self.rsbox_bytes = bytes(self.rsbox)
+        # (模式, IV) -> CTR/OFB 密钥流前缀，见 AesPureEncoders._keystream
+        self.keystream_cache = {}
+        # 实例在线程池请求间共享，缓存的读取与淘汰/写入需加锁
+        self.keystream_lock = threading.Lock()
             
         self.key_expansion(key)
 
     @staticmethod
-    def _sub_word(word, sbox):
-        return [(sbox[b]) for b in word]
-
-    @staticmethod
-    def _rot_word(word):
-        return word[1:] + word[:1]
+    def normalize_key(key):
+        """非标准长度的密钥填充或截取到 16/24/32 字节"""
+        key_size = len(key)
+        if key_size in (16, 24, 32):
+            return key
+        if key_size < 16: return key + b'\x00' * (16 - key_size)
+        if key_size < 24: return key[:16]
+        if key_size < 32: return key[:24]
+        return key[:32]
 
     def key_expansion(self, key):
         """密钥扩展"""
         # 支持 128, 192, 256 bit 密钥
+        key = self.normalize_key(key)
         key_size = len(key)
-        if key_size == 16:
-            self.rounds = 10
-        elif key_size == 24:
-            self.rounds = 12
-        elif key_size == 32:
-            self.rounds = 14
-        else:
-            # 填充或截取
-            if key_size < 16: key = key + b'\x00' * (16 - key_size)
-            elif key_size < 24: key = key[:16]
-            elif key_size < 32: key = key[:24]
-            else: key = key[:32]
-            key_size = len(key)
-            self.rounds = 10 if key_size == 16 else (12 if key_size == 24 else 14)
+        self.rounds = 10 if key_size == 16 else (12 if key_size == 24 else 14)
 
         Nk = key_size // 4
         Nb = 4
         Nr = self.rounds
         
+        # 热循环里只用局部变量，省去每个字的属性/方法查找
+        sbox = self.sbox
+        rcon = self.RCON
+        swap_key_schedule = self.swap_key_schedule
+        
         words = []
         for i in range(Nk):
             words.append(list(key[4*i:4*i+4]))
             
         for i in range(Nk, Nb * (Nr + 1)):
-            temp = list(words[i-1])
+            t0, t1, t2, t3 = words[i-1]
             if i % Nk == 0:
-                temp = self._rot_word(temp)
-                temp = self._sub_word(temp, self.sbox)
+                # RotWord + SubWord
+                t0, t1, t2, t3 = sbox[t1], sbox[t2], sbox[t3], sbox[t0]
                 
                 # Magic Swap: Key Schedule
-                if self.swap_key_schedule:
-                    temp.reverse()
+                if swap_key_schedule:
+                    t0, t1, t2, t3 = t3, t2, t1, t0
                     
-                temp[0] ^= self.RCON[i // Nk]
+                t0 ^= rcon[i // Nk]
             elif Nk > 6 and i % Nk == 4:
-                temp = self._sub_word(temp, self.sbox)
+                t0, t1, t2, t3 = sbox[t0], sbox[t1], sbox[t2], sbox[t3]
             
-            new_word = [words[i-Nk][j] ^ temp[j] for j in range(4)]
-            words.append(new_word)
+            w0, w1, w2, w3 = words[i-Nk]
+            words.append([w0 ^ t0, w1 ^ t1, w2 ^ t2, w3 ^ t3])
             
         self.round_keys = [words[i:i+4] for i in range(0, len(words), 4)]
 
-    def _magic_swap_state(self, state):
-        """
-        Magic Swap for Data Round:
-        Swap bytes within each column (word) of the state.
-        State is row-major: state[row][col]
-        Column j is: state[0][j], state[1][j], state[2][j], state[3][j]
-        """
-        for j in range(4):
-            # Swap column j: 0<->3, 1<->2
-            state[0][j], state[3][j] = state[3][j], state[0][j]
-            state[1][j], state[2][j] = state[2][j], state[1][j]
+        # 轮密钥的 32 位列形式；解密中间轮密钥预先做 InvMixColumns (等价逆密码)
+        self.enc_words = [
+            tuple((w[0] << 24) | (w[1] << 16) | (w[2] << 8) | w[3] for w in rk)
+            for rk in self.round_keys
+        ]
+        self.dec_words = [self.enc_words[0]] + [
+            tuple(_inv_mix_word(w) for w in rk) for rk in self.enc_words[1:Nr]
+        ] + [self.enc_words[Nr]]
+        # 最后一轮的轮密钥合成 128 位整数，与打包后的状态整块异或
+        self.enc_last_key = int.from_bytes(_COLUMNS.pack(*self.enc_words[Nr]), 'big')
+        self.dec_last_key = int.from_bytes(_COLUMNS.pack(*self.dec_words[0]), 'big')
 
-    # --- 核心变换 ---
-    
-    def _sub_bytes(self, state, sbox):
-        for i in range(4):
-            for j in range(4):
-                state[i][j] = sbox[state[i][j]]
+    # 状态为四个 32 位列字 c0..c3 (行0 在最高字节)
+    # Magic Swap 数据轮在 SubBytes 后翻转每列字节顺序，与按字节的S盒可交换，
+    # 因此只需改变 ShiftRows 取字节的位置，仍可用同一套 T 表
 
-    def _shift_rows(self, state):
-        state[1] = state[1][1:] + state[1][:1]
-        state[2] = state[2][2:] + state[2][:2]
-        state[3] = state[3][3:] + state[3][:3]
+    def encrypt_block(self, block):
+        if self.swap_data_round:
+            return self._encrypt_block_swapped(block)
 
-    def _inv_shift_rows(self, state):
-        state[1] = state[1][-1:] + state[1][:-1]
-        state[2] = state[2][-2:] + state[2][:-2]
-        state[3] = state[3][-3:] + state[3][:-3]
+        te0, te1, te2, te3 = self.te
+        rk = self.enc_words
+        k0, k1, k2, k3 = rk[0]
+        c0, c1, c2, c3 = _COLUMNS.unpack(block)
+        c0 ^= k0; c1 ^= k1; c2 ^= k2; c3 ^= k3
 
-    @staticmethod
-    def _xtime(a):
-        return ((a << 1) ^ 0x1B) & 0xFF if a & 0x80 else (a << 1) & 0xFF
-
-    def _mix_columns(self, state):
-        for i in range(4):
-            t = state[0][i] ^ state[1][i] ^ state[2][i] ^ state[3][i]
-            u = state[0][i]
-            state[0][i] ^= t ^ self._xtime(state[0][i] ^ state[1][i])
-            state[1][i] ^= t ^ self._xtime(state[1][i] ^ state[2][i])
-            state[2][i] ^= t ^ self._xtime(state[2][i] ^ state[3][i])
-            state[3][i] ^= t ^ self._xtime(state[3][i] ^ u)
-
-    def _inv_mix_columns(self, state):
-        for i in range(4):
-            u = self._xtime(self._xtime(state[0][i] ^ state[2][i]))
-            v = self._xtime(self._xtime(state[1][i] ^ state[3][i]))
-            state[0][i] ^= u
-            state[1][i] ^= v
-            state[2][i] ^= u
-            state[3][i] ^= v
-        self._mix_columns(state)
-
-    def _add_round_key(self, state, round_key):
-        for i in range(4):
-            for j in range(4):
-                state[i][j] ^= round_key[j][i]
+        for r in range(1, self.rounds):
+            k0, k1, k2, k3 = rk[r]
+            c0, c1, c2, c3 = (
+                te0[c0 >> 24] ^ te1[(c1 >> 16) & 0xFF] ^ te2[(c2 >> 8) & 0xFF] ^ te3[c3 & 0xFF] ^ k0,
+                te0[c1 >> 24] ^ te1[(c2 >> 16) & 0xFF] ^ te2[(c3 >> 8) & 0xFF] ^ te3[c0 & 0xFF] ^ k1,
+                te0[c2 >> 24] ^ te1[(c3 >> 16) & 0xFF] ^ te2[(c0 >> 8) & 0xFF] ^ te3[c1 & 0xFF] ^ k2,
+                te0[c3 >> 24] ^ te1[(c0 >> 16) & 0xFF] ^ te2[(c1 >> 8) & 0xFF] ^ te3[c2 & 0xFF] ^ k3,
+            )
 
-    def encrypt_block(self, block):
-        # block -> state (4x4)
-        state = [list(block[i:i+4]) for i in range(0, 16, 4)]
-        # Transpose: state[row][col]
-        state = [[state[j][i] for j in range(4)] for i in range(4)]
-        
-        self._add_round_key(state, self.round_keys[0])
-        
-        for i in range(1, self.rounds):
-            self._sub_bytes(state, self.sbox)
-            if self.swap_data_round: self._magic_swap_state(state)
-            self._shift_rows(state)
-            self._mix_columns(state)
-            self._add_round_key(state, self.round_keys[i])
-            
-        self._sub_bytes(state, self.sbox)
-        if self.swap_data_round: self._magic_swap_state(state)
-        self._shift_rows(state)
-        self._add_round_key(state, self.round_keys[self.rounds])
-        
-        # Flatten
-        output = []
-        for j in range(4):
-            for i in range(4):
-                output.append(state[i][j])
-        return bytes(output)
+        # 最后一轮没有 MixColumns: SubBytes 用 translate，ShiftRows 为固定置换
+        state = bytes(_SHIFT_ROWS(_COLUMNS.pack(c0, c1, c2, c3).translate(self.sbox_bytes)))
+        return (int.from_bytes(state, 'big') ^ self.enc_last_key).to_bytes(16, 'big')
 
     def decrypt_block(self, block):
-        state = [list(block[i:i+4]) for i in range(0, 16, 4)]
-        state = [[state[j][i] for j in range(4)] for i in range(4)]
-        
-        self._add_round_key(state, self.round_keys[self.rounds])
-        
-        for i in range(self.rounds - 1, 0, -1):
-            self._inv_shift_rows(state)
-            self._sub_bytes(state, self.rsbox)
-            # Decryption: Undo swap?
-            # Encryption structure: Sub -> Swap -> Shift...
-            # Decryption structure: InvShift -> InvSub ...
-            # To reverse "Sub->Swap", we must swap "after" InvSub (which is inverse of Sub).
-            # But wait, InvSub(Swap(y))? No.
-            # Encryption: y = Swap(Sub(x))
-            # Decryption: x = InvSub(Swap(y))
-            # Because Swap is self-inverse (reverse list), Swap(x) = InvSwap(x).
-            if self.swap_data_round: self._magic_swap_state(state) 
-            self._add_round_key(state, self.round_keys[i])
-            self._inv_mix_columns(state)
-            
-        self._inv_shift_rows(state)
-        self._sub_bytes(state, self.rsbox)
-        if self.swap_data_round: self._magic_swap_state(state)
-        self._add_round_key(state, self.round_keys[0])
-        
-        output = []
-        for j in range(4):
-            for i in range(4):
-                output.append(state[i][j])
-        return bytes(output)
+        if self.swap_data_round:
+            return self._decrypt_block_swapped(block)
+
+        td0, td1, td2, td3 = self.td
+        rk = self.dec_words
+        k0, k1, k2, k3 = rk[self.rounds]
+        c0, c1, c2, c3 = _COLUMNS.unpack(block)
+        c0 ^= k0; c1 ^= k1; c2 ^= k2; c3 ^= k3
+
+        for r in range(self.rounds - 1, 0, -1):
+            k0, k1, k2, k3 = rk[r]
+            c0, c1, c2, c3 = (
+                td0[c0 >> 24] ^ td1[(c3 >> 16) & 0xFF] ^ td2[(c2 >> 8) & 0xFF] ^ td3[c1 & 0xFF] ^ k0,
+                td0[c1 >> 24] ^ td1[(c0 >> 16) & 0xFF] ^ td2[(c3 >> 8) & 0xFF] ^ td3[c2 & 0xFF] ^ k1,
+                td0[c2 >> 24] ^ td1[(c1 >> 16) & 0xFF] ^ td2[(c0 >> 8) & 0xFF] ^ td3[c3 & 0xFF] ^ k2,
+                td0[c3 >> 24] ^ td1[(c2 >> 16) & 0xFF] ^ td2[(c1 >> 8) & 0xFF] ^ td3[c0 & 0xFF] ^ k3,
+            )
+
+        state = bytes(_INV_SHIFT_ROWS(_COLUMNS.pack(c0, c1, c2, c3).translate(self.rsbox_bytes)))
+        return (int.from_bytes(state, 'big') ^ self.dec_last_key).to_bytes(16, 'big')
+
+    def _encrypt_block_swapped(self, block):
+        te0, te1, te2, te3 = self.te
+        rk = self.enc_words
+        k0, k1, k2, k3 = rk[0]
+        c0, c1, c2, c3 = _COLUMNS.unpack(block)
+        c0 ^= k0; c1 ^= k1; c2 ^= k2; c3 ^= k3
+
+        for r in range(1, self.rounds):
+            k0, k1, k2, k3 = rk[r]
+            c0, c1, c2, c3 = (
+                te0[c0 & 0xFF] ^ te1[(c1 >> 8) & 0xFF] ^ te2[(c2 >> 16) & 0xFF] ^ te3[c3 >> 24] ^ k0,
+                te0[c1 & 0xFF] ^ te1[(c2 >> 8) & 0xFF] ^ te2[(c3 >> 16) & 0xFF] ^ te3[c0 >> 24] ^ k1,
+                te0[c2 & 0xFF] ^ te1[(c3 >> 8) & 0xFF] ^ te2[(c0 >> 16) & 0xFF] ^ te3[c1 >> 24] ^ k2,
+                te0[c3 & 0xFF] ^ te1[(c0 >> 8) & 0xFF] ^ te2[(c1 >> 16) & 0xFF] ^ te3[c2 >> 24] ^ k3,
+            )
+
+        state = bytes(_SHIFT_ROWS_SWAPPED(_COLUMNS.pack(c0, c1, c2, c3).translate(self.sbox_bytes)))
+        return (int.from_bytes(state, 'big') ^ self.enc_last_key).to_bytes(16, 'big')
+
+    def _decrypt_block_swapped(self, block):
+        td0, td1, td2, td3 = self.td
+        rk = self.dec_words
+        k0, k1, k2, k3 = rk[self.rounds]
+        c0, c1, c2, c3 = _COLUMNS.unpack(block)
+        c0 ^= k0; c1 ^= k1; c2 ^= k2; c3 ^= k3
+
+        for r in range(self.rounds - 1, 0, -1):
+            k0, k1, k2, k3 = rk[r]
+            c0, c1, c2, c3 = (
+                td0[c1 & 0xFF] ^ td1[(c2 >> 8) & 0xFF] ^ td2[(c3 >> 16) & 0xFF] ^ td3[c0 >> 24] ^ k0,
+                td0[c2 & 0xFF] ^ td1[(c3 >> 8) & 0xFF] ^ td2[(c0 >> 16) & 0xFF] ^ td3[c1 >> 24] ^ k1,
+                td0[c3 & 0xFF] ^ td1[(c0 >> 8) & 0xFF] ^ td2[(c1 >> 16) & 0xFF] ^ td3[c2 >> 24] ^ k2,
+                td0[c0 & 0xFF] ^ td1[(c1 >> 8) & 0xFF] ^ td2[(c2 >> 16) & 0xFF] ^ td3[c3 >> 24] ^ k3,
+            )
+
+        state = bytes(_INV_SHIFT_ROWS_SWAPPED(_COLUMNS.pack(c0, c1, c2, c3).translate(self.rsbox_bytes)))
+        return (int.from_bytes(state, 'big') ^ self.dec_last_key).to_bytes(16, 'big')
 
 class AesPureEncoders:
     """封装 AesPure 用于业务调用"""
@@ -289,23 +432,158 @@ class AesPureEncoders:
             return None
         if isinstance(sbox_str, list) and len(sbox_str) == 256:
             return sbox_str
-        try:
-            import json
-            sbox = json.loads(sbox_str)
-            if isinstance(sbox, list) and len(sbox) == 256:
-                return sbox
-        except:
-            pass
-        try:
-            import binascii
-            sbox_str = sbox_str.replace(' ', '').replace('\n', '')
-            sbox = list(binascii.unhexlify(sbox_str))
-            if len(sbox) == 256:
-                return sbox
-        except:
-            pass
+        if isinstance(sbox_str, (str, bytes)):
+            return _parse_sbox_text(sbox_str)
         return None
 
+    @staticmethod
+    def _native_crypt(key_bytes, mode, iv_bytes, data, encrypt, custom_sbox=None,
+                      swap_key_schedule=False, swap_data_round=False):
+        """
+        标准 AES 参数下走原生实现，魔改S盒/交换时返回 None 回退纯Python
+        ECB 在有 AES-NI 时用按密钥缓存的 pycryptodome 对象，其余情况优先 OpenSSL (cryptography)
+        """
+        if (NativeAES is None and Cipher is None) or swap_key_schedule or swap_data_round:
+            return None
+        if custom_sbox is not None and list(custom_sbox) != AesPure.STANDARD_SBOX:
+            return None
+
+        key_bytes = AesPure.normalize_key(key_bytes)
+        if mode in ('ECB', 'CBC'):
+            # 与纯Python实现一致：不足一块的尾部不参与分组运算
+            usable = len(data) - len(data) % 16
+            if mode == 'CBC' and encrypt and usable != len(data):
+                return None
+            data = data[:usable]
+
+        cipher_mode = None
+        if Cipher is not None:
+            if mode == 'CBC':
+                cipher_mode = modes.CBC(iv_bytes)
+            elif mode == 'CTR':
+                cipher_mode = modes.CTR(iv_bytes)
+            elif mode == 'CFB' and OpenSSLCFB is not None:
+                cipher_mode = OpenSSLCFB(iv_bytes)
+            elif mode == 'OFB' and OpenSSLOFB is not None:
+                cipher_mode = OpenSSLOFB(iv_bytes)
+            elif mode == 'ECB' and not NATIVE_AESNI:
+                cipher_mode = modes.ECB()
+        if cipher_mode is not None:
+            cipher = Cipher(algorithms.AES(bytes(key_bytes)), cipher_mode)
+            ctx = cipher.encryptor() if encrypt else cipher.decryptor()
+            return ctx.update(data) + ctx.finalize()
+        if NativeAES is None:
+            return None
+
+        if mode == 'ECB':
+            cipher = _native_ecb(bytes(key_bytes))
+        elif mode == 'CBC':
+            cipher = NativeAES.new(key_bytes, NativeAES.MODE_CBC, iv=iv_bytes)
+        elif mode == 'CTR':
+            cipher = NativeAES.new(key_bytes, NativeAES.MODE_CTR, nonce=b'', initial_value=iv_bytes)
+        elif mode == 'OFB':
+            cipher = NativeAES.new(key_bytes, NativeAES.MODE_OFB, iv=iv_bytes)
+        elif mode == 'CFB':
+            cipher = NativeAES.new(key_bytes, NativeAES.MODE_CFB, iv=iv_bytes, segment_size=128)
+        else:
+            return None
+        return cipher.encrypt(data) if encrypt else cipher.decrypt(data)
+
+    @staticmethod
+    def _keystream(aes, mode, iv_bytes, length):
+        """
+        CTR/OFB 密钥流与数据无关，先整段生成再一次性异或
+        AesPure 实例按密钥缓存，同一 (模式, IV) 的密钥流前缀挂在实例上复用，不够长时从前缀末尾续算
+        """
+        cache = aes.keystream_cache
+        cache_key = (mode, iv_bytes)
+        with aes.keystream_lock:
+            stream = cache.get(cache_key, b'')
+        if len(stream) >= length:
+            return stream
+
+        done = len(stream) // 16
+        nblocks = (length + 15) // 16 - done
+        encrypt_block = aes.encrypt_block
+        if mode == 'CTR':
+            ctr = int.from_bytes(iv_bytes, byteorder='big') + done
+            stream += b''.join(encrypt_block(c.to_bytes(16, byteorder='big')) for c in range(ctr, ctr + nblocks))
+        else:
+            blocks = []
+            last_iv = stream[-16:] if stream else iv_bytes
+            for _ in range(nblocks):
+                last_iv = encrypt_block(last_iv)
+                blocks.append(last_iv)
+            stream += b''.join(blocks)
+
+        if len(stream) <= KEYSTREAM_CACHE_BYTES:
+            with aes.keystream_lock:
+                if cache_key not in cache and len(cache) >= KEYSTREAM_CACHE_IVS:
+                    del cache[next(iter(cache))]
+                cache[cache_key] = stream
+        return stream
+
+    @staticmethod
+    def _encrypt_pure(aes, mode, iv_bytes, padded):
+        # 各分组结果收集到列表后一次 join，避免 bytes += 的反复拷贝
+        encrypt_block = aes.encrypt_block
+        
+        if mode == 'ECB':
+            full = len(padded) - len(padded) % 16
+            res = b''.join([encrypt_block(padded[i:i+16]) for i in range(0, full, 16)])
+                
+        elif mode == 'CBC':
+            blocks = []
+            prev = iv_bytes
+            for i in range(0, len(padded), 16):
+                prev = encrypt_block(_xor_bytes(padded[i:i+16], prev))
+                blocks.append(prev)
+            res = b''.join(blocks)
+                
+        elif mode in ('CTR', 'OFB'):
+            res = _xor_bytes(padded, AesPureEncoders._keystream(aes, mode, iv_bytes, len(padded)))
+                
+        elif mode == 'CFB':
+            blocks = []
+            last_block = iv_bytes
+            for i in range(0, len(padded), 16):
+                cipher_chunk = _xor_bytes(padded[i:i+16], encrypt_block(last_block))
+                blocks.append(cipher_chunk)
+                if len(cipher_chunk) == 16:
+                    last_block = cipher_chunk
+            res = b''.join(blocks)
+        else:
+            raise ValueError(f"不支持的加密模式: {mode}")
+        return res
+
+    @staticmethod
+    def _decrypt_pure(aes, mode, iv_bytes, data_content):
+        full = len(data_content) - len(data_content) % 16
+        
+        if mode == 'ECB':
+            decrypt_block = aes.decrypt_block
+            res = b''.join([decrypt_block(data_content[i:i+16]) for i in range(0, full, 16)])
+                
+        elif mode == 'CBC':
+            # 解密时每块只依赖已知的前一块密文：先整段逐块解密，再与 IV||密文 错位一次异或
+            decrypt_block = aes.decrypt_block
+            raw = b''.join([decrypt_block(data_content[i:i+16]) for i in range(0, full, 16)])
+            res = _xor_bytes(raw, iv_bytes + data_content[:full - 16])
+                
+        elif mode in ('CTR', 'OFB'):
+            res = _xor_bytes(data_content, AesPureEncoders._keystream(aes, mode, iv_bytes, len(data_content)))
+                
+        elif mode == 'CFB':
+            # 同理，密钥流输入就是 IV||密文 (最后不完整块之前)，整段生成后一次异或
+            encrypt_block = aes.encrypt_block
+            n = len(data_content)
+            feed = iv_bytes + data_content[:(n - 1) // 16 * 16]
+            keystream = b''.join([encrypt_block(feed[i:i+16]) for i in range(0, len(feed), 16)]) if n else b''
+            res = _xor_bytes(data_content, keystream)
+        else:
+            raise ValueError(f"不支持的加密模式: {mode}")
+        return res
+
     @staticmethod
     def encrypt(data: str, key: str, mode: str = 'ECB', iv: str = '', padding: str = 'pkcs7', 
                 sbox=None, swap_key_schedule: bool = False, swap_data_round: bool = False,
@@ -335,13 +613,11 @@ class AesPureEncoders:
             except:
                 raise ValueError("密钥不是有效的Hex字符串")
         else:
-            key_bytes = hashlib.sha256(key.encode('utf-8')).digest()
+            key_bytes = _derive_key(key)
         
         # 自定义S盒
         custom_sbox = AesPureEncoders._parse_sbox(sbox)
         
-        aes = AesPure(key_bytes, custom_sbox, swap_key_schedule, swap_data_round)
-        
         # 数据处理
         if data_type and data_type.lower() == 'hex':
             try:
@@ -366,7 +642,7 @@ class AesPureEncoders:
                     if "IV Hex" in str(e): raise e
                     raise ValueError("IV不是有效的Hex字符串")
             else:
-                iv_bytes = hashlib.md5(iv.encode('utf-8')).digest()
+                iv_bytes = _derive_iv(iv)
         else:
             iv_bytes = None
         
@@ -377,59 +653,16 @@ class AesPureEncoders:
         else:
             padded = AesPureEncoders._pad(data_bytes, padding)
         
-        res = b''
-        
-        if mode == 'ECB':
-            for i in range(0, len(padded), 16):
-                block = padded[i:i+16]
-                if len(block) < 16: break
-                res += aes.encrypt_block(block)
-                
-        elif mode == 'CBC':
-            prev = iv_bytes
-            for i in range(0, len(padded), 16):
-                block = bytes([a ^ b for a, b in zip(padded[i:i+16], prev)])
-                enc = aes.encrypt_block(block)
-                res += enc
-                prev = enc
-                
-        elif mode == 'CTR':
-            ctr = int.from_bytes(iv_bytes, byteorder='big')
-            for i in range(0, len(padded), 16):
-                block = padded[i:i+16]
-                ctr_block = ctr.to_bytes(16, byteorder='big')
-                keystream = aes.encrypt_block(ctr_block)
-                chunk_len = len(block)
-                cipher_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                res += cipher_chunk
-                ctr += 1
-                
-        elif mode == 'OFB':
-            last_iv = iv_bytes
-            for i in range(0, len(padded), 16):
-                block = padded[i:i+16]
-                keystream = aes.encrypt_block(last_iv)
-                chunk_len = len(block)
-                cipher_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                res += cipher_chunk
-                last_iv = keystream
-                
-        elif mode == 'CFB':
-            last_block = iv_bytes
-            for i in range(0, len(padded), 16):
-                block = padded[i:i+16]
-                keystream = aes.encrypt_block(last_block)
-                chunk_len = len(block)
-                cipher_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                res += cipher_chunk
-                if chunk_len == 16:
-                    last_block = cipher_chunk
-        else:
-            raise ValueError(f"不支持的加密模式: {mode}")
+        res = AesPureEncoders._native_crypt(key_bytes, mode, iv_bytes, padded, True,
+                                            custom_sbox, swap_key_schedule, swap_data_round)
+        if res is None:
+            aes = _cached_aes(bytes(key_bytes), tuple(custom_sbox) if custom_sbox else None,
+                              bool(swap_key_schedule), bool(swap_data_round))
+            res = AesPureEncoders._encrypt_pure(aes, mode, iv_bytes, padded)
         
         # 返回自动携带IV（当IV未提供且非ECB模式时）
         if not iv and iv_bytes and mode != 'ECB':
-            return base64.b64encode(iv_bytes + res).decode('utf-8')
+            return _b64encode_prefixed(iv_bytes, res)
         return base64.b64encode(res).decode('utf-8')
 
     @staticmethod
@@ -462,13 +695,11 @@ class AesPureEncoders:
             except:
                 raise ValueError("密钥不是有效的Hex字符串")
         else:
-            key_bytes = hashlib.sha256(key.encode('utf-8')).digest()
+            key_bytes = _derive_key(key)
         
         # 自定义S盒
         custom_sbox = AesPureEncoders._parse_sbox(sbox)
         
-        aes = AesPure(key_bytes, custom_sbox, swap_key_schedule, swap_data_round)
-        
         # 数据处理
         try:
             if data_type and data_type.lower() == 'hex':
@@ -499,7 +730,7 @@ class AesPureEncoders:
                         if "IV Hex" in str(e): raise e
                         raise ValueError("IV不是有效的Hex字符串")
                 else:
-                    iv_bytes = hashlib.md5(iv.encode('utf-8')).digest()
+                    iv_bytes = _derive_iv(iv)
             else:
                 # 从密文中提取IV
                 if len(encrypted) < 16:
@@ -507,56 +738,12 @@ class AesPureEncoders:
                 iv_bytes = encrypted[:16]
                 data_content = encrypted[16:]
         
-        res = b''
-        
-        if mode == 'ECB':
-            for i in range(0, len(data_content), 16):
-                block = data_content[i:i+16]
-                if len(block) < 16: break
-                res += aes.decrypt_block(block)
-                
-        elif mode == 'CBC':
-            prev = iv_bytes
-            for i in range(0, len(data_content), 16):
-                block = data_content[i:i+16]
-                if len(block) < 16: break
-                dec = aes.decrypt_block(block)
-                res += bytes([a ^ b for a, b in zip(dec, prev)])
-                prev = block
-                
-        elif mode == 'CTR':
-            ctr = int.from_bytes(iv_bytes, byteorder='big')
-            for i in range(0, len(data_content), 16):
-                block = data_content[i:i+16]
-                ctr_block = ctr.to_bytes(16, byteorder='big')
-                keystream = aes.encrypt_block(ctr_block)
-                chunk_len = len(block)
-                plain_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                res += plain_chunk
-                ctr += 1
-                
-        elif mode == 'OFB':
-            last_iv = iv_bytes
-            for i in range(0, len(data_content), 16):
-                block = data_content[i:i+16]
-                keystream = aes.encrypt_block(last_iv)
-                chunk_len = len(block)
-                plain_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                res += plain_chunk
-                last_iv = keystream
-                
-        elif mode == 'CFB':
-            last_block = iv_bytes
-            for i in range(0, len(data_content), 16):
-                block = data_content[i:i+16]
-                keystream = aes.encrypt_block(last_block)
-                chunk_len = len(block)
-                plain_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                res += plain_chunk
-                if chunk_len == 16:
-                    last_block = block
-        else:
-            raise ValueError(f"不支持的加密模式: {mode}")
+        res = AesPureEncoders._native_crypt(key_bytes, mode, iv_bytes, data_content, False,
+                                            custom_sbox, swap_key_schedule, swap_data_round)
+        if res is None:
+            aes = _cached_aes(bytes(key_bytes), tuple(custom_sbox) if custom_sbox else None,
+                              bool(swap_key_schedule), bool(swap_data_round))
+            res = AesPureEncoders._decrypt_pure(aes, mode, iv_bytes, data_content)
         
         # 去填充
         is_stream = mode in ['CFB', 'OFB', 'CTR']
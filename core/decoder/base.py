@@ -7,10 +7,33 @@ Base家族编码解码器实现
 
 import base64
 
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+def _b64decode(data, altchars):
+    """
+    pybase64 只用于能通过严格校验的规范输入；校验失败的 (非法字符、中途填充、缺填充等)
+    交给标准库，保证接受的输入和解出的字节与 base64 模块完全一致
+    """
+    if pybase64 is not None:
+        try:
+            return pybase64.b64decode(data, altchars=altchars, validate=True)
+        except ValueError:
+            pass
+    return base64.b64decode(data, altchars=altchars)
+
+
+# str.strip() 对 ASCII 去掉的空白字符，bytes 输入按同一集合处理
+_ASCII_WHITESPACE = b' \t\n\r\x0b\x0c\x1c\x1d\x1e\x1f'
+
 class BaseEncoders:
     """Base家族编码解码器"""
     @staticmethod
     def _clean_input(data: str) -> str:
+        if isinstance(data, bytes):
+            return data.strip(_ASCII_WHITESPACE).replace(b' ', b'').replace(b'\n', b'').replace(b'\r', b'')
         return data.strip().replace(' ', '').replace('\n', '').replace('\r', '')
 
     @staticmethod
@@ -18,7 +41,7 @@ class BaseEncoders:
         try:
             if isinstance(data, str):
                 data = data.encode('utf-8')
-            return base64.b16encode(data).decode('ascii')
+            return data.hex().upper()
         except Exception as e:
             raise ValueError(f"Base16编码失败: {str(e)}")
 
@@ -32,8 +55,8 @@ class BaseEncoders:
 
     @staticmethod
     def base16_decode_to_bytes(data: str) -> bytes:
-        cleaned = BaseEncoders._clean_input(data)
-        return base64.b16decode(cleaned.upper())
+        # bytes.fromhex 本身大小写不敏感，省去 upper() 的整串拷贝
+        return bytes.fromhex(BaseEncoders._clean_input(data))
 
     @staticmethod
     def base32_encode(data: str) -> str:
@@ -54,10 +77,13 @@ class BaseEncoders:
 
     @staticmethod
     def base32_decode_to_bytes(data: str) -> bytes:
-        cleaned = BaseEncoders._clean_input(data).replace('=', '')
+        # 也接受纯 ASCII 的 bytes，管道里直接解码上一步输出
+        cleaned = BaseEncoders._clean_input(data)
+        pad = b'=' if isinstance(cleaned, bytes) else '='
+        cleaned = cleaned.replace(pad, pad[:0])
         padding = len(cleaned) % 8
         if padding != 0:
-            cleaned += '=' * (8 - padding)
+            cleaned += pad * (8 - padding)
         return base64.b32decode(cleaned)
 
     @staticmethod
@@ -65,6 +91,10 @@ class BaseEncoders:
         try:
             if isinstance(data, str):
                 data = data.encode('utf-8')
+            if pybase64 is not None:
+                if url_safe:
+                    return pybase64.urlsafe_b64encode(data).decode('ascii')
+                return pybase64.b64encode_as_string(data)
             if url_safe:
                 return base64.urlsafe_b64encode(data).decode('ascii')
             else:
@@ -82,13 +112,14 @@ class BaseEncoders:
 
     @staticmethod
     def base64_decode_to_bytes(data: str, url_safe: bool = False) -> bytes:
+        # 也接受纯 ASCII 的 bytes，管道里直接解码上一步输出
         cleaned = BaseEncoders._clean_input(data)
         if url_safe:
-            return base64.urlsafe_b64decode(cleaned)
+            return _b64decode(cleaned, b'-_')
         padding = len(cleaned) % 4
         if padding != 0:
-            cleaned += '=' * (4 - padding)
-        return base64.b64decode(cleaned)
+            cleaned += (b'=' if isinstance(cleaned, bytes) else '=') * (4 - padding)
+        return _b64decode(cleaned, None)
 
     @staticmethod
     def base85_encode(data: str, variant: str = 'ascii85') -> str:
@@ -11,6 +11,59 @@ import struct
 import base64
 import os
 import hashlib
+import json
+import unicodedata
+from functools import lru_cache
+
+try:
+    from Crypto.Cipher import DES as NativeDES, DES3 as NativeDES3
+except ImportError:
+    NativeDES = None
+    NativeDES3 = None
+
+
+@lru_cache(maxsize=256)
+def _derive_key(key: str) -> bytes:
+    """DES 文本密钥 -> MD5 摘要前 8 字节，同一密钥重复调用直接取缓存"""
+    return hashlib.md5(key.encode('utf-8')).digest()[:8]
+
+
+@lru_cache(maxsize=256)
+def _derive_3des_key(key: str) -> bytes:
+    """3DES 文本密钥 -> SHA-256 摘要前 24 字节"""
+    return hashlib.sha256(key.encode('utf-8')).digest()[:24]
+
+
+@lru_cache(maxsize=256)
+def _derive_iv(iv: str) -> bytes:
+    """文本 IV -> MD5 摘要前 8 字节"""
+    return hashlib.md5(iv.encode('utf-8')).digest()[:8]
+
+
+@lru_cache(maxsize=64)
+def _native_ecb(native, key_bytes: bytes):
+    """ECB 对象无内部状态，按密钥缓存；DES3 每次构造都要在 Python 里逐字节校正奇偶位"""
+    return native.new(key_bytes, native.MODE_ECB)
+
+
+@lru_cache(maxsize=64)
+def _parse_sboxes_text(sbox_str):
+    """S盒 JSON 文本按原字符串缓存解析结果，调用方只读不改"""
+    try:
+        sboxes = json.loads(sbox_str)
+        if isinstance(sboxes, list) and len(sboxes) == 8:
+            return sboxes
+    except:
+        pass
+    return None
+
+
+def _xor_bytes(a: bytes, b: bytes) -> bytes:
+    """按较短一方逐字节异或 (同 zip 语义)，转成大整数一次完成"""
+    n = min(len(a), len(b))
+    if not n:
+        return b''
+    return (int.from_bytes(a[:n], 'big') ^ int.from_bytes(b[:n], 'big')).to_bytes(n, 'big')
 
 
 def _format_binary_output(data: bytes, output_format: str = None) -> str:
@@ -24,7 +77,6 @@ def _format_binary_output(data: bytes, output_format: str = None) -> str:
 
     try:
         text_res = data.decode('utf-8')
-        import unicodedata
         has_ctrl = any(
             unicodedata.category(c).startswith('C') and c not in '\n\r\t'
             for c in text_res
@@ -302,13 +354,8 @@ class DESEncoders:
             return None
         if isinstance(sbox_str, list) and len(sbox_str) == 8:
             return sbox_str
-        try:
-            import json
-            sboxes = json.loads(sbox_str)
-            if isinstance(sboxes, list) and len(sboxes) == 8:
-                return sboxes
-        except:
-            pass
+        if isinstance(sbox_str, (str, bytes)):
+            return _parse_sboxes_text(sbox_str)
         return None
 
     def encrypt_block(self, block, key):
@@ -327,6 +374,43 @@ class DESEncoders:
         decrypted_bits = self._des_block(block_bits, encrypt=False)
         return self._bits_to_bytes(decrypted_bits)
 
+    @staticmethod
+    def _native_crypt(key_bytes, mode, iv_bytes, data, encrypt, custom_sboxes=None):
+        """
+        标准S盒下走 pycryptodome (8 字节密钥为 DES，24 字节为 3DES)
+        魔改S盒、ECB/CBC 非整块数据、退化的 3DES 密钥时返回 None 回退纯Python
+        """
+        if NativeDES is None:
+            return None
+        if custom_sboxes is not None and custom_sboxes != DESEncoders.STANDARD_SBOXES:
+            return None
+        if mode in ('ECB', 'CBC') and len(data) % 8:
+            return None
+        if len(key_bytes) == 8:
+            native = NativeDES
+        elif len(key_bytes) == 24:
+            native = NativeDES3
+        else:
+            return None
+
+        try:
+            if mode == 'ECB':
+                cipher = _native_ecb(native, bytes(key_bytes))
+            elif mode == 'CBC':
+                cipher = native.new(key_bytes, native.MODE_CBC, iv=iv_bytes)
+            elif mode == 'CTR':
+                cipher = native.new(key_bytes, native.MODE_CTR, nonce=b'', initial_value=iv_bytes)
+            elif mode == 'OFB':
+                cipher = native.new(key_bytes, native.MODE_OFB, iv=iv_bytes)
+            elif mode == 'CFB':
+                cipher = native.new(key_bytes, native.MODE_CFB, iv=iv_bytes, segment_size=64)
+            else:
+                return None
+        except ValueError:
+            # K1==K2 或 K2==K3 时 DES3 会拒绝该密钥
+            return None
+        return cipher.encrypt(data) if encrypt else cipher.decrypt(data)
+
     @staticmethod
     def des_encrypt(data: str, key: str, mode: str = 'ECB', iv: str = '',
                     padding: str = 'pkcs7', sboxes=None,
@@ -343,7 +427,7 @@ class DESEncoders:
             except:
                 raise ValueError("密钥不是有效的Hex字符串")
         else:
-            key_bytes = hashlib.md5(key.encode('utf-8')).digest()[:8]
+            key_bytes = _derive_key(key)
 
         if len(key_bytes) < 8:
             key_bytes = key_bytes + b'\x00' * (8 - len(key_bytes))
@@ -367,7 +451,7 @@ class DESEncoders:
                     except ValueError as e:
                         raise e
                 else:
-                    iv_bytes = hashlib.md5(iv.encode('utf-8')).digest()[:8]
+                    iv_bytes = _derive_iv(iv)
         else:
             iv_bytes = None
 
@@ -389,58 +473,61 @@ class DESEncoders:
         else:
             padded = DESEncoders._pad_data(data_bytes, padding)
 
-        encrypted = b''
-
-        if mode == 'ECB':
-            for i in range(0, len(padded), 8):
-                block = padded[i:i + 8]
-                if len(block) < 8:
-                    break
-                encrypted += des.encrypt_block(block, key_bytes)
-
-        elif mode == 'CBC':
-            last_block = iv_bytes
-            for i in range(0, len(padded), 8):
-                block = padded[i:i + 8]
-                input_block = bytes([a ^ b for a, b in zip(block, last_block)])
-                output_block = des.encrypt_block(input_block, key_bytes)
-                encrypted += output_block
-                last_block = output_block
-
-        elif mode == 'CTR':
-            ctr = int.from_bytes(iv_bytes, byteorder='big')
-            for i in range(0, len(padded), 8):
-                block = padded[i:i + 8]
-                ctr_block = ctr.to_bytes(8, byteorder='big')
-                keystream = des.encrypt_block(ctr_block, key_bytes)
-                chunk_len = len(block)
-                cipher_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                encrypted += cipher_chunk
-                ctr += 1
-
-        elif mode == 'OFB':
-            last_iv = iv_bytes
-            for i in range(0, len(padded), 8):
-                block = padded[i:i + 8]
-                keystream = des.encrypt_block(last_iv, key_bytes)
-                chunk_len = len(block)
-                cipher_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                encrypted += cipher_chunk
-                last_iv = keystream
-
-        elif mode == 'CFB':
-            last_block = iv_bytes
-            for i in range(0, len(padded), 8):
-                block = padded[i:i + 8]
-                keystream = des.encrypt_block(last_block, key_bytes)
-                chunk_len = len(block)
-                cipher_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                encrypted += cipher_chunk
-                if chunk_len == 8:
-                    last_block = cipher_chunk
+        # 标准S盒走 pycryptodome，魔改S盒等情况回退到下面的纯Python分组循环
+        encrypted = DESEncoders._native_crypt(key_bytes, mode, iv_bytes, padded, True, custom_sboxes)
+        if encrypted is None:
+            encrypted = bytearray()
+
+            if mode == 'ECB':
+                for i in range(0, len(padded), 8):
+                    block = padded[i:i + 8]
+                    if len(block) < 8:
+                        break
+                    encrypted += des.encrypt_block(block, key_bytes)
+
+            elif mode == 'CBC':
+                last_block = iv_bytes
+                for i in range(0, len(padded), 8):
+                    block = padded[i:i + 8]
+                    input_block = _xor_bytes(block, last_block)
+                    output_block = des.encrypt_block(input_block, key_bytes)
+                    encrypted += output_block
+                    last_block = output_block
+
+            elif mode == 'CTR':
+                ctr = int.from_bytes(iv_bytes, byteorder='big')
+                for i in range(0, len(padded), 8):
+                    block = padded[i:i + 8]
+                    ctr_block = ctr.to_bytes(8, byteorder='big')
+                    keystream = des.encrypt_block(ctr_block, key_bytes)
+                    chunk_len = len(block)
+                    cipher_chunk = _xor_bytes(block, keystream)
+                    encrypted += cipher_chunk
+                    ctr += 1
+
+            elif mode == 'OFB':
+                last_iv = iv_bytes
+                for i in range(0, len(padded), 8):
+                    block = padded[i:i + 8]
+                    keystream = des.encrypt_block(last_iv, key_bytes)
+                    chunk_len = len(block)
+                    cipher_chunk = _xor_bytes(block, keystream)
+                    encrypted += cipher_chunk
+                    last_iv = keystream
+
+            elif mode == 'CFB':
+                last_block = iv_bytes
+                for i in range(0, len(padded), 8):
+                    block = padded[i:i + 8]
+                    keystream = des.encrypt_block(last_block, key_bytes)
+                    chunk_len = len(block)
+                    cipher_chunk = _xor_bytes(block, keystream)
+                    encrypted += cipher_chunk
+                    if chunk_len == 8:
+                        last_block = cipher_chunk
 
-        else:
-            raise ValueError("Unsupported mode")
+            else:
+                raise ValueError("Unsupported mode")
 
         if not iv and iv_bytes and mode != 'ECB':
             return base64.b64encode(iv_bytes + encrypted).decode('utf-8')
@@ -462,7 +549,7 @@ class DESEncoders:
             except:
                 raise ValueError("密钥不是有效的Hex字符串")
         else:
-            key_bytes = hashlib.md5(key.encode('utf-8')).digest()[:8]
+            key_bytes = _derive_key(key)
 
         if len(key_bytes) < 8:
             key_bytes = key_bytes + b'\x00' * (8 - len(key_bytes))
@@ -500,7 +587,7 @@ class DESEncoders:
                     except ValueError as e:
                         raise e
                 else:
-                    iv_bytes = hashlib.md5(iv.encode('utf-8')).digest()[:8]
+                    iv_bytes = _derive_iv(iv)
             else:
                 if len(encrypted_data) < 8:
                     return ""
@@ -508,58 +595,61 @@ class DESEncoders:
                 data_content = encrypted_data[8:]
 
         des = DESEncoders(custom_sboxes)
-        decrypted = b''
-
-        if mode == 'ECB':
-            for i in range(0, len(data_content), 8):
-                block = data_content[i:i + 8]
-                decrypted += des.decrypt_block(block, key_bytes)
-
-        elif mode == 'CBC':
-            last_block = iv_bytes
-            for i in range(0, len(data_content), 8):
-                block = data_content[i:i + 8]
-                output_block = des.decrypt_block(block, key_bytes)
-                plain_block = bytes([a ^ b for a, b in zip(output_block, last_block)])
-                decrypted += plain_block
-                last_block = block
-
-        elif mode == 'CTR':
-            ctr = int.from_bytes(iv_bytes, byteorder='big')
-            for i in range(0, len(data_content), 8):
-                block = data_content[i:i + 8]
-                ctr_block = ctr.to_bytes(8, byteorder='big')
-                keystream = des.encrypt_block(ctr_block, key_bytes)
-                chunk_len = len(block)
-                plain_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                decrypted += plain_chunk
-                ctr += 1
-
-        elif mode == 'OFB':
-            last_iv = iv_bytes
-            for i in range(0, len(data_content), 8):
-                block = data_content[i:i + 8]
-                keystream = des.encrypt_block(last_iv, key_bytes)
-                chunk_len = len(block)
-                plain_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                decrypted += plain_chunk
-                last_iv = keystream
-
-        elif mode == 'CFB':
-            last_block = iv_bytes
-            for i in range(0, len(data_content), 8):
-                block = data_content[i:i + 8]
-                keystream = des.encrypt_block(last_block, key_bytes)
-                chunk_len = len(block)
-                plain_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                decrypted += plain_chunk
-                if chunk_len == 8:
+        # 标准S盒走 pycryptodome，魔改S盒等情况回退到下面的纯Python分组循环
+        decrypted = DESEncoders._native_crypt(key_bytes, mode, iv_bytes, data_content, False, custom_sboxes)
+        if decrypted is None:
+            decrypted = bytearray()
+
+            if mode == 'ECB':
+                for i in range(0, len(data_content), 8):
+                    block = data_content[i:i + 8]
+                    decrypted += des.decrypt_block(block, key_bytes)
+
+            elif mode == 'CBC':
+                last_block = iv_bytes
+                for i in range(0, len(data_content), 8):
+                    block = data_content[i:i + 8]
+                    output_block = des.decrypt_block(block, key_bytes)
+                    plain_block = _xor_bytes(output_block, last_block)
+                    decrypted += plain_block
                     last_block = block
 
+            elif mode == 'CTR':
+                ctr = int.from_bytes(iv_bytes, byteorder='big')
+                for i in range(0, len(data_content), 8):
+                    block = data_content[i:i + 8]
+                    ctr_block = ctr.to_bytes(8, byteorder='big')
+                    keystream = des.encrypt_block(ctr_block, key_bytes)
+                    chunk_len = len(block)
+                    plain_chunk = _xor_bytes(block, keystream)
+                    decrypted += plain_chunk
+                    ctr += 1
+
+            elif mode == 'OFB':
+                last_iv = iv_bytes
+                for i in range(0, len(data_content), 8):
+                    block = data_content[i:i + 8]
+                    keystream = des.encrypt_block(last_iv, key_bytes)
+                    chunk_len = len(block)
+                    plain_chunk = _xor_bytes(block, keystream)
+                    decrypted += plain_chunk
+                    last_iv = keystream
+
+            elif mode == 'CFB':
+                last_block = iv_bytes
+                for i in range(0, len(data_content), 8):
+                    block = data_content[i:i + 8]
+                    keystream = des.encrypt_block(last_block, key_bytes)
+                    chunk_len = len(block)
+                    plain_chunk = _xor_bytes(block, keystream)
+                    decrypted += plain_chunk
+                    if chunk_len == 8:
+                        last_block = block
+
         is_stream = mode in ['CFB', 'OFB', 'CTR']
-        final_bytes = decrypted
+        final_bytes = bytes(decrypted)
         if not is_stream:
-            final_bytes = DESEncoders._unpad_data(decrypted, padding)
+            final_bytes = DESEncoders._unpad_data(final_bytes, padding)
 
         return _format_binary_output(final_bytes, output_format)
 
@@ -579,7 +669,7 @@ class DESEncoders:
             except:
                 raise ValueError("密钥不是有效的Hex字符串")
         else:
-            key_bytes = hashlib.sha256(key.encode('utf-8')).digest()[:24]
+            key_bytes = _derive_3des_key(key)
 
         if len(key_bytes) < 24:
             key_bytes = key_bytes + key_bytes[:24 - len(key_bytes)]
@@ -604,7 +694,7 @@ class DESEncoders:
                     except ValueError as e:
                         raise e
                 else:
-                    iv_bytes = hashlib.md5(iv.encode('utf-8')).digest()[:8]
+                    iv_bytes = _derive_iv(iv)
         else:
             iv_bytes = None
 
@@ -629,26 +719,31 @@ class DESEncoders:
             step3 = des.encrypt_block(step2, k3)
             return step3
 
-        encrypted = b''
+        # 标准S盒走 pycryptodome，魔改S盒等情况回退到下面的纯Python分组循环
+        encrypted = None
+        if mode in ('ECB', 'CBC'):
+            encrypted = DESEncoders._native_crypt(key_bytes, mode, iv_bytes, padded, True, custom_sboxes)
+        if encrypted is None:
+            encrypted = bytearray()
+
+            if mode == 'ECB':
+                for i in range(0, len(padded), 8):
+                    block = padded[i:i + 8]
+                    if len(block) < 8:
+                        break
+                    encrypted += ede_encrypt(block)
+
+            elif mode == 'CBC':
+                last_block = iv_bytes
+                for i in range(0, len(padded), 8):
+                    block = padded[i:i + 8]
+                    input_block = _xor_bytes(block, last_block)
+                    output_block = ede_encrypt(input_block)
+                    encrypted += output_block
+                    last_block = output_block
 
-        if mode == 'ECB':
-            for i in range(0, len(padded), 8):
-                block = padded[i:i + 8]
-                if len(block) < 8:
-                    break
-                encrypted += ede_encrypt(block)
-
-        elif mode == 'CBC':
-            last_block = iv_bytes
-            for i in range(0, len(padded), 8):
-                block = padded[i:i + 8]
-                input_block = bytes([a ^ b for a, b in zip(block, last_block)])
-                output_block = ede_encrypt(input_block)
-                encrypted += output_block
-                last_block = output_block
-
-        else:
-            raise ValueError(f"3DES暂不支持 {mode} 模式")
+            else:
+                raise ValueError(f"3DES暂不支持 {mode} 模式")
 
         if not iv and iv_bytes and mode != 'ECB':
             return base64.b64encode(iv_bytes + encrypted).decode('utf-8')
@@ -670,7 +765,7 @@ class DESEncoders:
             except:
                 raise ValueError("密钥不是有效的Hex字符串")
         else:
-            key_bytes = hashlib.sha256(key.encode('utf-8')).digest()[:24]
+            key_bytes = _derive_3des_key(key)
 
         if len(key_bytes) < 24:
             key_bytes = key_bytes + key_bytes[:24 - len(key_bytes)]
@@ -710,7 +805,7 @@ class DESEncoders:
                     except ValueError as e:
                         raise e
                 else:
-                    iv_bytes = hashlib.md5(iv.encode('utf-8')).digest()[:8]
+                    iv_bytes = _derive_iv(iv)
             else:
                 if len(encrypted_data) < 8:
                     return ""
@@ -726,25 +821,30 @@ class DESEncoders:
             step3 = des.decrypt_block(step2, k1)
             return step3
 
-        decrypted = b''
-
-        if mode == 'ECB':
-            for i in range(0, len(data_content), 8):
-                block = data_content[i:i + 8]
-                decrypted += ede_decrypt(block)
-
-        elif mode == 'CBC':
-            last_block = iv_bytes
-            for i in range(0, len(data_content), 8):
-                block = data_content[i:i + 8]
-                output_block = ede_decrypt(block)
-                plain_block = bytes([a ^ b for a, b in zip(output_block, last_block)])
-                decrypted += plain_block
-                last_block = block
+        # 标准S盒走 pycryptodome，魔改S盒等情况回退到下面的纯Python分组循环
+        decrypted = None
+        if mode in ('ECB', 'CBC'):
+            decrypted = DESEncoders._native_crypt(key_bytes, mode, iv_bytes, data_content, False, custom_sboxes)
+        if decrypted is None:
+            decrypted = bytearray()
+
+            if mode == 'ECB':
+                for i in range(0, len(data_content), 8):
+                    block = data_content[i:i + 8]
+                    decrypted += ede_decrypt(block)
+
+            elif mode == 'CBC':
+                last_block = iv_bytes
+                for i in range(0, len(data_content), 8):
+                    block = data_content[i:i + 8]
+                    output_block = ede_decrypt(block)
+                    plain_block = _xor_bytes(output_block, last_block)
+                    decrypted += plain_block
+                    last_block = block
 
-        else:
-            raise ValueError(f"3DES暂不支持 {mode} 模式")
+            else:
+                raise ValueError(f"3DES暂不支持 {mode} 模式")
 
-        final_bytes = DESEncoders._unpad_data(decrypted, padding)
+        final_bytes = DESEncoders._unpad_data(bytes(decrypted), padding)
 
         return _format_binary_output(final_bytes, output_format)
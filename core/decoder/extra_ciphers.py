@@ -6,6 +6,7 @@ Additional block/stream ciphers for CTF usage.
 
 import base64
 import os
+import unicodedata
 from Crypto.Cipher import Blowfish, CAST, ARC2, ChaCha20, Salsa20
 from Crypto.Util import Counter
 
@@ -69,7 +70,6 @@ def _text_or_hex(data: bytes, output_format: str = None) -> str:
 
     try:
         text_res = data.decode("utf-8")
-        import unicodedata
         has_ctrl = any(
             unicodedata.category(c).startswith("C") and c not in ["\n", "\r", "\t"]
             for c in text_res
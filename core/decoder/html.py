@@ -19,6 +19,8 @@ class HtmlEncoders:
     @staticmethod
     def html_decode(data: str) -> str:
         try:
+            if '&' not in data:
+                return data
             # 先替换其他实体（避免先替换&amp;导致破坏其他实体）
             result = data.replace('&lt;', '<')
             result = result.replace('&gt;', '>')
@@ -7,7 +7,9 @@ MD5 哈希算法纯Python实现
 
 import struct
 import base64
+import hashlib
 import math
+import json
 
 
 class MD5Encoders:
@@ -120,7 +122,6 @@ class MD5Encoders:
         if isinstance(init_str, list) and len(init_str) == 4:
             return init_str
         try:
-            import json
             vals = json.loads(init_str)
             if isinstance(vals, list) and len(vals) == 4:
                 return vals
@@ -143,7 +144,6 @@ class MD5Encoders:
         if isinstance(k_str, list) and len(k_str) == 64:
             return k_str
         try:
-            import json
             vals = json.loads(k_str)
             if isinstance(vals, list) and len(vals) == 64:
                 return vals
@@ -159,7 +159,6 @@ class MD5Encoders:
         if isinstance(shifts_str, list) and len(shifts_str) == 64:
             return shifts_str
         try:
-            import json
             vals = json.loads(shifts_str)
             if isinstance(vals, list) and len(vals) == 64:
                 return vals
@@ -187,13 +186,6 @@ class MD5Encoders:
         if not data:
             return ""
         
-        # 解析自定义参数
-        custom_init = MD5Encoders._parse_init_values(init_values)
-        custom_k = MD5Encoders._parse_k_table(k_table)
-        custom_shifts = MD5Encoders._parse_shifts(shifts)
-        
-        md5 = MD5Encoders(custom_init, custom_k, custom_shifts)
-        
         # 数据处理
         if data_type and data_type.lower() == 'hex':
             try:
@@ -202,6 +194,22 @@ class MD5Encoders:
                 raise ValueError("输入数据不是有效的Hex字符串")
         else:
             data_bytes = data.encode('utf-8')
+
+        return MD5Encoders.md5_hash_bytes(data_bytes, output_format=output_format,
+                                          init_values=init_values, k_table=k_table, shifts=shifts,
+                                          salt=salt, salt_position=salt_position)
+
+    @staticmethod
+    def md5_hash_bytes(data_bytes: bytes, output_format: str = 'hex',
+                       init_values=None, k_table=None, shifts=None,
+                       salt: str = '', salt_position: str = 'suffix') -> str:
+        """对原始字节计算MD5哈希，供操作链直接传入 bytes，参数含义同 md5_hash"""
+        # 解析自定义参数
+        custom_init = MD5Encoders._parse_init_values(init_values)
+        custom_k = MD5Encoders._parse_k_table(k_table)
+        custom_shifts = MD5Encoders._parse_shifts(shifts)
+        
+        md5 = MD5Encoders(custom_init, custom_k, custom_shifts)
         
         # Salt handling (UTF-8)
         if salt:
@@ -214,8 +222,12 @@ class MD5Encoders:
             else:
                 data_bytes = data_bytes + salt_bytes
 
-        # 计算哈希
-        hash_bytes = md5._md5_hash(data_bytes)
+        # 计算哈希：常量都是标准值时就是普通 MD5，直接走 hashlib (OpenSSL)
+        if (md5.init_values == MD5Encoders.STANDARD_INIT and md5.k_table == MD5Encoders.STANDARD_K
+                and md5.shifts == MD5Encoders.STANDARD_SHIFTS):
+            hash_bytes = hashlib.md5(data_bytes).digest()
+        else:
+            hash_bytes = md5._md5_hash(data_bytes)
         
         # 输出格式
         output_format = output_format.lower()
@@ -3,9 +3,38 @@
 混合编码操作链接口，支持多步编码/解码。
 内部全程使用 bytes 传递数据，确保编码链中二进制数据不会被文本转换破坏。
 """
-from typing import List, Callable, Dict, Any, Union
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from fractions import Fraction
+from functools import partial
+from typing import List, Callable, Dict, Any, Tuple, Union
 import base64
 import hashlib
+import math
+import re
+import unicodedata
+
+try:
+    import pybase64
+except ImportError:
+    pybase64 = None
+
+# 输入/输出格式转换与加密结果解析用的 Base64，有 pybase64 (SIMD) 时优先使用
+def _b64decode(data) -> bytes:
+    """pybase64 只处理能通过严格校验的输入，其余交给标准库，接受的输入和结果与 base64.b64decode 一致"""
+    if pybase64 is not None:
+        try:
+            return pybase64.b64decode(data, validate=True)
+        except ValueError:
+            pass
+    return base64.b64decode(data)
+
+
+if pybase64 is not None:
+    _b64encode_str = pybase64.b64encode_as_string
+else:
+    def _b64encode_str(data: bytes) -> str:
+        return base64.b64encode(data).decode('ascii')
 
 
 def _normalize_format(fmt: str, default: str = 'utf-8') -> str:
@@ -21,14 +50,20 @@ def _normalize_format(fmt: str, default: str = 'utf-8') -> str:
     return aliases.get(value, value or default)
 
 
+_HEX_PREFIX_RE = re.compile(r'0[xX]|\\[xX]')
+_HEX_WHITESPACE_TABLE = {ord(' '): None, ord('\n'): None, ord('\r'): None}
+
+
 def _clean_hex_input(data: str) -> str:
-    return data.replace('0x', '').replace('0X', '').replace('\\x', '').replace('\\X', '').replace(' ', '').replace('\n', '').replace('\r', '')
+    # 机器生成的 HEX 通常不带前缀，先判断再做正则替换
+    if 'x' in data or 'X' in data:
+        data = _HEX_PREFIX_RE.sub('', data)
+    return data.translate(_HEX_WHITESPACE_TABLE)
 
 
 def _auto_format_bytes(data: bytes) -> str:
     try:
         text_res = data.decode('utf-8')
-        import unicodedata
         has_ctrl = any(
             unicodedata.category(c).startswith('C') and c not in '\n\r\t'
             for c in text_res
@@ -42,43 +77,220 @@ def _auto_format_bytes(data: bytes) -> str:
         return data.hex()
 
 class Operation:
+    __slots__ = ('name', 'func', 'params')
+
     def __init__(self, name: str, func: Callable[[str, Dict[str, Any]], str], params: Dict[str, Any] = None):
         self.name = name
         self.func = func
         self.params = params or {}
 
     def apply(self, data: str, params: Dict[str, Any] = None) -> str:
+        # 兼容旧调用方；Pipeline 内部直接调用 self.func，少一层栈帧
         return self.func(data, params if params is not None else self.params)
 
+@dataclass(slots=True)
+class CipherParams:
+    """加解密步骤的参数，每次调用从 params 字典解析一次，后端按属性读取"""
+    key: str = ''
+    mode: str = 'CBC'
+    iv: str = ''
+    padding: str = 'pkcs7'
+    sbox: Any = None
+    key_type: str = 'utf-8'
+    iv_type: str = 'utf-8'
+    data_type: str = None
+    output_format: str = None
+    swap_key_schedule: bool = False
+    swap_data_round: bool = False
+    swap_endian: bool = False
+    swap_bytes: bool = False
+
+    @classmethod
+    def from_params(cls, params: Dict[str, Any], mode: str = 'CBC', sbox_name: str = 'sbox') -> 'CipherParams':
+        get = params.get
+        return cls(
+            get('key', ''), get('mode', mode), get('iv', ''), get('padding', 'pkcs7'), get(sbox_name),
+            get('key_type', 'utf-8'), get('iv_type', 'utf-8'), get('data_type'), get('output_format'),
+            get('swap_key_schedule', False), get('swap_data_round', False),
+            get('swap_endian', False), get('swap_bytes', False),
+        )
+
+    @classmethod
+    def for_step(cls, params: Dict[str, Any], mode: str, sbox_name: str, output_format: str = None) -> 'CipherParams':
+        """流水线步骤的参数：输入固定为 hex，output_format 为 None 时沿用 params 中的值"""
+        cipher_params = cls.from_params(params, mode, sbox_name)
+        cipher_params.data_type = 'hex'
+        if output_format is not None:
+            cipher_params.output_format = output_format
+        return cipher_params
+
 class Pipeline:
     def __init__(self, input_format='hex', output_format='utf-8'):
         self.operations: List[Operation] = []
         self.input_format = _normalize_format(input_format, 'hex')
         self.output_format = _normalize_format(output_format, 'utf-8')
+        # 编译后的执行计划与由它生成的执行函数，操作链变动时置空，下次 run 时重建
+        self._plan = None
+        self._runner = None
 
     def add_operation(self, operation: Operation):
         self.operations.append(operation)
+        self._invalidate()
 
     def remove_operation(self, index: int):
         if 0 <= index < len(self.operations):
             self.operations.pop(index)
+            self._invalidate()
 
     def move_operation(self, old_index: int, new_index: int):
+        if old_index == new_index:
+            # 原地移动不改变顺序，保留已编译的执行计划
+            return
         if 0 <= old_index < len(self.operations) and 0 <= new_index < len(self.operations):
             op = self.operations.pop(old_index)
             self.operations.insert(new_index, op)
+            self._invalidate()
+
+    def _invalidate(self):
+        self._plan = None
+        self._runner = None
+
+    def _compile(self) -> tuple:
+        """
+        预先确定每一步的处理函数和相邻融合，run 时不再逐步查融合表和类别集合
+        每项为 (处理函数, 操作, 步骤号, 融合函数, 下一处理函数, 下一操作)
+        """
+        # 编码后紧跟同参数的解码必然还原输入，用栈消去 (嵌套的成对编解码也会逐层消掉)
+        steps = []
+        for step, op in enumerate(self.operations, 1):
+            if steps and _is_inverse_pair(steps[-1][1], op):
+                steps.pop()
+            else:
+                steps.append((step, op))
+
+        plan = []
+        count = len(steps)
+        index = 0
+        while index < count:
+            step, op = steps[index]
+            handler = self._step_handler(op)
+            if index + 1 < count:
+                next_op = steps[index + 1][1]
+                fused = FUSED_OPERATIONS.get((op.name, next_op.name))
+                if fused is not None and _is_registered(op) and _is_registered(next_op):
+                    plan.append((handler, op, step, fused, self._step_handler(next_op), next_op))
+                    index += 2
+                    continue
+            plan.append((handler, op, step, None, None, None))
+            index += 1
+        return tuple(plan)
+
+    def _generate_runner(self, plan: tuple) -> Callable[['Pipeline', bytes], bytes]:
+        """
+        把执行计划展开成一个直线函数体，每步的处理函数、操作和参数作为默认参数绑定 (LOAD_FAST)，
+        省去 run 时逐步解包计划元组和类别分发；bytes 直通与 Base 编码步骤直接调用底层 bytes 函数
+        """
+        lines = []
+        bindings = {}
+        for index, (handler, op, step, fused, next_handler, next_op) in enumerate(plan):
+            params = op.params if op.params is not None else {}
+            if fused is not None:
+                next_params = next_op.params if next_op.params is not None else {}
+                bindings.update({
+                    f'_u{index}': fused, f'_p{index}': params, f'_q{index}': next_params,
+                    f'_h{index}': handler, f'_o{index}': op,
+                    f'_n{index}': next_handler, f'_m{index}': next_op,
+                })
+                lines += [
+                    '    try:',
+                    f'        current = _u{index}(current, _p{index}, _q{index})',
+                    '    except UnicodeDecodeError:',
+                    # 交给逐步执行路径，生成带步骤号的错误提示
+                    f'        current = _h{index}(self, _o{index}, current, {step})',
+                    f'        current = _n{index}(self, _m{index}, current, {step + 1})',
+                ]
+            elif handler is Pipeline._apply_bytes:
+                bindings[f'_f{index}'] = BYTES_OPERATIONS[op.name]
+                bindings[f'_p{index}'] = params
+                lines.append(f'    current = _f{index}(current, _p{index})')
+            elif (op.name in CIPHER_OPERATIONS and _is_registered(op)
+                  and handler in (Pipeline._apply_hex_binary, Pipeline._apply_base64_binary)):
+                # 每次运行从 params 字典重新解析 CipherParams，与其他步骤一样能看到对 params 的原地修改
+                runner, mode, sbox_name = CIPHER_OPERATIONS[op.name]
+                if handler is Pipeline._apply_hex_binary:
+                    output_format = 'hex'
+                    bindings[f'_r{index}'] = Pipeline._parse_hex_result
+                else:
+                    output_format = None
+                    bindings[f'_r{index}'] = Pipeline._parse_base64_result
+                bindings[f'_f{index}'] = runner
+                bindings[f'_c{index}'] = CipherParams.for_step
+                bindings[f'_p{index}'] = params
+                lines.append(
+                    f'    current = _r{index}(_f{index}(current.hex(), '
+                    f'_c{index}(_p{index}, {mode!r}, {sbox_name!r}, {output_format!r})), {op.name!r})'
+                )
+            elif handler is Pipeline._apply_base_encode:
+                bindings[f'_f{index}'] = BASE_ENCODE_BYTES_DISPATCH[op.name]
+                bindings[f'_p{index}'] = params
+                lines.append(f'    current = _f{index}(current, _p{index})')
+            elif handler is Pipeline._apply_text:
+                # 文本步骤内联 _apply_text，直接调用 op.func；每次运行仍复制 params，避免操作函数改写原字典
+                bindings[f'_d{index}'] = Pipeline._decode_text_bytes
+                bindings[f'_f{index}'] = op.func
+                bindings[f'_p{index}'] = params
+                lines.append(
+                    f'    current = str(_f{index}(_d{index}(current, {op.name!r}, {step}), dict(_p{index}))).encode(\'utf-8\')'
+                )
+            else:
+                bindings[f'_h{index}'] = handler
+                bindings[f'_o{index}'] = op
+                lines.append(f'    current = _h{index}(self, _o{index}, current, {step})')
+        lines.append('    return current')
+
+        defaults = ''.join(f', {name}={name}' for name in bindings)
+        source = f'def _run(self, current{defaults}):\n' + '\n'.join(lines) + '\n'
+        namespace = dict(bindings)
+        exec(compile(source, '<pipeline>', 'exec'), namespace)
+        return namespace['_run']
+
+    def _get_runner(self) -> Callable[['Pipeline', bytes], bytes]:
+        runner = self._runner
+        if runner is None:
+            if self._plan is None:
+                self._plan = self._compile()
+            runner = self._runner = self._generate_runner(self._plan)
+        return runner
 
     def run(self, data: str) -> str:
         """执行操作链，内部统一使用 bytes 传递。"""
         if not self.operations:
             return data
 
+        runner = self._get_runner()
         current = self._parse_input_bytes(data, self.input_format)
+        return self._format_output(runner(self, current), self.output_format)
 
-        for index, op in enumerate(self.operations, start=1):
-            current = self._apply_operation(op, current, index)
+    def run_parallel(self, data: str, chunk_size: int = 1 << 20, workers: int = None) -> str:
+        """
+        按对齐块切分输入，在线程池中并行执行操作链，按顺序拼接后结果与 run 一致
+        链中有步骤不能独立分块 (哈希、CBC 等带状态模式、文本操作) 或数据不足两块时退回串行
+        """
+        if not self.operations:
+            return data
+
+        runner = self._get_runner()
+        current = self._parse_input_bytes(data, self.input_format)
+        align = _chunk_alignment(self._plan)
+        if align is not None:
+            chunk_size = max(align, chunk_size // align * align)
+        if align is None or len(current) <= chunk_size:
+            return self._format_output(runner(self, current), self.output_format)
 
-        return self._format_output(current, self.output_format)
+        chunks = [current[i:i + chunk_size] for i in range(0, len(current), chunk_size)]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bytealchemy-pipeline') as pool:
+            results = list(pool.map(partial(runner, self), chunks))
+        return self._format_output(b''.join(results), self.output_format)
 
     @staticmethod
     def _parse_input_bytes(data: str, fmt: str) -> bytes:
@@ -92,7 +304,7 @@ class Pipeline:
             except ValueError as exc:
                 raise ValueError('输入数据不是有效的Hex字符串') from exc
         if fmt == 'base64':
-            return base64.b64decode(data)
+            return _b64decode(data)
         if fmt == 'ascii':
             return data.encode('ascii', errors='replace')
         return data.encode('utf-8')
@@ -103,7 +315,7 @@ class Pipeline:
         if fmt == 'hex':
             return data.hex()
         if fmt == 'base64':
-            return base64.b64encode(data).decode('utf-8')
+            return _b64encode_str(data)
         if fmt == 'ascii':
             return data.decode('ascii', errors='replace')
         if fmt == 'utf-8':
@@ -120,74 +332,102 @@ class Pipeline:
                 "请先插入 Base64/HEX 编码步骤，或调整操作顺序。"
             ) from exc
 
-    def _apply_operation(self, op: Operation, current: bytes, step: int) -> bytes:
-        params = dict(op.params or {})
+    @staticmethod
+    def _step_handler(op: Operation) -> Callable:
+        """
+        按操作类别选出 bytes 处理函数，顺序与类别优先级一致
+        op.func 不是注册表中的同名实现时不走按名称绑定的 bytes 快路径，改为调用 op.func；
+        Base 编解码与旧版一致，始终按名称使用 BaseEncoders
+        """
+        name = op.name
+        if name == 'known_plaintext_helper':
+            return Pipeline._apply_passthrough
+        if name in BYTES_OPERATIONS:
+            if _is_registered(op):
+                return Pipeline._apply_bytes
+            if name in HEX_OUTPUT_BINARY_OPERATIONS:
+                return Pipeline._apply_hex_binary
+            return Pipeline._apply_hex_text
+        if name in TEXT_OPERATIONS:
+            return Pipeline._apply_text
+        if name in BASE_ENCODE_OPERATIONS:
+            return Pipeline._apply_base_encode
+        if name in BASE_DECODE_OPERATIONS:
+            return Pipeline._apply_base_decode
+        if name in HEX_OUTPUT_BINARY_OPERATIONS:
+            return Pipeline._apply_hex_binary
+        if name in BASE64_OUTPUT_BINARY_OPERATIONS:
+            return Pipeline._apply_base64_binary
+        return Pipeline._apply_text
+
+    def _apply_passthrough(self, op: Operation, current: bytes, step: int) -> bytes:
+        return current
+
+    def _apply_text(self, op: Operation, current: bytes, step: int) -> bytes:
+        text_input = self._decode_text_bytes(current, op.name, step)
+        result = op.func(text_input, dict(op.params or {}))
+        return str(result).encode('utf-8')
 
-        if op.name == 'known_plaintext_helper':
-            return current
+    def _apply_base_encode(self, op: Operation, current: bytes, step: int) -> bytes:
+        encoder = BASE_ENCODE_BYTES_DISPATCH.get(op.name)
+        if encoder is not None:
+            return encoder(current, op.params or {})
+        result = self._run_base_encode(op.name, current, dict(op.params or {}))
+        return result.encode('utf-8')
 
-        if op.name in TEXT_OPERATIONS:
-            text_input = self._decode_text_bytes(current, op.name, step)
-            result = op.apply(text_input, params)
-            return str(result).encode('utf-8')
+    def _apply_base_decode(self, op: Operation, current: bytes, step: int) -> bytes:
+        if op.name in BYTES_INPUT_BASE_DECODE_OPERATIONS and current.isascii():
+            return self._run_base_decode(op.name, current, dict(op.params or {}))
+        text_input = self._decode_text_bytes(current, op.name, step)
+        return self._run_base_decode(op.name, text_input, dict(op.params or {}))
 
-        if op.name in BASE_ENCODE_OPERATIONS:
-            result = self._run_base_encode(op.name, current, params)
-            return result.encode('utf-8')
+    def _apply_bytes(self, op: Operation, current: bytes, step: int) -> bytes:
+        return BYTES_OPERATIONS[op.name](current, op.params or {})
 
-        if op.name in BASE_DECODE_OPERATIONS:
-            text_input = self._decode_text_bytes(current, op.name, step)
-            return self._run_base_decode(op.name, text_input, params)
+    def _apply_hex_text(self, op: Operation, current: bytes, step: int) -> bytes:
+        # 自定义哈希函数: 以 hex 传入，结果按文本输出
+        params = dict(op.params or {})
+        params['data_type'] = 'hex'
+        return str(op.func(current.hex(), params)).encode('utf-8')
 
-        if op.name in HASH_OPERATIONS:
-            params['data_type'] = 'hex'
-            result = op.apply(current.hex(), params)
-            return str(result).encode('utf-8')
+    def _apply_hex_binary(self, op: Operation, current: bytes, step: int) -> bytes:
+        params = dict(op.params or {})
+        params['data_type'] = 'hex'
+        params['output_format'] = 'hex'
+        return self._parse_hex_result(op.func(current.hex(), params), op.name)
 
-        if op.name in HEX_OUTPUT_BINARY_OPERATIONS:
-            params['data_type'] = 'hex'
-            params['output_format'] = 'hex'
-            result = op.apply(current.hex(), params)
-            try:
-                return bytes.fromhex(str(result).replace(' ', '').replace('\n', '').replace('\r', ''))
-            except ValueError as exc:
-                raise ValueError(f"操作 `{op.name}` 没有返回有效的Hex结果") from exc
+    def _apply_base64_binary(self, op: Operation, current: bytes, step: int) -> bytes:
+        params = dict(op.params or {})
+        params['data_type'] = 'hex'
+        return self._parse_base64_result(op.func(current.hex(), params), op.name)
 
-        if op.name in BASE64_OUTPUT_BINARY_OPERATIONS:
-            params['data_type'] = 'hex'
-            result = op.apply(current.hex(), params)
-            try:
-                return base64.b64decode(result)
-            except Exception as exc:
-                raise ValueError(f"操作 `{op.name}` 没有返回有效的Base64结果") from exc
+    @staticmethod
+    def _parse_hex_result(result, op_name: str) -> bytes:
+        try:
+            return bytes.fromhex(str(result).replace(' ', '').replace('\n', '').replace('\r', ''))
+        except ValueError as exc:
+            raise ValueError(f"操作 `{op_name}` 没有返回有效的Hex结果") from exc
 
-        text_input = self._decode_text_bytes(current, op.name, step)
-        result = op.apply(text_input, params)
-        return str(result).encode('utf-8')
+    @staticmethod
+    def _parse_base64_result(result, op_name: str) -> bytes:
+        try:
+            return _b64decode(result)
+        except Exception as exc:
+            raise ValueError(f"操作 `{op_name}` 没有返回有效的Base64结果") from exc
 
     @staticmethod
     def _run_base_encode(name: str, data: bytes, params: Dict[str, Any]) -> str:
-        if name == 'base16_encode':
-            return BaseEncoders.base16_encode(data)
-        if name == 'base32_encode':
-            return BaseEncoders.base32_encode(data)
-        if name == 'base64_encode':
-            return BaseEncoders.base64_encode(data, url_safe=params.get('url_safe', False))
-        if name == 'base85_encode':
-            return BaseEncoders.base85_encode(data, variant=params.get('variant', 'ascii85'))
-        raise ValueError(f'Unsupported base encode operation: {name}')
+        encoder = BASE_ENCODE_DISPATCH.get(name)
+        if encoder is None:
+            raise ValueError(f'Unsupported base encode operation: {name}')
+        return encoder(data, params)
 
     @staticmethod
     def _run_base_decode(name: str, data: str, params: Dict[str, Any]) -> bytes:
-        if name == 'base16_decode':
-            return BaseEncoders.base16_decode_to_bytes(data)
-        if name == 'base32_decode':
-            return BaseEncoders.base32_decode_to_bytes(data)
-        if name == 'base64_decode':
-            return BaseEncoders.base64_decode_to_bytes(data, url_safe=params.get('url_safe', False))
-        if name == 'base85_decode':
-            return BaseEncoders.base85_decode_to_bytes(data, variant=params.get('variant', 'ascii85'))
-        raise ValueError(f'Unsupported base decode operation: {name}')
+        decoder = BASE_DECODE_DISPATCH.get(name)
+        if decoder is None:
+            raise ValueError(f'Unsupported base decode operation: {name}')
+        return decoder(data, params)
 
 # 注册所有可用操作
 OPERATION_REGISTRY: Dict[str, Callable[[str, Dict[str, Any]], str]] = {}
@@ -219,10 +459,89 @@ BASE_DECODE_OPERATIONS = {
     'base16_decode', 'base32_decode', 'base64_decode', 'base85_decode',
 }
 
-HASH_OPERATIONS = {
-    'md5_hash', 'sha1_hash', 'sha256_hash', 'sha512_hash',
+# Base 家族 bytes 直通分发表，模块加载时构建一次
+BASE_ENCODE_DISPATCH: Dict[str, Callable[[bytes, Dict[str, Any]], str]] = {
+    'base16_encode': lambda data, params: BaseEncoders.base16_encode(data),
+    'base32_encode': lambda data, params: BaseEncoders.base32_encode(data),
+    'base64_encode': lambda data, params: BaseEncoders.base64_encode(data, url_safe=params.get('url_safe', False)),
+    'base85_encode': lambda data, params: BaseEncoders.base85_encode(data, variant=params.get('variant', 'ascii85')),
+}
+
+BASE_DECODE_DISPATCH: Dict[str, Callable[[str, Dict[str, Any]], bytes]] = {
+    'base16_decode': lambda data, params: BaseEncoders.base16_decode_to_bytes(data),
+    'base32_decode': lambda data, params: BaseEncoders.base32_decode_to_bytes(data),
+    'base64_decode': lambda data, params: BaseEncoders.base64_decode_to_bytes(data, url_safe=params.get('url_safe', False)),
+    'base85_decode': lambda data, params: BaseEncoders.base85_decode_to_bytes(data, variant=params.get('variant', 'ascii85')),
 }
 
+# 管道内 Base 编码直接产出 ASCII bytes，省去 str 中转再 encode 的整段拷贝；z85 等仍走 str 版本
+_b64_module = pybase64 if pybase64 is not None else base64
+BASE_ENCODE_BYTES_DISPATCH: Dict[str, Callable[[bytes, Dict[str, Any]], bytes]] = {
+    'base16_encode': lambda data, params: base64.b16encode(data),
+    'base32_encode': lambda data, params: base64.b32encode(data),
+    'base64_encode': lambda data, params: (
+        _b64_module.urlsafe_b64encode(data) if params.get('url_safe', False) else _b64_module.b64encode(data)
+    ),
+    'base85_encode': lambda data, params: (
+        base64.a85encode(data) if params.get('variant', 'ascii85') == 'ascii85'
+        else BASE_ENCODE_DISPATCH['base85_encode'](data, params).encode('utf-8')
+    ),
+}
+
+# 这些解码器也接受纯 ASCII 的 bytes，上一步输出可不经 UTF-8 解码直接传入
+BYTES_INPUT_BASE_DECODE_OPERATIONS = {'base32_decode', 'base64_decode'}
+
+
+def _fuse_base_encode_url_encode(name: str) -> Callable[[bytes, Dict[str, Any], Dict[str, Any]], bytes]:
+    encoder = BASE_ENCODE_DISPATCH[name]
+
+    def fused(data: bytes, params: Dict[str, Any], next_params: Dict[str, Any]) -> bytes:
+        return UrlEncoders.url_encode(encoder(data, params)).encode('utf-8')
+    return fused
+
+
+def _fuse_url_decode_base_decode(name: str) -> Callable[[bytes, Dict[str, Any], Dict[str, Any]], bytes]:
+    decoder = BASE_DECODE_DISPATCH[name]
+
+    def fused(data: bytes, params: Dict[str, Any], next_params: Dict[str, Any]) -> bytes:
+        return decoder(UrlEncoders.url_decode(data.decode('utf-8')), next_params)
+    return fused
+
+
+# 相邻算子融合表：中间结果直接以 str 传递，省去一次 encode/decode 往返
+FUSED_OPERATIONS: Dict[Tuple[str, str], Callable[[bytes, Dict[str, Any], Dict[str, Any]], bytes]] = {}
+for _name in BASE_ENCODE_DISPATCH:
+    FUSED_OPERATIONS[(_name, 'url_encode')] = _fuse_base_encode_url_encode(_name)
+for _name in BASE_DECODE_DISPATCH:
+    FUSED_OPERATIONS[('url_decode', _name)] = _fuse_url_decode_base_decode(_name)
+
+# 编码 -> 同族解码 的互逆对；反方向 (先解码再编码) 会规范化输入，不能消去
+INVERSE_PAIRS = {
+    'base16_encode': 'base16_decode',
+    'base32_encode': 'base32_decode',
+    'base64_encode': 'base64_decode',
+    'base85_encode': 'base85_decode',
+}
+
+
+def _is_registered(op: Operation) -> bool:
+    """按名称绑定的快路径 (bytes 实现、融合、加密直调、分块规则) 只对注册表中的原函数成立"""
+    return OPERATION_REGISTRY.get(op.name) is op.func
+
+
+def _is_inverse_pair(op: Operation, next_op: Operation) -> bool:
+    if INVERSE_PAIRS.get(op.name) != next_op.name:
+        return False
+    params = op.params or {}
+    next_params = next_op.params or {}
+    if op.name == 'base64_encode':
+        return bool(params.get('url_safe', False)) == bool(next_params.get('url_safe', False))
+    if op.name == 'base85_encode':
+        # 未知变体编码时会报错，保留原步骤
+        variant = params.get('variant', 'ascii85')
+        return variant in ('ascii85', 'z85') and variant == next_params.get('variant', 'ascii85')
+    return True
+
 HEX_OUTPUT_BINARY_OPERATIONS = {
     'xor_bytes',
     'rc4_encrypt', 'rc4_decrypt',
@@ -302,108 +621,65 @@ def url_decode(data, params):
 # AES加解密
 from core.decoder.aes_pure import AesPureEncoders
 
+def _aes_encrypt(data, p: CipherParams):
+    return AesPureEncoders.encrypt(data, p.key, p.mode, p.iv, p.padding, sbox=p.sbox,
+                                   swap_key_schedule=p.swap_key_schedule, swap_data_round=p.swap_data_round,
+                                   key_type=p.key_type, iv_type=p.iv_type, data_type=p.data_type)
+
+def _aes_decrypt(data, p: CipherParams):
+    return AesPureEncoders.decrypt(data, p.key, p.mode, p.iv, p.padding, sbox=p.sbox,
+                                   swap_key_schedule=p.swap_key_schedule, swap_data_round=p.swap_data_round,
+                                   key_type=p.key_type, iv_type=p.iv_type,
+                                   data_type=p.data_type, output_format=p.output_format)
+
 @register_operation('aes_encrypt')
 def aes_encrypt(data, params):
-    key = params.get('key', '')
-    mode = params.get('mode', 'CBC')
-    iv = params.get('iv', '')
-    padding = params.get('padding', 'pkcs7')
-    sbox = params.get('sbox')
-    val_key_type = params.get('key_type', 'utf-8')
-    val_iv_type = params.get('iv_type', 'utf-8')
-    val_data_type = params.get('data_type')
-    val_swap_key = params.get('swap_key_schedule', False)
-    val_swap_data = params.get('swap_data_round', False)
-
-    return AesPureEncoders.encrypt(data, key, mode, iv, padding, sbox=sbox, 
-                                   swap_key_schedule=val_swap_key, swap_data_round=val_swap_data,
-                                   key_type=val_key_type, iv_type=val_iv_type, data_type=val_data_type)
+    return _aes_encrypt(data, CipherParams.from_params(params, 'CBC'))
 
 @register_operation('aes_decrypt')
 def aes_decrypt(data, params):
-    key = params.get('key', '')
-    mode = params.get('mode', 'CBC')
-    iv = params.get('iv', '')
-    padding = params.get('padding', 'pkcs7')
-    sbox = params.get('sbox')
-    val_key_type = params.get('key_type', 'utf-8')
-    val_iv_type = params.get('iv_type', 'utf-8')
-    val_data_type = params.get('data_type')
-    val_swap_key = params.get('swap_key_schedule', False)
-    val_swap_data = params.get('swap_data_round', False)
-    val_output_format = params.get('output_format')
-    
-    return AesPureEncoders.decrypt(data, key, mode, iv, padding, sbox=sbox,
-                                   swap_key_schedule=val_swap_key, swap_data_round=val_swap_data,
-                                   key_type=val_key_type, iv_type=val_iv_type,
-                                   data_type=val_data_type, output_format=val_output_format)
+    return _aes_decrypt(data, CipherParams.from_params(params, 'CBC'))
 
 
 # SM4加解密
 from core.decoder.sm4 import SM4Encoders
 
+def _sm4_encrypt(data, p: CipherParams):
+    return SM4Encoders.sm4_encrypt(data, p.key, p.mode, p.iv, p.padding, sbox=p.sbox,
+                                 key_type=p.key_type, iv_type=p.iv_type,
+                                 swap_endian=p.swap_endian,
+                                 swap_key_schedule=p.swap_key_schedule,
+                                 swap_data_round=p.swap_data_round,
+                                 data_type=p.data_type)
+
+def _sm4_decrypt(data, p: CipherParams):
+    return SM4Encoders.sm4_decrypt(data, p.key, p.mode, p.iv, p.padding, sbox=p.sbox,
+                                 key_type=p.key_type, iv_type=p.iv_type,
+                                 swap_endian=p.swap_endian,
+                                 swap_key_schedule=p.swap_key_schedule,
+                                 swap_data_round=p.swap_data_round,
+                                 data_type=p.data_type,
+                                 output_format=p.output_format)
+
 @register_operation('sm4_encrypt')
 def sm4_encrypt(data, params):
-    key = params.get('key', '')
-    mode = params.get('mode', 'ECB')
-    iv = params.get('iv', '')
-    padding = params.get('padding', 'pkcs7')
-    sbox = params.get('sbox')
-    val_key_type = params.get('key_type', 'utf-8')
-    val_iv_type = params.get('iv_type', 'utf-8')
-    val_swap_endian = params.get('swap_endian', False)
-    val_swap_key = params.get('swap_key_schedule', False)
-    val_swap_data = params.get('swap_data_round', False)
-    val_data_type = params.get('data_type')
-    
-    return SM4Encoders.sm4_encrypt(data, key, mode, iv, padding, sbox=sbox,
-                                 key_type=val_key_type, iv_type=val_iv_type, 
-                                 swap_endian=val_swap_endian, 
-                                 swap_key_schedule=val_swap_key,
-                                 swap_data_round=val_swap_data,
-                                 data_type=val_data_type)
+    return _sm4_encrypt(data, CipherParams.from_params(params, 'ECB'))
 
 @register_operation('sm4_decrypt')
 def sm4_decrypt(data, params):
-    key = params.get('key', '')
-    mode = params.get('mode', 'ECB')
-    iv = params.get('iv', '')
-    padding = params.get('padding', 'pkcs7')
-    sbox = params.get('sbox')
-    val_key_type = params.get('key_type', 'utf-8')
-    val_iv_type = params.get('iv_type', 'utf-8')
-    val_swap_endian = params.get('swap_endian', False)
-    val_swap_key = params.get('swap_key_schedule', False)
-    val_swap_data = params.get('swap_data_round', False)
-    val_data_type = params.get('data_type')
-    val_output_format = params.get('output_format')
-    
-    return SM4Encoders.sm4_decrypt(data, key, mode, iv, padding, sbox=sbox,
-                                 key_type=val_key_type, iv_type=val_iv_type, 
-                                 swap_endian=val_swap_endian, 
-                                 swap_key_schedule=val_swap_key,
-                                 swap_data_round=val_swap_data,
-                                 data_type=val_data_type,
-                                 output_format=val_output_format)
+    return _sm4_decrypt(data, CipherParams.from_params(params, 'ECB'))
 
 # GUI 可通过 OPERATION_REGISTRY.keys() 获取所有操作名
 # 并通过 Pipeline 组合操作链
 
 # XOR (magic) helper
-@register_operation('xor_bytes')
-def xor_bytes(data, params):
-    if data is None:
-        return ""
-
+def _parse_xor_key(params):
+    """解析 XOR 密钥；未提供密钥时返回 None (原样返回输入)"""
     key = params.get('key', '')
-    key_type = params.get('key_type', 'hex')
-    data_type = params.get('data_type', 'hex')
-    output_format = params.get('output_format', 'hex')
-
     if not key:
-        return data
+        return None
 
-    if key_type.lower() == 'hex':
+    if params.get('key_type', 'hex').lower() == 'hex':
         try:
             key_bytes = bytes.fromhex(key.replace(' ', '').replace('\n', ''))
         except Exception as e:
@@ -413,6 +689,36 @@ def xor_bytes(data, params):
 
     if not key_bytes:
         raise ValueError("XOR Key 不能为空")
+    return key_bytes
+
+
+def _xor_with_key(data_bytes: bytes, key_bytes: bytes) -> bytes:
+    """循环密钥异或：先把密钥铺满数据长度，再按大整数一次异或"""
+    n = len(data_bytes)
+    if not n:
+        return b''
+    keystream = (key_bytes * (n // len(key_bytes) + 1))[:n]
+    return (int.from_bytes(data_bytes, 'big') ^ int.from_bytes(keystream, 'big')).to_bytes(n, 'big')
+
+
+def _xor_bytes_raw(data: bytes, params) -> bytes:
+    key_bytes = _parse_xor_key(params)
+    if key_bytes is None:
+        return data
+    return _xor_with_key(data, key_bytes)
+
+
+@register_operation('xor_bytes')
+def xor_bytes(data, params):
+    if data is None:
+        return ""
+
+    data_type = params.get('data_type', 'hex')
+    output_format = params.get('output_format', 'hex')
+
+    key_bytes = _parse_xor_key(params)
+    if key_bytes is None:
+        return data
 
     if data_type.lower() == 'hex':
         try:
@@ -422,7 +728,7 @@ def xor_bytes(data, params):
     else:
         data_bytes = data.encode('utf-8')
 
-    result = bytes([b ^ key_bytes[i % len(key_bytes)] for i, b in enumerate(data_bytes)])
+    result = _xor_with_key(data_bytes, key_bytes)
 
     # output_format 支持: hex / utf-8
     if output_format and output_format.lower() == 'hex':
@@ -436,7 +742,6 @@ def xor_bytes(data, params):
     # 自动检测模式：检查是否为可打印文本（支持非 ASCII Unicode）
     try:
         text_res = result.decode('utf-8')
-        import unicodedata
         has_ctrl = any(
             unicodedata.category(c).startswith('C') and c not in '\n\r\t'
             for c in text_res
@@ -455,69 +760,43 @@ def known_plaintext_helper(data, params):
 # DES/3DES加解密
 from core.decoder.des import DESEncoders
 
+def _des_encrypt(data, p: CipherParams):
+    return DESEncoders.des_encrypt(data, p.key, p.mode, p.iv, p.padding, sboxes=p.sbox,
+                                   key_type=p.key_type, iv_type=p.iv_type,
+                                   data_type=p.data_type)
+
+def _des_decrypt(data, p: CipherParams):
+    return DESEncoders.des_decrypt(data, p.key, p.mode, p.iv, p.padding, sboxes=p.sbox,
+                                   key_type=p.key_type, iv_type=p.iv_type,
+                                   data_type=p.data_type,
+                                   output_format=p.output_format)
+
+def _triple_des_encrypt(data, p: CipherParams):
+    return DESEncoders.triple_des_encrypt(data, p.key, p.mode, p.iv, p.padding, sboxes=p.sbox,
+                                          key_type=p.key_type, iv_type=p.iv_type,
+                                          data_type=p.data_type)
+
+def _triple_des_decrypt(data, p: CipherParams):
+    return DESEncoders.triple_des_decrypt(data, p.key, p.mode, p.iv, p.padding, sboxes=p.sbox,
+                                          key_type=p.key_type, iv_type=p.iv_type,
+                                          data_type=p.data_type,
+                                          output_format=p.output_format)
+
 @register_operation('des_encrypt')
 def des_encrypt(data, params):
-    key = params.get('key', '')
-    mode = params.get('mode', 'ECB')
-    iv = params.get('iv', '')
-    padding = params.get('padding', 'pkcs7')
-    sboxes = params.get('sboxes')
-    val_key_type = params.get('key_type', 'utf-8')
-    val_iv_type = params.get('iv_type', 'utf-8')
-    val_data_type = params.get('data_type')
-    
-    return DESEncoders.des_encrypt(data, key, mode, iv, padding, sboxes=sboxes,
-                                   key_type=val_key_type, iv_type=val_iv_type,
-                                   data_type=val_data_type)
+    return _des_encrypt(data, CipherParams.from_params(params, 'ECB', 'sboxes'))
 
 @register_operation('des_decrypt')
 def des_decrypt(data, params):
-    key = params.get('key', '')
-    mode = params.get('mode', 'ECB')
-    iv = params.get('iv', '')
-    padding = params.get('padding', 'pkcs7')
-    sboxes = params.get('sboxes')
-    val_key_type = params.get('key_type', 'utf-8')
-    val_iv_type = params.get('iv_type', 'utf-8')
-    val_data_type = params.get('data_type')
-    val_output_format = params.get('output_format')
-    
-    return DESEncoders.des_decrypt(data, key, mode, iv, padding, sboxes=sboxes,
-                                   key_type=val_key_type, iv_type=val_iv_type,
-                                   data_type=val_data_type,
-                                   output_format=val_output_format)
+    return _des_decrypt(data, CipherParams.from_params(params, 'ECB', 'sboxes'))
 
 @register_operation('triple_des_encrypt')
 def triple_des_encrypt(data, params):
-    key = params.get('key', '')
-    mode = params.get('mode', 'ECB')
-    iv = params.get('iv', '')
-    padding = params.get('padding', 'pkcs7')
-    sboxes = params.get('sboxes')
-    val_key_type = params.get('key_type', 'utf-8')
-    val_iv_type = params.get('iv_type', 'utf-8')
-    val_data_type = params.get('data_type')
-    
-    return DESEncoders.triple_des_encrypt(data, key, mode, iv, padding, sboxes=sboxes,
-                                          key_type=val_key_type, iv_type=val_iv_type,
-                                          data_type=val_data_type)
+    return _triple_des_encrypt(data, CipherParams.from_params(params, 'ECB', 'sboxes'))
 
 @register_operation('triple_des_decrypt')
 def triple_des_decrypt(data, params):
-    key = params.get('key', '')
-    mode = params.get('mode', 'ECB')
-    iv = params.get('iv', '')
-    padding = params.get('padding', 'pkcs7')
-    sboxes = params.get('sboxes')
-    val_key_type = params.get('key_type', 'utf-8')
-    val_iv_type = params.get('iv_type', 'utf-8')
-    val_data_type = params.get('data_type')
-    val_output_format = params.get('output_format')
-    
-    return DESEncoders.triple_des_decrypt(data, key, mode, iv, padding, sboxes=sboxes,
-                                          key_type=val_key_type, iv_type=val_iv_type,
-                                          data_type=val_data_type,
-                                          output_format=val_output_format)
+    return _triple_des_decrypt(data, CipherParams.from_params(params, 'ECB', 'sboxes'))
 
 # MD5哈希
 from core.decoder.md5 import MD5Encoders
@@ -556,6 +835,10 @@ def _hash_with_salt(data, algorithm, params):
     else:
         data_bytes = data.encode('utf-8')
 
+    return _hash_bytes(data_bytes, algorithm, output_format, salt, salt_position)
+
+
+def _hash_bytes(data_bytes, algorithm, output_format='hex', salt='', salt_position='suffix'):
     if salt:
         salt_bytes = salt.encode('utf-8')
         pos = (salt_position or 'suffix').lower()
@@ -587,35 +870,115 @@ def sha256_hash(data, params):
 def sha512_hash(data, params):
     return _hash_with_salt(data, 'sha512', params)
 
+
+def _hash_raw(algorithm):
+    def run(data: bytes, params) -> bytes:
+        if not data:
+            return b''
+        return _hash_bytes(data, algorithm, params.get('output_format', 'hex'),
+                           params.get('salt', ''), params.get('salt_position', 'suffix')).encode('utf-8')
+    return run
+
+
+def _md5_hash_raw(data: bytes, params) -> bytes:
+    if not data:
+        return b''
+    return MD5Encoders.md5_hash_bytes(
+        data, output_format=params.get('output_format', 'hex'),
+        init_values=params.get('init_values'), k_table=params.get('k_table'), shifts=params.get('shifts'),
+        salt=params.get('salt', ''), salt_position=params.get('salt_position', 'suffix'),
+    ).encode('utf-8')
+
+
+# 操作链中直接吃 bytes、吐 bytes 的实现，跳过 hex 字符串往返
+BYTES_OPERATIONS: Dict[str, Callable[[bytes, Dict[str, Any]], bytes]] = {
+    'xor_bytes': _xor_bytes_raw,
+    'md5_hash': _md5_hash_raw,
+    'sha1_hash': _hash_raw('sha1'),
+    'sha256_hash': _hash_raw('sha256'),
+    'sha512_hash': _hash_raw('sha512'),
+}
+
+
+def _aes_ecb_chunk_rule(params):
+    # 只有 ECB 且不填充时各 16 字节块互相独立，填充只能出现在整段末尾
+    if str(params.get('mode', 'CBC')).upper() != 'ECB':
+        return None
+    if str(params.get('padding', 'pkcs7')).lower() != 'nopadding':
+        return None
+    return 16, Fraction(1)
+
+
+def _xor_chunk_rule(params):
+    key_bytes = _parse_xor_key(params)
+    return (len(key_bytes) if key_bytes else 1), Fraction(1)
+
+
+# 可按块独立执行的操作：params -> (本步输入需对齐的字节数, 输出/输入长度比)，返回 None 表示当前参数下不可分块
+CHUNK_RULES: Dict[str, Callable[[Dict[str, Any]], Union[Tuple[int, Fraction], None]]] = {
+    'base16_encode': lambda params: (1, Fraction(2)),
+    'base32_encode': lambda params: (5, Fraction(8, 5)),
+    'base64_encode': lambda params: (3, Fraction(4, 3)),
+    'xor_bytes': _xor_chunk_rule,
+    'aes_encrypt': _aes_ecb_chunk_rule,
+    'aes_decrypt': _aes_ecb_chunk_rule,
+}
+
+
+def _chunk_alignment(plan: tuple) -> Union[int, None]:
+    """整条执行计划对管道输入的分块对齐字节数；有步骤不可分块时返回 None"""
+    align = 1
+    ratio = Fraction(1)
+    for handler, op, step, fused, next_handler, next_op in plan:
+        rule = CHUNK_RULES.get(op.name)
+        if fused is not None or rule is None or not _is_registered(op):
+            return None
+        try:
+            spec = rule(op.params or {})
+        except ValueError:
+            return None
+        if spec is None:
+            return None
+        block, scale = spec
+        # 本步输入长度 = 管道输入长度 * ratio，需为 block 的整数倍
+        align = math.lcm(align, (Fraction(block) / ratio).numerator)
+        ratio *= scale
+    return align
+
 # RC4流密码
 from core.decoder.rc4 import RC4Encoders
 
+def _rc4_encrypt(data, p: CipherParams):
+    return RC4Encoders.rc4_encrypt(data, p.key, swap_bytes=p.swap_bytes, sbox=p.sbox,
+                                   key_type=p.key_type, data_type=p.data_type,
+                                   output_format=p.output_format)
+
+def _rc4_decrypt(data, p: CipherParams):
+    return RC4Encoders.rc4_decrypt(data, p.key, swap_bytes=p.swap_bytes, sbox=p.sbox,
+                                   key_type=p.key_type, data_type=p.data_type,
+                                   output_format=p.output_format)
+
 @register_operation('rc4_encrypt')
 def rc4_encrypt(data, params):
-    key = params.get('key', '')
-    swap_bytes = params.get('swap_bytes', False)
-    sbox = params.get('sbox')
-    val_key_type = params.get('key_type', 'utf-8')
-    val_data_type = params.get('data_type')
-    val_output_format = params.get('output_format')
-    
-    return RC4Encoders.rc4_encrypt(data, key, swap_bytes=swap_bytes, sbox=sbox,
-                                   key_type=val_key_type, data_type=val_data_type,
-                                   output_format=val_output_format)
+    return _rc4_encrypt(data, CipherParams.from_params(params))
 
 @register_operation('rc4_decrypt')
 def rc4_decrypt(data, params):
-    key = params.get('key', '')
-    swap_bytes = params.get('swap_bytes', False)
-    sbox = params.get('sbox')
-    val_key_type = params.get('key_type', 'utf-8')
-    val_data_type = params.get('data_type')
-    val_output_format = params.get('output_format')
-    
-    return RC4Encoders.rc4_decrypt(data, key, swap_bytes=swap_bytes, sbox=sbox,
-                                   key_type=val_key_type, data_type=val_data_type,
-                                   output_format=val_output_format)
-
+    return _rc4_decrypt(data, CipherParams.from_params(params))
+
+# 加解密步骤: 操作名 -> (按 CipherParams 调用的后端, 默认模式, S盒参数名)
+CIPHER_OPERATIONS: Dict[str, Tuple[Callable[[str, CipherParams], str], str, str]] = {
+    'aes_encrypt': (_aes_encrypt, 'CBC', 'sbox'),
+    'aes_decrypt': (_aes_decrypt, 'CBC', 'sbox'),
+    'sm4_encrypt': (_sm4_encrypt, 'ECB', 'sbox'),
+    'sm4_decrypt': (_sm4_decrypt, 'ECB', 'sbox'),
+    'des_encrypt': (_des_encrypt, 'ECB', 'sboxes'),
+    'des_decrypt': (_des_decrypt, 'ECB', 'sboxes'),
+    'triple_des_encrypt': (_triple_des_encrypt, 'ECB', 'sboxes'),
+    'triple_des_decrypt': (_triple_des_decrypt, 'ECB', 'sboxes'),
+    'rc4_encrypt': (_rc4_encrypt, 'CBC', 'sbox'),
+    'rc4_decrypt': (_rc4_decrypt, 'CBC', 'sbox'),
+}
 
 # Extra block ciphers
 @register_operation('blowfish_encrypt')
@@ -6,6 +6,35 @@ RC4 流密码算法纯Python实现
 """
 
 import base64
+import json
+import binascii
+import unicodedata
+from functools import lru_cache
+
+try:
+    from Crypto.Cipher import ARC4 as NativeARC4
+except ImportError:
+    NativeARC4 = None
+
+
+@lru_cache(maxsize=64)
+def _parse_sbox_text(sbox_str):
+    """S盒文本 (JSON 或 Hex) 按原字符串缓存解析结果，调用方只读不改"""
+    try:
+        sbox = json.loads(sbox_str)
+        if isinstance(sbox, list) and len(sbox) == 256:
+            return sbox
+    except:
+        pass
+    try:
+        # 尝试Hex String
+        sbox_str = sbox_str.replace(' ', '').replace('\n', '')
+        sbox = list(binascii.unhexlify(sbox_str))
+        if len(sbox) == 256:
+            return sbox
+    except:
+        pass
+    return None
 
 
 class RC4Encoders:
@@ -60,11 +89,24 @@ class RC4Encoders:
         
         return keystream
     
+    def _is_standard(self):
+        if self.swap_bytes:
+            return False
+        sbox = self.custom_sbox
+        return not (sbox and len(sbox) == 256) or list(sbox) == list(range(256))
+
     def encrypt(self, plaintext, key):
         """RC4加密"""
+        if NativeARC4 is not None and self._is_standard():
+            # 标准 RC4 走 pycryptodome；KSA 只用到密钥前 256 字节
+            return NativeARC4.new(bytes(key[:256])).encrypt(plaintext)
+
         S = self._ksa(key)
-        keystream = self._prga(S, len(plaintext))
-        return bytes([p ^ k for p, k in zip(plaintext, keystream)])
+        n = len(plaintext)
+        if not n:
+            return b''
+        keystream = bytes(self._prga(S, n))
+        return (int.from_bytes(plaintext, 'big') ^ int.from_bytes(keystream, 'big')).to_bytes(n, 'big')
     
     def decrypt(self, ciphertext, key):
         """RC4解密 (与加密相同)"""
@@ -77,22 +119,8 @@ class RC4Encoders:
             return None
         if isinstance(sbox_str, list) and len(sbox_str) == 256:
             return sbox_str
-        try:
-            import json
-            sbox = json.loads(sbox_str)
-            if isinstance(sbox, list) and len(sbox) == 256:
-                return sbox
-        except:
-            pass
-        try:
-            # 尝试Hex String
-            import binascii
-            sbox_str = sbox_str.replace(' ', '').replace('\n', '')
-            sbox = list(binascii.unhexlify(sbox_str))
-            if len(sbox) == 256:
-                return sbox
-        except:
-            pass
+        if isinstance(sbox_str, (str, bytes)):
+            return _parse_sbox_text(sbox_str)
         return None
     
     @staticmethod
@@ -216,7 +244,6 @@ class RC4Encoders:
         # 默认行为：自动检测（支持非 ASCII Unicode）
         try:
             text_res = decrypted.decode('utf-8')
-            import unicodedata
             has_ctrl = any(
                 unicodedata.category(c).startswith('C') and c not in '\n\r\t'
                 for c in text_res
@@ -9,8 +9,92 @@ SM4/SMS4 算法纯Python实现
 
 import struct
 import base64
+import binascii
+import json
 import os
 import hashlib
+import unicodedata
+from functools import lru_cache
+
+try:
+    from cryptography.hazmat.primitives.ciphers import Cipher, algorithms, modes
+except ImportError:
+    Cipher = None
+# OFB/CFB 在 cryptography 中已移入 decrepit，OpenSSL 的 SM4 实现仍可用
+try:
+    from cryptography.hazmat.decrepit.ciphers.modes import CFB as OpenSSLCFB, OFB as OpenSSLOFB
+except ImportError:
+    OpenSSLCFB = OpenSSLOFB = None
+
+
+def _xor_bytes(data, keystream):
+    """整段异或: 转成大整数一次完成，代替逐字节 zip；keystream 按 data 长度截断"""
+    n = len(data)
+    if not n:
+        return b''
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(keystream[:n], 'big')).to_bytes(n, 'big')
+
+
+# 16 字节分组 <-> 四个 32 位大端字
+_BLOCK = struct.Struct('>4I')
+
+
+@lru_cache(maxsize=32)
+def _build_tables(sbox: bytes):
+    """
+    按 S 盒生成 T 表: T[i][b] = L(S[b] << (24 - 8i))，L 对异或线性，
+    所以 L(tau(x)) = T0[x 最高字节] ^ T1[..] ^ T2[..] ^ T3[最低字节]；密钥扩展用 L' 另生成一组
+    """
+    round_tables = tuple([SM4Encoders._l(v << shift) for v in sbox] for shift in (24, 16, 8, 0))
+    key_tables = tuple([SM4Encoders._l_key(v << shift) for v in sbox] for shift in (24, 16, 8, 0))
+    return round_tables, key_tables
+
+
+def _sbox_tables(sbox):
+    """S盒含非字节值 (非法自定义S盒) 时无法按字节拆表，返回 None 走逐字节计算"""
+    try:
+        return _build_tables(bytes(sbox))
+    except (TypeError, ValueError):
+        return None
+
+
+@lru_cache(maxsize=256)
+def _md5_digest(text: str) -> bytes:
+    """文本密钥/IV -> MD5 摘要，同一口令重复调用直接取缓存"""
+    return hashlib.md5(text.encode('utf-8')).digest()
+
+
+@lru_cache(maxsize=64)
+def _parse_sbox_text(sbox_str):
+    """S盒文本 (JSON 或 Hex) 按原字符串缓存解析结果，调用方只读不改"""
+    try:
+        sbox = json.loads(sbox_str)
+        if isinstance(sbox, list) and len(sbox) == 256:
+            return sbox
+    except:
+        pass
+    try:
+        sbox_str = sbox_str.replace(' ', '').replace('\n', '')
+        sbox = list(binascii.unhexlify(sbox_str))
+        if len(sbox) == 256:
+            return sbox
+    except:
+        pass
+    return None
+
+
+@lru_cache(maxsize=64)
+def _cached_sm4(key_bytes: bytes, sbox, mode, swap_key_schedule, swap_data_round):
+    """set_key 之后实例只读，按密钥/S盒/方向/交换开关缓存，重复调用跳过 32 轮密钥扩展"""
+    sm4 = SM4Encoders(list(sbox) if sbox else None)
+    sm4.set_key(key_bytes, mode, swap_key_schedule=swap_key_schedule, swap_data_round=swap_data_round)
+    return sm4
+
+
+# PKCS7 合法尾部: _PKCS7_TAILS[n] == bytes([n] * n)，校验时直接 endswith，不再每次构造
+_PKCS7_TAILS = tuple(bytes([n] * n) for n in range(17))
+
+_TEXT_BYTES = bytes(range(0x20, 0x7f)) + b'\n\r\t' + bytes(range(0x80, 0x100))
 
 
 def _format_binary_output(data: bytes, output_format: str = None) -> str:
@@ -22,12 +106,19 @@ def _format_binary_output(data: bytes, output_format: str = None) -> str:
     if fmt == 'utf-8':
         return data.decode('utf-8', errors='replace')
 
+    # 先在字节上排除 ASCII 控制字符 (类别 Cc)：translate 删掉可打印字节和 0x80 以上字节后非空即需输出 Hex，
+    # 无论能否按 UTF-8 解码结果都一样，不必先解码
+    if data.translate(None, _TEXT_BYTES):
+        return data.hex()
+    if data.isascii():
+        return data.decode('ascii')
+
     try:
         text_res = data.decode('utf-8')
-        import unicodedata
+        # 剩下只需判断非 ASCII 字符；类别只取决于字符本身，按去重后的字符判断即可
         has_ctrl = any(
-            unicodedata.category(c).startswith('C') and c not in '\n\r\t'
-            for c in text_res
+            unicodedata.category(c).startswith('C')
+            for c in set(text_res) if c > '\x7f'
         )
         if has_ctrl:
             return data.hex()
@@ -84,6 +175,7 @@ class SM4Encoders:
             self.sbox = sbox
         else:
             self.sbox = self.STANDARD_SBOX
+        self._tables = _sbox_tables(self.sbox)
 
     @staticmethod
     def _rotl(x, n):
@@ -132,14 +224,14 @@ class SM4Encoders:
         
         MK = [0, 0, 0, 0]
         try:
-            k = struct.unpack('>4I', key)
+            k = _BLOCK.unpack(key)
             MK[0], MK[1], MK[2], MK[3] = k
         except:
              if len(key) < 16:
                  key = key + b'\x00' * (16 - len(key))
              elif len(key) > 16:
                  key = key[:16]
-             k = struct.unpack('>4I', key)
+             k = _BLOCK.unpack(key)
              MK[0], MK[1], MK[2], MK[3] = k
 
         K = [0] * 36
@@ -148,6 +240,30 @@ class SM4Encoders:
         K[2] = MK[2] ^ self.SM4_FK[2]
         K[3] = MK[3] ^ self.SM4_FK[3]
 
+        if self._tables is not None:
+            t0, t1, t2, t3 = self._tables[1]
+            if swap_key_schedule:
+                # 交换字节序时最高字节的 S 盒输出落在最低位，查表顺序反过来
+                t0, t1, t2, t3 = t3, t2, t1, t0
+            # 密钥状态放在四个局部变量中，每次迭代展开 4 轮依次原地更新，四个轮密钥一次追加
+            k0, k1, k2, k3 = K[0], K[1], K[2], K[3]
+            sk = []
+            extend = sk.extend
+            for c0, c1, c2, c3 in _CK_GROUPS:
+                rk = k1 ^ k2 ^ k3 ^ c0
+                k0 ^= t0[rk >> 24] ^ t1[(rk >> 16) & 0xff] ^ t2[(rk >> 8) & 0xff] ^ t3[rk & 0xff]
+                rk = k2 ^ k3 ^ k0 ^ c1
+                k1 ^= t0[rk >> 24] ^ t1[(rk >> 16) & 0xff] ^ t2[(rk >> 8) & 0xff] ^ t3[rk & 0xff]
+                rk = k3 ^ k0 ^ k1 ^ c2
+                k2 ^= t0[rk >> 24] ^ t1[(rk >> 16) & 0xff] ^ t2[(rk >> 8) & 0xff] ^ t3[rk & 0xff]
+                rk = k0 ^ k1 ^ k2 ^ c3
+                k3 ^= t0[rk >> 24] ^ t1[(rk >> 16) & 0xff] ^ t2[(rk >> 8) & 0xff] ^ t3[rk & 0xff]
+                extend((k0, k1, k2, k3))
+            self.sk = sk
+            if mode == 1:
+                self.sk = self.sk[::-1]
+            return
+
         for i in range(32):
             rk = K[i+1] ^ K[i+2] ^ K[i+3] ^ self.SM4_CK[i]
             
@@ -166,24 +282,80 @@ class SM4Encoders:
 
     def one_round(self, block):
         """单轮加/解密"""
-        X = [0, 0, 0, 0]
-        X[0], X[1], X[2], X[3] = struct.unpack('>4I', block)
-
-        for i in range(32):
-            temp = X[1] ^ X[2] ^ X[3] ^ self.sk[i]
-            
-            # Apply tau (S-box)
+        # 32 轮热循环: 每轮的 tau+L 合并为四次 T 表查找；每次迭代做 4 轮，四个状态字依次原地更新
+        x0, x1, x2, x3 = _BLOCK.unpack(block)
+        if self._tables is not None:
+            t0, t1, t2, t3 = self._tables[0]
             if self.swap_data_round:
-                temp = self._tau_swapped(temp)
-            else:
-                temp = self._tau(temp)
-                
-            temp = self._l(temp)
-            X[0] = X[0] ^ temp
-            # 循环移位
-            X[0], X[1], X[2], X[3] = X[1], X[2], X[3], X[0]
+                t0, t1, t2, t3 = t3, t2, t1, t0
+            sk = self.sk
+            for i in range(0, 32, 4):
+                t = x1 ^ x2 ^ x3 ^ sk[i]
+                x0 ^= t0[t >> 24] ^ t1[(t >> 16) & 0xff] ^ t2[(t >> 8) & 0xff] ^ t3[t & 0xff]
+                t = x2 ^ x3 ^ x0 ^ sk[i + 1]
+                x1 ^= t0[t >> 24] ^ t1[(t >> 16) & 0xff] ^ t2[(t >> 8) & 0xff] ^ t3[t & 0xff]
+                t = x3 ^ x0 ^ x1 ^ sk[i + 2]
+                x2 ^= t0[t >> 24] ^ t1[(t >> 16) & 0xff] ^ t2[(t >> 8) & 0xff] ^ t3[t & 0xff]
+                t = x0 ^ x1 ^ x2 ^ sk[i + 3]
+                x3 ^= t0[t >> 24] ^ t1[(t >> 16) & 0xff] ^ t2[(t >> 8) & 0xff] ^ t3[t & 0xff]
+            return _BLOCK.pack(x3, x2, x1, x0)
+
+        # 非法S盒: tau 与 L 内联逐字节计算，结果与原实现一致
+        sbox = self.sbox
+
+        if self.swap_data_round:
+            for rk in self.sk:
+                t = x1 ^ x2 ^ x3 ^ rk
+                t = ((sbox[t & 0xff] << 24) | (sbox[(t >> 8) & 0xff] << 16)
+                     | (sbox[(t >> 16) & 0xff] << 8) | sbox[(t >> 24) & 0xff])
+                t ^= (((t << 2) | (t >> 30)) ^ ((t << 10) | (t >> 22))
+                      ^ ((t << 18) | (t >> 14)) ^ ((t << 24) | (t >> 8))) & 0xffffffff
+                x0, x1, x2, x3 = x1, x2, x3, x0 ^ t
+        else:
+            for rk in self.sk:
+                t = x1 ^ x2 ^ x3 ^ rk
+                t = ((sbox[(t >> 24) & 0xff] << 24) | (sbox[(t >> 16) & 0xff] << 16)
+                     | (sbox[(t >> 8) & 0xff] << 8) | sbox[t & 0xff])
+                t ^= (((t << 2) | (t >> 30)) ^ ((t << 10) | (t >> 22))
+                      ^ ((t << 18) | (t >> 14)) ^ ((t << 24) | (t >> 8))) & 0xffffffff
+                x0, x1, x2, x3 = x1, x2, x3, x0 ^ t
+
+        return _BLOCK.pack(x3, x2, x1, x0)
 
-        return struct.pack('>4I', X[3], X[2], X[1], X[0])
+    def crypt_blocks(self, data):
+        """
+        整段 ECB 加/解密 (长度须为 16 的倍数)：一次解包全部分组、结果一次打包，
+        省去逐块的 one_round 调用、切片和 struct 往返
+        """
+        if self._tables is None:
+            return b''.join([self.one_round(data[i:i+16]) for i in range(0, len(data), 16)])
+        t0, t1, t2, t3 = self._tables[0]
+        if self.swap_data_round:
+            t0, t1, t2, t3 = t3, t2, t1, t0
+        # 每次迭代做 4 轮，四个状态字依次原地更新，不再每轮轮换元组
+        sk = self.sk
+        rk_groups = [tuple(sk[i:i+4]) for i in range(0, 32, 4)]
+        out = []
+        append = out.extend
+        for x0, x1, x2, x3 in _BLOCK.iter_unpack(data):
+            for k0, k1, k2, k3 in rk_groups:
+                t = x1 ^ x2 ^ x3 ^ k0
+                x0 ^= t0[t >> 24] ^ t1[(t >> 16) & 0xff] ^ t2[(t >> 8) & 0xff] ^ t3[t & 0xff]
+                t = x2 ^ x3 ^ x0 ^ k1
+                x1 ^= t0[t >> 24] ^ t1[(t >> 16) & 0xff] ^ t2[(t >> 8) & 0xff] ^ t3[t & 0xff]
+                t = x3 ^ x0 ^ x1 ^ k2
+                x2 ^= t0[t >> 24] ^ t1[(t >> 16) & 0xff] ^ t2[(t >> 8) & 0xff] ^ t3[t & 0xff]
+                t = x0 ^ x1 ^ x2 ^ k3
+                x3 ^= t0[t >> 24] ^ t1[(t >> 16) & 0xff] ^ t2[(t >> 8) & 0xff] ^ t3[t & 0xff]
+            append((x3, x2, x1, x0))
+        return struct.pack(f'>{len(out)}I', *out)
+
+    @staticmethod
+    def _ctr_keystream(sm4, iv_bytes, length):
+        """CTR 密钥流与数据无关：先拼出全部计数器块，整段 ECB 加密"""
+        ctr = int.from_bytes(iv_bytes, byteorder='big')
+        counters = b''.join([c.to_bytes(16, byteorder='big') for c in range(ctr, ctr + (length + 15) // 16)])
+        return sm4.crypt_blocks(counters)
     
     # ----------------------------
     # 辅助与填充
@@ -223,7 +395,7 @@ class SM4Encoders:
             if pad_len > block_size or pad_len < 1:
                 raise ValueError("Invalid PKCS7 padding length")
             # Verify all padding bytes
-            if data[-pad_len:] != bytes([pad_len] * pad_len):
+            if not data.endswith(_PKCS7_TAILS[pad_len]):
                 raise ValueError("Invalid PKCS7 padding bytes")
             return data[:-pad_len]
         elif padding == 'zeropadding':
@@ -244,25 +416,140 @@ class SM4Encoders:
             return None
         if isinstance(sbox_str, list) and len(sbox_str) == 256:
             return sbox_str
-        try:
-            # 尝试解析为list
-             import json
-             sbox = json.loads(sbox_str)
-             if isinstance(sbox, list) and len(sbox) == 256:
-                 return sbox
-        except:
-             pass
-        try:
-             # 尝试Hex String
-             import binascii
-             sbox_str = sbox_str.replace(' ', '').replace('\n', '')
-             sbox = list(binascii.unhexlify(sbox_str))
-             if len(sbox) == 256:
-                 return sbox
-        except:
-             pass
+        if isinstance(sbox_str, (str, bytes)):
+            return _parse_sbox_text(sbox_str)
         return None
 
+    @staticmethod
+    def _native_crypt(key_bytes, mode, iv_bytes, data, encrypt, custom_sbox=None,
+                      swap_key_schedule=False, swap_data_round=False):
+        """标准 SM4 参数下走 OpenSSL (cryptography)，魔改S盒/交换时返回 None 回退纯Python"""
+        if Cipher is None or swap_key_schedule or swap_data_round:
+            return None
+        if custom_sbox is not None and list(custom_sbox) != SM4Encoders.STANDARD_SBOX:
+            return None
+
+        if len(key_bytes) < 16:
+            key_bytes = key_bytes + b'\x00' * (16 - len(key_bytes))
+        key_bytes = key_bytes[:16]
+
+        if mode in ('ECB', 'CBC'):
+            usable = len(data) - len(data) % 16
+            if usable != len(data):
+                # ECB 加密丢弃尾部残块，其余情况交给纯Python路径报错
+                if not (mode == 'ECB' and encrypt):
+                    return None
+                data = data[:usable]
+            cipher_mode = modes.ECB() if mode == 'ECB' else modes.CBC(iv_bytes)
+        elif mode == 'CTR':
+            cipher_mode = modes.CTR(iv_bytes)
+        elif mode == 'CFB' and OpenSSLCFB is not None:
+            cipher_mode = OpenSSLCFB(iv_bytes)
+        elif mode == 'OFB' and OpenSSLOFB is not None:
+            cipher_mode = OpenSSLOFB(iv_bytes)
+        else:
+            return None
+
+        cipher = Cipher(algorithms.SM4(key_bytes), cipher_mode)
+        ctx = cipher.encryptor() if encrypt else cipher.decryptor()
+        return ctx.update(data) + ctx.finalize()
+
+    @staticmethod
+    def _encrypt_pure(sm4, mode, iv_bytes, padded):
+        # bytearray 原地追加，避免 bytes += 每块重新分配整段结果
+        encrypted = bytearray()
+        
+        if mode == 'ECB':
+             # 尾部不足 16 字节的残块丢弃
+             encrypted += sm4.crypt_blocks(padded[:len(padded) - len(padded) % 16])
+                  
+        elif mode == 'CBC':
+             last_block = iv_bytes
+             for i in range(0, len(padded), 16):
+                  block = padded[i:i+16]
+                  input_block = _xor_bytes(block, last_block)
+                  output_block = sm4.one_round(input_block)
+                  encrypted += output_block
+                  last_block = output_block
+                  
+        elif mode == 'CTR':
+             encrypted += _xor_bytes(padded, SM4Encoders._ctr_keystream(sm4, iv_bytes, len(padded)))
+                  
+        elif mode == 'OFB':
+             last_iv = iv_bytes
+             for i in range(0, len(padded), 16):
+                  block = padded[i:i+16]
+                  keystream = sm4.one_round(last_iv)
+                  chunk_len = len(block)
+                  cipher_chunk = _xor_bytes(block, keystream)
+                  encrypted += cipher_chunk
+                  last_iv = keystream
+                  
+        elif mode == 'CFB':
+             last_block = iv_bytes
+             for i in range(0, len(padded), 16):
+                  block = padded[i:i+16]
+                  keystream = sm4.one_round(last_block)
+                  chunk_len = len(block)
+                  cipher_chunk = _xor_bytes(block, keystream)
+                  encrypted += cipher_chunk
+                  if chunk_len == 16:
+                      last_block = cipher_chunk
+                  else:
+                      pass 
+
+        else:
+             raise ValueError("Unsupported mode")
+
+        return bytes(encrypted)
+
+    @staticmethod
+    def _decrypt_pure(custom_sbox, key_bytes, mode, iv_bytes, data_content,
+                      swap_key_schedule=False, swap_data_round=False):
+        # ECB/CBC 用逆序轮密钥解密，流模式仍用加密方向生成密钥流
+        sm4 = _cached_sm4(bytes(key_bytes), tuple(custom_sbox) if custom_sbox else None,
+                          1 if mode in ['ECB', 'CBC'] else 0, bool(swap_key_schedule), bool(swap_data_round))
+
+        decrypted = bytearray()
+
+        if mode == 'ECB':
+            decrypted += sm4.crypt_blocks(data_content)
+
+        elif mode == 'CBC':
+            last_block = iv_bytes
+            for i in range(0, len(data_content), 16):
+                block = data_content[i:i+16]
+                output_block = sm4.one_round(block)
+                plain_block = _xor_bytes(output_block, last_block)
+                decrypted += plain_block
+                last_block = block
+
+        elif mode == 'CTR':
+            decrypted += _xor_bytes(data_content, SM4Encoders._ctr_keystream(sm4, iv_bytes, len(data_content)))
+
+        elif mode == 'OFB':
+            last_iv = iv_bytes
+            for i in range(0, len(data_content), 16):
+                block = data_content[i:i+16]
+                keystream = sm4.one_round(last_iv)
+                chunk_len = len(block)
+                plain_chunk = _xor_bytes(block, keystream)
+                decrypted += plain_chunk
+                last_iv = keystream
+
+        elif mode == 'CFB':
+            last_block = iv_bytes
+            for i in range(0, len(data_content), 16):
+                block = data_content[i:i+16]
+                keystream = sm4.one_round(last_block)
+                chunk_len = len(block)
+                plain_chunk = _xor_bytes(block, keystream)
+                decrypted += plain_chunk
+                if chunk_len == 16:
+                    last_block = block
+
+        return bytes(decrypted)
+
     @staticmethod
     def sm4_encrypt(data: str, key: str, mode: str = 'ECB', iv: str = '', padding: str = 'pkcs7', sbox=None,
                    key_type: str = 'utf-8', iv_type: str = 'utf-8', 
@@ -287,7 +574,7 @@ class SM4Encoders:
             except:
                 raise ValueError("密钥不是有效的Hex字符串")
         else:
-            key_bytes = hashlib.md5(key.encode('utf-8')).digest()
+            key_bytes = _md5_digest(key)
         
         # Custom S-Box
         custom_sbox = SM4Encoders._parse_sbox(sbox)
@@ -309,13 +596,10 @@ class SM4Encoders:
                       except:
                           raise ValueError("IV不是有效的Hex字符串")
                   else:
-                      iv_bytes = hashlib.md5(iv.encode('utf-8')).digest()
+                      iv_bytes = _md5_digest(iv)
         else:
              iv_bytes = None
              
-        sm4 = SM4Encoders(custom_sbox)
-        sm4.set_key(key_bytes, 0, swap_key_schedule=swap_key_schedule, swap_data_round=swap_data_round) # 0 for encrypt
-        
         # Data Handling
         if data_type and data_type.lower() == 'hex':
             try:
@@ -345,59 +629,12 @@ class SM4Encoders:
         else:
              padded = SM4Encoders._pad_data(data_bytes, padding)
         
-        encrypted = b''
-        
-        if mode == 'ECB':
-             for i in range(0, len(padded), 16):
-                  block = padded[i:i+16]
-                  if len(block) < 16: break
-                  encrypted += sm4.one_round(block)
-                  
-        elif mode == 'CBC':
-             last_block = iv_bytes
-             for i in range(0, len(padded), 16):
-                  block = padded[i:i+16]
-                  input_block = bytes([a ^ b for a, b in zip(block, last_block)])
-                  output_block = sm4.one_round(input_block)
-                  encrypted += output_block
-                  last_block = output_block
-                  
-        elif mode == 'CTR':
-             ctr = int.from_bytes(iv_bytes, byteorder='big')
-             for i in range(0, len(padded), 16):
-                  block = padded[i:i+16]
-                  ctr_block = ctr.to_bytes(16, byteorder='big')
-                  keystream = sm4.one_round(ctr_block)
-                  chunk_len = len(block)
-                  cipher_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                  encrypted += cipher_chunk
-                  ctr += 1
-                  
-        elif mode == 'OFB':
-             last_iv = iv_bytes
-             for i in range(0, len(padded), 16):
-                  block = padded[i:i+16]
-                  keystream = sm4.one_round(last_iv)
-                  chunk_len = len(block)
-                  cipher_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                  encrypted += cipher_chunk
-                  last_iv = keystream
-                  
-        elif mode == 'CFB':
-             last_block = iv_bytes
-             for i in range(0, len(padded), 16):
-                  block = padded[i:i+16]
-                  keystream = sm4.one_round(last_block)
-                  chunk_len = len(block)
-                  cipher_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                  encrypted += cipher_chunk
-                  if chunk_len == 16:
-                      last_block = cipher_chunk
-                  else:
-                      pass 
-
-        else:
-             raise ValueError("Unsupported mode")
+        encrypted = SM4Encoders._native_crypt(key_bytes, mode, iv_bytes, padded, True,
+                                              custom_sbox, swap_key_schedule, swap_data_round)
+        if encrypted is None:
+            sm4 = _cached_sm4(bytes(key_bytes), tuple(custom_sbox) if custom_sbox else None,
+                              0, bool(swap_key_schedule), bool(swap_data_round))
+            encrypted = SM4Encoders._encrypt_pure(sm4, mode, iv_bytes, padded)
 
         if not iv and iv_bytes and mode != 'ECB':
              return base64.b64encode(iv_bytes + encrypted).decode('utf-8')
@@ -423,7 +660,7 @@ class SM4Encoders:
             except Exception:
                 raise ValueError("密钥不是有效的Hex字符串")
         else:
-            key_bytes = hashlib.md5(key.encode('utf-8')).digest()
+            key_bytes = _md5_digest(key)
 
         custom_sbox = SM4Encoders._parse_sbox(sbox)
 
@@ -455,66 +692,18 @@ class SM4Encoders:
                     except Exception:
                         raise ValueError("IV不是有效的Hex字符串")
                 else:
-                    iv_bytes = hashlib.md5(iv.encode('utf-8')).digest()
+                    iv_bytes = _md5_digest(iv)
             else:
                 if len(encrypted_data) < 16:
                     return ""
                 iv_bytes = encrypted_data[:16]
                 data_content = encrypted_data[16:]
 
-        sm4 = SM4Encoders(custom_sbox)
-        if mode in ['ECB', 'CBC']:
-            sm4.set_key(key_bytes, 1, swap_key_schedule=swap_key_schedule, swap_data_round=swap_data_round)
-        else:
-            sm4.set_key(key_bytes, 0, swap_key_schedule=swap_key_schedule, swap_data_round=swap_data_round)
-
-        decrypted = b''
-
-        if mode == 'ECB':
-            for i in range(0, len(data_content), 16):
-                block = data_content[i:i+16]
-                decrypted += sm4.one_round(block)
-
-        elif mode == 'CBC':
-            last_block = iv_bytes
-            for i in range(0, len(data_content), 16):
-                block = data_content[i:i+16]
-                output_block = sm4.one_round(block)
-                plain_block = bytes([a ^ b for a, b in zip(output_block, last_block)])
-                decrypted += plain_block
-                last_block = block
-
-        elif mode == 'CTR':
-            ctr = int.from_bytes(iv_bytes, byteorder='big')
-            for i in range(0, len(data_content), 16):
-                block = data_content[i:i+16]
-                ctr_block = ctr.to_bytes(16, byteorder='big')
-                keystream = sm4.one_round(ctr_block)
-                chunk_len = len(block)
-                plain_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                decrypted += plain_chunk
-                ctr += 1
-
-        elif mode == 'OFB':
-            last_iv = iv_bytes
-            for i in range(0, len(data_content), 16):
-                block = data_content[i:i+16]
-                keystream = sm4.one_round(last_iv)
-                chunk_len = len(block)
-                plain_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                decrypted += plain_chunk
-                last_iv = keystream
-
-        elif mode == 'CFB':
-            last_block = iv_bytes
-            for i in range(0, len(data_content), 16):
-                block = data_content[i:i+16]
-                keystream = sm4.one_round(last_block)
-                chunk_len = len(block)
-                plain_chunk = bytes([a ^ b for a, b in zip(block, keystream[:chunk_len])])
-                decrypted += plain_chunk
-                if chunk_len == 16:
-                    last_block = block
+        decrypted = SM4Encoders._native_crypt(key_bytes, mode, iv_bytes, data_content, False,
+                                              custom_sbox, swap_key_schedule, swap_data_round)
+        if decrypted is None:
+            decrypted = SM4Encoders._decrypt_pure(custom_sbox, key_bytes, mode, iv_bytes, data_content,
+                                                  swap_key_schedule, swap_data_round)
 
         is_stream = mode in ['CFB', 'OFB', 'CTR']
         final_bytes = decrypted
@@ -522,3 +711,7 @@ class SM4Encoders:
             final_bytes = SM4Encoders._unpad_data(decrypted, padding)
 
         return _format_binary_output(final_bytes, output_format)
+
+
+# 密钥扩展按 4 轮一组展开时使用的 CK 分组
+_CK_GROUPS = tuple(tuple(SM4Encoders.SM4_CK[i:i+4]) for i in range(0, 32, 4))
@@ -83,6 +83,51 @@ except ValueError as exc:
 else:
     check('Binary to text misuse surfaces validation error', False, True)
 
+print("Test 7: Fused Base64/URL steps match step-by-step output")
+p7 = Pipeline(input_format='utf-8', output_format='utf-8')
+for name in ('base64_encode', 'url_encode', 'url_decode', 'base64_decode'):
+    p7.add_operation(Operation(name, OPERATION_REGISTRY[name]))
+p7_encode = Pipeline(input_format='utf-8', output_format='utf-8')
+p7_encode.add_operation(Operation('base64_encode', OPERATION_REGISTRY['base64_encode']))
+p7_encode.add_operation(Operation('url_encode', OPERATION_REGISTRY['url_encode']))
+check('Base64 + URL encode yields escaped Base64', p7_encode.run('hi??>>'), 'aGk%2FPz4%2B')
+check('Fused Base64/URL chain roundtrips text', p7.run('Hello 世界'), 'Hello 世界')
+
+print("Test 8: Inverse encode/decode pairs are skipped")
+p8 = Pipeline(input_format='hex', output_format='hex')
+for name in ('base64_encode', 'base32_encode', 'base32_decode', 'base64_decode', 'base16_encode'):
+    p8.add_operation(Operation(name, OPERATION_REGISTRY[name]))
+check('Nested inverse pairs collapse to remaining step', [op.name for _, op, *_ in p8._compile()], ['base16_encode'])
+check('Collapsed chain keeps output', p8.run('00ff10'), '00FF10'.encode().hex())
+p8.add_operation(Operation('base16_decode', OPERATION_REGISTRY['base16_decode']))
+check('Plan is rebuilt after add_operation', p8.run('00ff10'), '00ff10')
+
+print("Test 9: Chunked parallel run matches sequential run")
+p9 = Pipeline(input_format='hex', output_format='hex')
+p9.add_operation(Operation('xor_bytes', OPERATION_REGISTRY['xor_bytes'], {'key': '0102ab', 'key_type': 'hex'}))
+p9.add_operation(Operation('base64_encode', OPERATION_REGISTRY['base64_encode']))
+p9_data = bytes(range(256)).hex() * 7
+check('Aligned chunks concatenate to run() output', p9.run_parallel(p9_data, chunk_size=64, workers=4), p9.run(p9_data))
+p9.add_operation(Operation('sha256_hash', OPERATION_REGISTRY['sha256_hash']))
+check('Non-chunkable chain falls back to run()', p9.run_parallel(p9_data, chunk_size=64, workers=4), p9.run(p9_data))
+
+print("Test 10: Custom operation functions are honoured")
+p10 = Pipeline(input_format='hex', output_format='utf-8')
+p10.add_operation(Operation('xor_bytes', lambda data, params: data[::-1], {'key': '41', 'key_type': 'hex'}))
+p10.add_operation(Operation('sha256_hash', lambda data, params: f"{params['data_type']}:{data}"))
+check('Custom bytes-op funcs replace the builtin fast path', p10.run('0102ff'), 'hex:ff2010')
+
+print("Test 11: In-place params edits reach cipher steps")
+p11 = Pipeline(input_format='utf-8', output_format='hex')
+p11_params = {'key': '0123456789abcdef', 'mode': 'ECB'}
+p11.add_operation(Operation('aes_encrypt', OPERATION_REGISTRY['aes_encrypt'], p11_params))
+p11_first = p11.run('hello')
+p11_params['key'] = 'fedcba9876543210'
+p11_fresh = Pipeline(input_format='utf-8', output_format='hex')
+p11_fresh.add_operation(Operation('aes_encrypt', OPERATION_REGISTRY['aes_encrypt'], dict(p11_params)))
+check('Edited key is used on the next run', p11.run('hello'), p11_fresh.run('hello'))
+check('Edited key changes the ciphertext', p11.run('hello') != p11_first, True)
+
 print(f"\nResults: {passed} passed, {failed} failed")
 if failed:
     sys.exit(1)
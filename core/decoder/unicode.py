@@ -5,6 +5,19 @@ Unicode转义编码解码器实现
 """
 import re
 
+_UNICODE4_RE = re.compile(r'\\u([0-9a-fA-F]{4})')
+_UNICODE8_RE = re.compile(r'\\U([0-9a-fA-F]{8})')
+
+
+def _unescape(pattern, data: str) -> str:
+    # split 后捕获的十六进制码点落在奇数位，整批换成字符再一次拼接，省去 re.sub 逐个回调
+    parts = pattern.split(data)
+    if len(parts) == 1:
+        return data
+    parts[1::2] = [chr(int(code, 16)) for code in parts[1::2]]
+    return ''.join(parts)
+
+
 class UnicodeEncoders:
     @staticmethod
     def unicode_encode(data: str) -> str:
@@ -23,15 +36,12 @@ class UnicodeEncoders:
     @staticmethod
     def unicode_decode(data: str) -> str:
         try:
-            def replace_unicode(match):
-                code = match.group(1)
-                if len(code) == 4:
-                    return chr(int(code, 16))
-                elif len(code) == 8:
-                    return chr(int(code, 16))
-                return match.group(0)
-            result = re.sub(r'\\u([0-9a-fA-F]{4})', replace_unicode, data)
-            result = re.sub(r'\\U([0-9a-fA-F]{8})', replace_unicode, result)
+            if '\\' not in data:
+                return data
+            # 两遍顺序不变：\u 解出的反斜杠仍可与后文组成 \U 转义
+            result = _unescape(_UNICODE4_RE, data)
+            if '\\U' in result:
+                result = _unescape(_UNICODE8_RE, result)
             return result
         except Exception as e:
             raise ValueError(f"Unicode转义解码失败: {str(e)}")
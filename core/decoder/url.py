@@ -3,8 +3,28 @@
 """
 URL编码解码器实现
 """
+import codecs
+import re
 from urllib.parse import quote, unquote
 
+_ASCII_RUN_RE = re.compile('([\x00-\x7f]+)')
+_escape_decode = codecs.escape_decode
+
+
+def _unquote_ascii(run: str) -> str:
+    """
+    与 unquote 对单段 ASCII 的处理一致：%XX 还原成字节后按 UTF-8 (replace) 解码
+    把 % 换成 \\x 交给 C 实现的 escape_decode 一次解完，原有反斜杠先转义；有非法 %XX 时回退 unquote
+    """
+    if '%' not in run:
+        return run
+    try:
+        raw = _escape_decode(run.replace('\\', '\\\\').replace('%', '\\x'))[0]
+    except ValueError:
+        return unquote(run)
+    return raw.decode('utf-8', 'replace')
+
+
 class UrlEncoders:
     @staticmethod
     def url_encode(data: str) -> str:
@@ -16,6 +36,13 @@ class UrlEncoders:
     @staticmethod
     def url_decode(data: str) -> str:
         try:
-            return unquote(data)
+            if '%' not in data:
+                return data
+            if data.isascii():
+                return _unquote_ascii(data)
+            # unquote 只还原 ASCII 段中的转义，非 ASCII 字符原样保留
+            parts = _ASCII_RUN_RE.split(data)
+            parts[1::2] = [_unquote_ascii(part) for part in parts[1::2]]
+            return ''.join(parts)
         except Exception as e:
             raise ValueError(f"URL解码失败: {str(e)}")
@@ -2,6 +2,9 @@
 代码生成器 - 将积木配置转换为 Python 代码
 """
 
+import traceback
+from functools import lru_cache
+from types import CodeType
 from typing import List, Dict, Any, Set
 from .blocks import BLOCKS
 
@@ -158,6 +161,12 @@ def generate_function(
     return "\n".join(result_lines)
 
 
+@lru_cache(maxsize=128)
+def _compile_code(code: str) -> CodeType:
+    """同一段代码反复执行时复用已编译的字节码"""
+    return compile(code, "<string>", "exec")
+
+
 def execute_code(code: str, input_data: bytes = b"") -> Dict[str, Any]:
     """
     执行生成的代码
@@ -183,7 +192,7 @@ def execute_code(code: str, input_data: bytes = b"") -> Dict[str, Any]:
         }
         
         # 执行代码 (this defines imports and functions)
-        exec(code, global_vars, local_vars)
+        exec(_compile_code(code), global_vars, local_vars)
         
         # Merge local_vars into global_vars so imports are accessible when calling function
         global_vars.update(local_vars)
@@ -201,7 +210,6 @@ def execute_code(code: str, input_data: bytes = b"") -> Dict[str, Any]:
                     result = value(input_hex_string)  # Pass hex string, not bytes
                     break
                 except Exception as call_error:
-                    import traceback
                     return {
                         "success": False,
                         "error": f"函数调用错误: {call_error}\n{traceback.format_exc()}",
@@ -223,7 +231,6 @@ def execute_code(code: str, input_data: bytes = b"") -> Dict[str, Any]:
                 "result": str(result),
             }
     except Exception as e:
-        import traceback
         return {
             "success": False,
             "error": f"{str(e)}\n{traceback.format_exc()}",
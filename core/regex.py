@@ -1,5 +1,12 @@
 import re
 import string
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1024)
+def _escape(text: str) -> str:
+    return re.escape(text) if text else ""
+
 
 class RegexUtils:
     """正则工具类"""
@@ -7,9 +14,8 @@ class RegexUtils:
     @staticmethod
     def escape_text(text: str) -> str:
         """转义字符串为正则安全格式"""
-        if not text:
-            return ""
-        return re.escape(text)
+        # 前端逐键触发，重复输入直接命中缓存
+        return _escape(text or "")
 
 class RegexGenerator:
     """正则生成器"""
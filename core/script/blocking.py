@@ -0,0 +1,26 @@
+"""
+Blocking Pool - 阻塞调用共用的有界线程池
+
+终端读取、脚本输出读取等阻塞调用统一放到这里，避免默认执行器无上限地增长线程
+"""
+
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+
+BLOCKING_POOL = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 2),
+    thread_name_prefix="bytealchemy-blocking",
+)
+
+
+async def run_blocking(func, *args, **kwargs):
+    """在共用线程池中执行阻塞调用"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(BLOCKING_POOL, partial(func, *args, **kwargs))
+
+
+def shutdown_blocking_pool():
+    BLOCKING_POOL.shutdown(wait=False, cancel_futures=True)
@@ -7,6 +7,8 @@ Script Manager - 用户脚本库管理模块
 - 脚本执行与输出流式返回
 """
 
+import asyncio
+import codecs
 import os
 import json
 import uuid
@@ -15,9 +17,14 @@ import shutil
 import subprocess
 import threading
 from datetime import datetime
-from typing import List, Dict, Optional, Generator
+from typing import AsyncGenerator, List, Dict, Optional, Generator, Tuple
 from pathlib import Path
 
+from .blocking import run_blocking
+
+# 异步读取子进程输出的块大小
+STREAM_READ_SIZE = 64 * 1024
+
 
 class ScriptManager:
     """管理用户上传的Python脚本"""
@@ -33,6 +40,7 @@ class ScriptManager:
             self.scripts_dir = Path(scripts_dir).resolve()
         
         self.metadata_file = self.scripts_dir / "metadata.json"
+        self._version = 0
         self._ensure_dirs()
         self._migrate_legacy_scripts()
         self._load_metadata()
@@ -139,6 +147,16 @@ class ScriptManager:
         self._metadata = metadata
         with open(self.metadata_file, 'w', encoding='utf-8') as f:
             json.dump(metadata, f, ensure_ascii=False, indent=2)
+        self._version += 1
+    
+    def version(self) -> Tuple:
+        """脚本列表版本号: 进程内修改计数 + 元数据文件状态 (覆盖外部修改)"""
+        try:
+            stat = self.metadata_file.stat()
+            file_version = (stat.st_mtime_ns, stat.st_size)
+        except OSError:
+            file_version = None
+        return self._version, file_version
     
     def list_scripts(self) -> List[Dict]:
         """获取所有脚本列表"""
@@ -241,28 +259,22 @@ class ScriptManager:
         
         return True
     
-    def run_script(self, script_id: str) -> Generator[str, None, None]:
-        """
-        运行脚本并流式返回输出
-        
-        Yields:
-            脚本输出的每一行
-        """
+    def _resolve_run_path(self, script_id: str) -> Tuple[Optional[str], Optional[str]]:
+        """解析待运行脚本，返回 (相对路径, 错误信息)"""
         self._load_metadata()
         if script_id not in self._metadata:
-            yield f"[Error] Script {script_id} not found"
-            return
+            return None, f"[Error] Script {script_id} not found"
         
         info = self._metadata[script_id]
         filepath = self.scripts_dir / info["filename"]
         
         if not filepath.exists():
-            yield f"[Error] Script file not found: {filepath}"
-            return
-        
-        relative_path = self._relative_script_path(info['filename'])
-        yield f"$ python {relative_path}\n"
+            return None, f"[Error] Script file not found: {filepath}"
         
+        return self._relative_script_path(info['filename']), None
+
+    def _stream_process(self, relative_path: str) -> Generator[str, None, None]:
+        """以子进程运行脚本并逐行产出输出 (阻塞)"""
         try:
             # Use sys.executable for cross-platform compatibility
             process = subprocess.Popen(
@@ -286,6 +298,79 @@ class ScriptManager:
                 
         except Exception as e:
             yield f"\n[Error] {str(e)}\n"
+
+    def run_script(self, script_id: str) -> Generator[str, None, None]:
+        """
+        运行脚本并流式返回输出
+        
+        Yields:
+            脚本输出的每一行
+        """
+        relative_path, error = self._resolve_run_path(script_id)
+        if error:
+            yield error
+            return
+        
+        yield f"$ python {relative_path}\n"
+        yield from self._stream_process(relative_path)
+
+    async def run_script_async(self, script_id: str) -> AsyncGenerator[str, None]:
+        """
+        异步运行脚本并流式返回输出，直接在事件循环上读取子进程管道
+        
+        Yields:
+            脚本输出片段 (按块读取，超长行也不会触发 StreamReader 的行长限制)
+        """
+        relative_path, error = self._resolve_run_path(script_id)
+        if error:
+            yield error
+            return
+        
+        yield f"$ python {relative_path}\n"
+        
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, relative_path,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.STDOUT,
+                cwd=str(self.project_root)
+            )
+        except NotImplementedError:
+            # 事件循环不支持子进程 (如 Windows SelectorEventLoop)，退回线程逐行读取
+            lines = self._stream_process(relative_path)
+            while True:
+                line = await run_blocking(next, lines, None)
+                if line is None:
+                    return
+                yield line
+        except Exception as e:
+            yield f"\n[Error] {str(e)}\n"
+            return
+        
+        try:
+            # 增量解码，避免多字节字符被块边界截断
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            while True:
+                chunk = await process.stdout.read(STREAM_READ_SIZE)
+                if not chunk:
+                    break
+                text = decoder.decode(chunk)
+                if text:
+                    yield text
+            tail = decoder.decode(b'', final=True)
+            if tail:
+                yield tail
+            
+            await process.wait()
+            
+            if process.returncode == 0:
+                yield f"\n[Completed] Exit code: 0\n"
+            else:
+                yield f"\n[Failed] Exit code: {process.returncode}\n"
+        finally:
+            if process.returncode is None:
+                process.kill()
+                await process.wait()
     
     def run_script_sync(self, script_id: str) -> Dict:
         """
@@ -294,10 +379,30 @@ class ScriptManager:
         Returns:
             包含 output 和 return_code 的字典
         """
-        output_lines = list(self.run_script(script_id))
+        relative_path, error = self._resolve_run_path(script_id)
+        if error:
+            return {"output": error, "success": False}
+        
+        header = f"$ python {relative_path}\n"
+        try:
+            # 一次性收集全部输出，不再逐行经过生成器
+            result = subprocess.run(
+                [sys.executable, relative_path],
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                cwd=str(self.project_root)
+            )
+        except Exception as e:
+            return {"output": f"{header}\n[Error] {str(e)}\n", "success": False}
+        
+        output = result.stdout.decode('utf-8', errors='replace')
+        if result.returncode == 0:
+            status = f"\n[Completed] Exit code: 0\n"
+        else:
+            status = f"\n[Failed] Exit code: {result.returncode}\n"
         return {
-            "output": "".join(output_lines),
-            "success": "[Completed]" in output_lines[-1] if output_lines else False
+            "output": header + output + status,
+            "success": result.returncode == 0
         }
 
 
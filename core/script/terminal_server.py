@@ -12,8 +12,11 @@ import subprocess
 import threading
 import queue
 import time
+import traceback
 import websockets
 from websockets.exceptions import ConnectionClosed
+from collections import deque
+from typing import Union
 
 IS_WINDOWS = os.name == "nt"
 
@@ -65,6 +68,11 @@ class UnixTerminalSession:
             self.running = True
             self.resize(rows, cols)
     
+    @property
+    def master_fd(self):
+        """PTY 主端 fd，供事件循环直接注册读回调"""
+        return self.fd if self.running else None
+
     def resize(self, rows: int, cols: int):
         """调整终端大小"""
         if self.fd:
@@ -74,11 +82,11 @@ class UnixTerminalSession:
             except Exception:
                 pass
     
-    def write(self, data: str):
+    def write(self, data: Union[str, bytes]):
         """向终端写入数据"""
         if self.fd and self.running:
             try:
-                os.write(self.fd, data.encode('utf-8'))
+                os.write(self.fd, data if isinstance(data, bytes) else data.encode('utf-8'))
             except OSError:
                 self.running = False
     
@@ -98,6 +106,19 @@ class UnixTerminalSession:
         except OSError:
             self.running = False
         return ""
+
+    def read_blocking(self, size: int = 65536) -> bytes:
+        """阻塞读取一块原始输出 (不经 select)，EOF/出错时返回 b"" 并标记会话结束"""
+        fd = self.fd
+        if not fd or not self.running:
+            return b""
+        try:
+            data = os.read(fd, size)
+        except OSError:
+            data = b""
+        if not data:
+            self.running = False
+        return data
     
     def stop(self):
         """停止终端会话"""
@@ -204,8 +225,10 @@ class WindowsTerminalSession:
                 pass
         return
     
-    def write(self, data: str):
+    def write(self, data: Union[str, bytes]):
         """向终端写入数据"""
+        if isinstance(data, bytes):
+            data = data.decode('utf-8', errors='replace')
         if self.pty is not None and self.running:
             try:
                 self.pty.write(data)
@@ -239,6 +262,24 @@ class WindowsTerminalSession:
         if not chunks:
             return ""
         return b"".join(chunks).decode('utf-8', errors='replace')
+
+    def read_blocking(self, size: int = 65536) -> bytes:
+        """阻塞等待读线程投递的输出，并顺带合并已积压的部分 (最多约 size 字节)；会话结束时返回空字节串"""
+        chunks = []
+        while self.running and not chunks:
+            try:
+                chunks.append(self._queue.get(timeout=0.1))
+            except queue.Empty:
+                continue
+        total = sum(map(len, chunks))
+        while total < size:
+            try:
+                chunk = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            chunks.append(chunk)
+            total += len(chunk)
+        return b"".join(chunks)
     
     def stop(self):
         """停止终端会话"""
@@ -259,6 +300,17 @@ class WindowsTerminalSession:
 
 TerminalSession = WindowsTerminalSession if IS_WINDOWS else UnixTerminalSession
 
+# PTY 输出合并发送的上限: 攒够这么多字节或等待这么久就发一帧
+# 与 backend/routers/terminal.py 相同的二进制帧协议：首字节操作码，
+# INIT/RESIZE 后跟两个大端 uint16 (rows, cols)，DATA 后跟原始输入字节；文本帧仍按旧的 INIT:/RESIZE:/CMD: 协议处理
+OP_DATA = 0x01
+OP_RESIZE = 0x02
+OP_INIT = 0x03
+_SIZE_STRUCT = struct.Struct(">HH")
+
+OUTPUT_FLUSH_BYTES = 16 * 1024
+OUTPUT_FLUSH_DELAY = 0.005
+
 
 class TerminalServer:
     """WebSocket终端服务器"""
@@ -282,7 +334,12 @@ class TerminalServer:
             except asyncio.TimeoutError:
                 init_msg = ""
             
-            if init_msg.startswith("INIT:"):
+            if isinstance(init_msg, bytes):
+                if init_msg[:1] == bytes((OP_INIT,)) and len(init_msg) >= 5:
+                    session.start(*_SIZE_STRUCT.unpack_from(init_msg, 1))
+                else:
+                    session.start()
+            elif init_msg.startswith("INIT:"):
                 parts = init_msg.split(":")
                 rows = int(parts[1]) if len(parts) > 1 else 24
                 cols = int(parts[2]) if len(parts) > 2 else 80
@@ -299,13 +356,26 @@ class TerminalServer:
             platform_label = "Windows" if IS_WINDOWS else "Unix"
             await websocket.send(f"\033[1;32m[Terminal Ready - {platform_label}]\033[0m\r\n")
             
-            # 启动读取任务
-            read_task = asyncio.create_task(self._read_loop(websocket, session))
+            # 启动读取任务: Unix PTY 主端直接挂到事件循环上，Windows 仍用读线程
+            master_fd = getattr(session, "master_fd", None)
+            if master_fd is not None:
+                read_task = asyncio.create_task(self._pty_read_loop(websocket, session, master_fd))
+            else:
+                read_task = asyncio.create_task(self._read_loop(websocket, session))
             
-            # 处理输入
+            # 处理输入: 二进制帧按操作码协议解析，DATA 负载按原始字节直接写入终端
             async for message in websocket:
                 if not session.running:
                     break
+                if isinstance(message, bytes):
+                    if not message:
+                        continue
+                    opcode = message[0]
+                    if opcode == OP_DATA:
+                        session.write(message[1:])
+                    elif opcode == OP_RESIZE and len(message) >= 5:
+                        session.resize(*_SIZE_STRUCT.unpack_from(message, 1))
+                    continue
                 if message.startswith("RESIZE:"):
                     # 处理resize消息
                     parts = message.split(":")
@@ -324,7 +394,6 @@ class TerminalServer:
             pass
         except Exception as e:
             print(f"Session error: {e}")
-            import traceback
             traceback.print_exc()
         finally:
             # 清理
@@ -338,24 +407,110 @@ class TerminalServer:
             if session_id in self.sessions:
                 del self.sessions[session_id]
     
-    async def _read_loop(self, websocket, session):
-        """持续读取终端输出并发送"""
+    @staticmethod
+    def _reader_thread(session, loop, pending: deque, data_ready: asyncio.Event):
+        """常驻读线程: 阻塞读取原始输出 (空闲时不再定时唤醒)，放进 pending 后唤醒发送协程"""
         try:
             while session.running:
-                output = await asyncio.get_event_loop().run_in_executor(
-                    None, session.read, 0.05
-                )
+                output = session.read_blocking()
                 if output:
-                    try:
-                        await websocket.send(output)
-                    except ConnectionClosed:
-                        break
-                await asyncio.sleep(0.02)
+                    pending.append(output)
+                    loop.call_soon_threadsafe(data_ready.set)
+        except Exception as e:
+            # stop() 关闭 fd 时读取中断属于正常结束
+            if session.running:
+                print(f"Reader thread error: {e}")
+        finally:
+            try:
+                loop.call_soon_threadsafe(data_ready.set)
+            except RuntimeError:
+                pass
+    
+    async def _read_loop(self, websocket, session):
+        """持续读取终端输出并发送，无输出时挂起等待而不是轮询"""
+        loop = asyncio.get_running_loop()
+        pending = deque()
+        data_ready = asyncio.Event()
+        threading.Thread(
+            target=self._reader_thread,
+            args=(session, loop, pending, data_ready),
+            daemon=True
+        ).start()
+        try:
+            while session.running or pending:
+                await data_ready.wait()
+                data_ready.clear()
+                if not pending:
+                    continue
+                # 一次唤醒内积压的输出合并成一条消息
+                chunks = []
+                while pending:
+                    chunks.append(pending.popleft())
+                # 原始字节以二进制帧发送，UTF-8 解码交给前端 xterm (跨块的多字节字符也由它拼接)
+                try:
+                    await websocket.send(b"".join(chunks))
+                except ConnectionClosed:
+                    break
         except asyncio.CancelledError:
             pass
         except Exception as e:
             print(f"Read loop error: {e}")
     
+    @staticmethod
+    async def _pty_read_loop(websocket, session, fd: int):
+        """PTY 可读时由事件循环回调 os.read，不占线程也不轮询；结束时注销回调后再交给 stop() 关闭 fd"""
+        loop = asyncio.get_running_loop()
+        chunks: asyncio.Queue = asyncio.Queue()
+        # 零碎输出 (提示符、回显) 先攒在 pending 里，满 OUTPUT_FLUSH_BYTES 或等待 OUTPUT_FLUSH_DELAY 后合并成一帧
+        pending = bytearray()
+        flush_handle = None
+
+        def flush():
+            nonlocal flush_handle
+            flush_handle = None
+            if pending:
+                chunks.put_nowait(bytes(pending))
+                pending.clear()
+
+        def on_readable():
+            nonlocal flush_handle
+            try:
+                data = os.read(fd, 65536)
+            except OSError:
+                data = b""
+            if not data:
+                loop.remove_reader(fd)
+                if flush_handle is not None:
+                    flush_handle.cancel()
+                flush()
+                chunks.put_nowait(b"")
+                return
+            pending.extend(data)
+            if len(pending) >= OUTPUT_FLUSH_BYTES:
+                if flush_handle is not None:
+                    flush_handle.cancel()
+                flush()
+            elif flush_handle is None:
+                flush_handle = loop.call_later(OUTPUT_FLUSH_DELAY, flush)
+
+        # fd 保持阻塞模式: 回调只在可读时触发，读不会阻塞；写入端 (session.write) 也不会因缓冲区满而报错
+        loop.add_reader(fd, on_readable)
+        try:
+            while True:
+                data = await chunks.get()
+                if not data:
+                    session.running = False
+                    break
+                await websocket.send(data)
+        except (asyncio.CancelledError, ConnectionClosed):
+            pass
+        except Exception as e:
+            print(f"Read loop error: {e}")
+        finally:
+            loop.remove_reader(fd)
+            if flush_handle is not None:
+                flush_handle.cancel()
+    
     async def start(self):
         """启动WebSocket服务器"""
         print(f"Terminal WebSocket server starting on ws://{self.host}:{self.port}")
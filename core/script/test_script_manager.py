@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""Regression tests for script output streaming."""
+import asyncio
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from core.script.script_manager import ScriptManager
+
+passed = 0
+failed = 0
+
+
+def check(name, got, expected):
+    global passed, failed
+    ok = got == expected
+    print(f"  [{'PASS' if ok else 'FAIL'}] {name}")
+    if ok:
+        passed += 1
+    else:
+        failed += 1
+        print(f"    Expected: {expected!r}")
+        print(f"    Got:      {got!r}")
+
+
+async def collect(manager, script_id):
+    return ''.join([chunk async for chunk in manager.run_script_async(script_id)])
+
+
+with tempfile.TemporaryDirectory() as scripts_dir:
+    manager = ScriptManager(scripts_dir)
+
+    print("Test 1: Over-limit line is streamed in full")
+    long_line = 'A' * (2 * 1024 * 1024)
+    s1 = manager.add_script('long_line', f"print('A' * {len(long_line)})\nprint('after')\n")
+    out1 = asyncio.run(collect(manager, s1['id']))
+    check('Long line survives', long_line in out1, True)
+    check('Output after the long line survives', out1.endswith("after\n\n[Completed] Exit code: 0\n"), True)
+    check('Async output matches sync output', out1, manager.run_script_sync(s1['id'])['output'])
+
+    print("Test 2: Multi-byte characters across read chunks")
+    s2 = manager.add_script('utf8', "import sys\nsys.stdout.buffer.write('世界'.encode() * 40000)\n")
+    out2 = asyncio.run(collect(manager, s2['id']))
+    check('No replacement characters at chunk boundaries', '�' in out2, False)
+    check('Multi-byte output intact', out2.count('世界'), 40000)
+
+    print("Test 3: Failing script reports its exit code")
+    s3 = manager.add_script('fail', "raise SystemExit(3)\n")
+    check('Failed status line', asyncio.run(collect(manager, s3['id'])).endswith("[Failed] Exit code: 3\n"), True)
+
+print(f"\nResults: {passed} passed, {failed} failed")
+if failed:
+    sys.exit(1)
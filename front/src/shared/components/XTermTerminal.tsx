@@ -17,6 +17,29 @@ type TerminalBridge = {
     isReady: () => boolean;
 };
 
+// 终端 WebSocket 二进制协议：首字节为操作码，尺寸为两个大端 uint16
+const OP_DATA = 0x01;
+const OP_RESIZE = 0x02;
+const OP_INIT = 0x03;
+const textEncoder = new TextEncoder();
+
+function encodeData(text: string): Uint8Array {
+    const body = textEncoder.encode(text);
+    const frame = new Uint8Array(body.length + 1);
+    frame[0] = OP_DATA;
+    frame.set(body, 1);
+    return frame;
+}
+
+function encodeSize(op: number, rows: number, cols: number): Uint8Array {
+    const frame = new Uint8Array(5);
+    const view = new DataView(frame.buffer);
+    view.setUint8(0, op);
+    view.setUint16(1, rows);
+    view.setUint16(3, cols);
+    return frame;
+}
+
 const MAX_PENDING_ACTIONS = 200;
 const pendingTerminalActions: PendingTerminalAction[] = [];
 let activeTerminalBridge: TerminalBridge | null = null;
@@ -84,16 +107,18 @@ export function XTermTerminal() {
 
         try {
             const ws = new WebSocket(wsUrl);
+            ws.binaryType = 'arraybuffer';
 
             ws.onopen = () => {
                 isConnecting.current = false;
                 setIsConnected(true);
                 websocket.current = ws;
-                ws.send(`INIT:${term.rows}:${term.cols}`);
+                ws.send(encodeSize(OP_INIT, term.rows, term.cols));
                 flushPendingTerminalActions();
             };
 
-            ws.onmessage = (e) => term.write(e.data);
+            // PTY 输出以二进制帧下发，由 xterm 自行解码 UTF-8
+            ws.onmessage = (e) => term.write(typeof e.data === 'string' ? e.data : new Uint8Array(e.data));
 
             ws.onclose = () => {
                 isConnecting.current = false;
@@ -128,7 +153,7 @@ export function XTermTerminal() {
 
     const sendCommand = useCallback((cmd: string) => {
         if (websocket.current?.readyState === WebSocket.OPEN) {
-            websocket.current.send(`CMD:${cmd}`);
+            websocket.current.send(encodeData(`${cmd}\r\n`));
             return;
         }
 
@@ -138,7 +163,7 @@ export function XTermTerminal() {
 
     const sendInput = useCallback((data: string) => {
         if (websocket.current?.readyState === WebSocket.OPEN) {
-            websocket.current.send(data);
+            websocket.current.send(encodeData(data));
             return;
         }
 
@@ -208,7 +233,7 @@ export function XTermTerminal() {
 
             fit.fit();
             if (websocket.current?.readyState === WebSocket.OPEN && term.rows && term.cols) {
-                websocket.current.send(`RESIZE:${term.rows}:${term.cols}`);
+                websocket.current.send(encodeSize(OP_RESIZE, term.rows, term.cols));
             }
         };
 
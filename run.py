@@ -1,52 +1,290 @@
+import compileall
 import os
+import select
+import signal
+import socket
 import sys
 import subprocess
+import threading
 import time
-import psutil
+from concurrent.futures import ThreadPoolExecutor
 
-def kill_process_on_port(port):
-    """如果端口被占用，尝试杀掉占用端口的进程"""
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+PROC_NET_TCP = ("/proc/net/tcp", "/proc/net/tcp6")
+
+# 路径在导入时解析一次
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+if os.name == "nt":
+    VENV_PYTHON = os.path.join(BASE_DIR, ".venv", "Scripts", "python.exe")
+else:
+    VENV_PYTHON = os.path.join(BASE_DIR, ".venv", "bin", "python")
+PYTHON_EXE = VENV_PYTHON if os.path.exists(VENV_PYTHON) else sys.executable
+BACKEND_SCRIPT = os.path.join(BASE_DIR, "backend", "server.py")
+BYTECODE_DIRS = (os.path.join(BASE_DIR, "backend"), os.path.join(BASE_DIR, "core"))
+FRONT_DIR = os.path.join(BASE_DIR, "front")
+FRONT_SRC_DIR = os.path.join(FRONT_DIR, "src")
+FRONT_DIST_DIR = os.path.join(FRONT_DIR, "dist")
+BUILD_TAG_FILE = os.path.join(FRONT_DIST_DIR, ".buildtag")
+
+
+def _port_socket_inodes(ports):
+    """直接解析 /proc/net/tcp(6)，返回 {socket inode: 本地端口}；无 /proc 时返回 None"""
+    inodes = {}
+    found_table = False
+    for path in PROC_NET_TCP:
+        try:
+            f = open(path)
+        except OSError:
+            continue
+        found_table = True
+        with f:
+            next(f, None)
+            for line in f:
+                fields = line.split()
+                # local_address 形如 0100007F:0D0F，inode 为 0 的是 TIME_WAIT 等已无属主的连接
+                port = int(fields[1].rsplit(":", 1)[1], 16)
+                if port in ports and fields[9] != "0":
+                    inodes[fields[9]] = port
+    return inodes if found_table else None
+
+
+def _find_socket_owners(inodes):
+    """扫描一遍 /proc/[pid]/fd，返回 {端口: 持有该端口 socket 的进程}"""
+    targets = {f"socket:[{inode}]": port for inode, port in inodes.items()}
+    wanted = set(targets.values())
+    owners = {}
+    with os.scandir("/proc") as entries:
+        for entry in entries:
+            if not entry.name.isdigit():
+                continue
+            try:
+                with os.scandir(f"/proc/{entry.name}/fd") as fds:
+                    for fd in fds:
+                        try:
+                            port = targets.get(os.readlink(fd.path))
+                        except OSError:
+                            continue
+                        if port is not None and port not in owners:
+                            owners[port] = int(entry.name)
+            except OSError:
+                # 进程已退出或无权限查看
+                continue
+            if len(owners) == len(wanted):
+                break
+    return owners
+
+
+def _process_name(pid):
+    try:
+        with open(f"/proc/{pid}/comm") as f:
+            return f.read().strip()
+    except OSError:
+        return "?"
+
+
+def _kill_processes_on_ports_psutil(ports):
     try:
         connections = psutil.net_connections(kind='inet')
     except Exception:
         connections = []
 
+    remaining = set(ports)
     for conn in connections:
-        if not conn.laddr or conn.laddr.port != port or not conn.pid:
+        if not conn.laddr or conn.laddr.port not in remaining or not conn.pid:
             continue
+        port = conn.laddr.port
         try:
             proc = psutil.Process(conn.pid)
             print(f"Port {port} is in use by {proc.name()} (PID: {conn.pid}). Killing...")
             proc.kill()
-            return
+            remaining.discard(port)
         except (psutil.NoSuchProcess, psutil.AccessDenied, psutil.ZombieProcess):
             pass
 
+
+def _port_in_use(port, host="127.0.0.1"):
+    """本机端口上是否有进程在监听；连接超时 (积压队列已满) 也算占用"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.settimeout(0.2)
+        try:
+            return sock.connect_ex((host, port)) == 0
+        except socket.timeout:
+            return True
+
+
+def kill_processes_on_ports(ports):
+    """如果端口被占用，尝试杀掉占用端口的进程 (多个端口共用一次 /proc 扫描)"""
+    # 先用一次本地连接探测，没有监听者时不必扫描进程表
+    ports = {port for port in ports if _port_in_use(port)}
+    if not ports:
+        return
+    inodes = _port_socket_inodes(ports)
+    if inodes is None:
+        # 非 Linux (Windows / macOS) 没有 /proc/net/tcp，交给 psutil
+        if psutil is not None:
+            _kill_processes_on_ports_psutil(ports)
+        return
+    if not inodes:
+        return
+
+    denied = set()
+    for port, pid in sorted(_find_socket_owners(inodes).items()):
+        print(f"Port {port} is in use by {_process_name(pid)} (PID: {pid}). Killing...")
+        try:
+            os.kill(pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        except PermissionError:
+            denied.add(port)
+    if denied and psutil is not None:
+        _kill_processes_on_ports_psutil(denied)
+
+
+def wait_port(port, timeout=10.0, host="127.0.0.1", proc=None):
+    """反复尝试连接端口直到有进程监听；超时或 proc 提前退出时返回 False"""
+    deadline = time.monotonic() + timeout
+    while True:
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.settimeout(0.05)
+            if sock.connect_ex((host, port)) == 0:
+                return True
+        if time.monotonic() >= deadline or (proc is not None and proc.poll() is not None):
+            return False
+        time.sleep(0.02)
+
+
+def _file_mtimes(path, recursive=True):
+    """用 os.scandir 遍历目录，逐个产出文件的 mtime"""
+    with os.scandir(path) as entries:
+        for entry in entries:
+            if entry.is_file():
+                yield entry.stat().st_mtime
+            elif recursive and entry.is_dir(follow_symlinks=False):
+                yield from _file_mtimes(entry.path)
+
+
+def needs_rebuild():
+    """front/dist 中最旧的产物仍比 src 和 front 下的配置文件新时，跳过前端构建"""
+    try:
+        built = min(_file_mtimes(FRONT_DIST_DIR), default=None)
+    except OSError:
+        return True
+    if built is None:
+        return True
+    try:
+        # front 顶层文件: package.json / 锁文件 / index.html / vite 与 ts 配置
+        newest = max(_file_mtimes(FRONT_DIR, recursive=False), default=0)
+        newest = max(newest, max(_file_mtimes(FRONT_SRC_DIR), default=0))
+    except OSError:
+        return True
+    return newest > built
+
+
+def front_build_tag():
+    """front 目录在 HEAD 中的树哈希；front 有未提交改动或无法调用 git 时返回 None"""
+    git = ["git", "-C", BASE_DIR]
+    try:
+        tree = subprocess.run(
+            git + ["rev-parse", "HEAD:front"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+        dirty = subprocess.run(
+            git + ["status", "--porcelain", "--", "front", ":!front/dist", ":!front/node_modules"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return None if dirty else tree
+
+
+def read_build_tag():
+    try:
+        with open(BUILD_TAG_FILE, encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return None
+
+
+def write_build_tag(tag):
+    try:
+        with open(BUILD_TAG_FILE, "w", encoding="utf-8") as f:
+            f.write(tag)
+    except OSError:
+        pass
+
+
+def _first_exited(procs):
+    for proc in procs:
+        if proc.poll() is not None:
+            return proc
+    return None
+
+
+def wait_any_exit(procs):
+    """阻塞到任一子进程退出并返回它；Linux 用 pidfd + poll 等待，其他平台用等待线程"""
+    pidfds = []
+    try:
+        for proc in procs:
+            pidfds.append(os.pidfd_open(proc.pid))
+    except (AttributeError, OSError):
+        for fd in pidfds:
+            os.close(fd)
+        pidfds = None
+
+    if pidfds is not None:
+        poller = select.poll()
+        for fd in pidfds:
+            poller.register(fd, select.POLLIN)
+        try:
+            while True:
+                poller.poll()
+                exited = _first_exited(procs)
+                if exited is not None:
+                    return exited
+        finally:
+            for fd in pidfds:
+                os.close(fd)
+
+    # 没有 pidfd 时每个子进程一个守护线程阻塞在 wait() 上，任一退出即唤醒；
+    # 带超时的 Event.wait 让 Windows 上的 Ctrl+C 也能及时生效
+    any_exited = threading.Event()
+
+    def watch(proc):
+        proc.wait()
+        any_exited.set()
+
+    for proc in procs:
+        threading.Thread(target=watch, args=(proc,), daemon=True).start()
+    while True:
+        any_exited.wait(1)
+        exited = _first_exited(procs)
+        if exited is not None:
+            return exited
+
+
 def run():
     # 0. Pre-start cleanup
     print("检查端口...")
-    kill_process_on_port(3335)  # Kill existing backend process
+    kill_processes_on_ports({3335})  # Kill existing backend process
     
     # 1. Start Backend
     print("启动后端服务...")
-    base_dir = os.path.dirname(os.path.abspath(__file__))
-    if os.name == "nt":
-        venv_python = os.path.join(base_dir, ".venv", "Scripts", "python.exe")
-    else:
-        venv_python = os.path.join(base_dir, ".venv", "bin", "python")
-
-    python_exe = venv_python if os.path.exists(venv_python) else sys.executable
+    # 预先生成字节码 (已是最新的文件只做一次 stat)，即使环境设置了 PYTHONDONTWRITEBYTECODE 后端也能直接读 .pyc
+    for package in BYTECODE_DIRS:
+        compileall.compile_dir(package, quiet=1)
+    backend_proc = subprocess.Popen([PYTHON_EXE, BACKEND_SCRIPT])
 
-    backend_script = os.path.join(base_dir, "backend", "server.py")
-    backend_proc = subprocess.Popen([python_exe, backend_script])
-
-    # 2. Wait for servers to start
-    time.sleep(2)
+    # 2. 后端启动与前端构建并行: 构建期间在后台线程里探测后端端口
+    probe_pool = ThreadPoolExecutor(max_workers=1)
+    backend_ready = probe_pool.submit(wait_port, 3335, proc=backend_proc)
+    probe_pool.shutdown(wait=False)
 
     # This project uses pnpm, define the command for it
     pnpm_cmd = "pnpm.cmd" if os.name == "nt" else "pnpm"
-    front_dir = os.path.join(base_dir, "front")
-    node_modules_dir = os.path.join(front_dir, "node_modules")
+    node_modules_dir = os.path.join(FRONT_DIR, "node_modules")
     
     # 3. Build Frontend
     print("=" * 40)
@@ -56,34 +294,44 @@ def run():
 
     if not os.path.isdir(node_modules_dir):
         print("检测到前端依赖未安装，正在执行 pnpm install...")
-        install_proc = subprocess.run([pnpm_cmd, "install"], cwd=front_dir)
+        install_proc = subprocess.run([pnpm_cmd, "install"], cwd=FRONT_DIR)
         if install_proc.returncode != 0:
             print("前端依赖安装失败!")
             backend_proc.terminate()
             return
     
-    build_proc = subprocess.run([pnpm_cmd, "run", "build"], cwd=front_dir)
-    if build_proc.returncode != 0:
-        print("前端构建失败!")
-        backend_proc.terminate()
-        return
+    # 两级判断: 先比较 mtime，再比较 dist/.buildtag 记录的 front 树哈希 (checkout 会刷新 mtime)
+    if not needs_rebuild():
+        print("前端源码未变化，跳过构建。")
+    else:
+        build_tag = front_build_tag()
+        if build_tag is not None and read_build_tag() == build_tag:
+            print("前端产物与当前提交一致，跳过构建。")
+        else:
+            build_proc = subprocess.run([pnpm_cmd, "run", "build"], cwd=FRONT_DIR)
+            if build_proc.returncode != 0:
+                print("前端构建失败!")
+                backend_proc.terminate()
+                return
+            if build_tag is not None:
+                write_build_tag(build_tag)
     
+    if not backend_ready.result():
+        if backend_proc.poll() is not None:
+            print("后端启动失败!")
+            return
+        print("后端未在 10 秒内就绪，继续启动应用...")
+
     # 4. Start Electron
     print("启动应用...")
     env = os.environ.copy()
     env["SKIP_ELECTRON_BACKEND"] = "1"  # run.py already started backend
-    frontend_proc = subprocess.Popen([pnpm_cmd, "run", "start"], cwd=base_dir, env=env)
+    frontend_proc = subprocess.Popen([pnpm_cmd, "run", "start"], cwd=BASE_DIR, env=env)
     
     try:
-        # Monitor processes
-        while True:
-            if backend_proc.poll() is not None:
-                print("后端异常退出。")
-                break
-            if frontend_proc.poll() is not None:
-                # Frontend closed, normal exit
-                break
-            time.sleep(1)
+        # Monitor processes (frontend closed = normal exit)
+        if wait_any_exit((backend_proc, frontend_proc)) is backend_proc:
+            print("后端异常退出。")
             
     except KeyboardInterrupt:
         print("\n正在停止...")
@@ -97,9 +345,18 @@ def run():
         if 'frontend_proc' in locals() and frontend_proc.poll() is None:
             frontend_proc.terminate()
             
-        # Ensure deep cleanup if they don't die
-        time.sleep(1)
-        kill_process_on_port(3335)
+        # Ensure deep cleanup if they don't die: 共用 1 秒等待，超时的直接 kill，
+        # 只有确实出现超时才再按端口兜底清理
+        deadline = time.monotonic() + 1
+        timed_out = False
+        for proc in (backend_proc, frontend_proc):
+            try:
+                proc.wait(timeout=max(0.0, deadline - time.monotonic()))
+            except subprocess.TimeoutExpired:
+                timed_out = True
+                proc.kill()
+        if timed_out:
+            kill_processes_on_ports({3335})
 
 if __name__ == "__main__":
     run()